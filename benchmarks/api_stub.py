@@ -0,0 +1,223 @@
+# benchmarks/api_stub.py
+#
+# Servidor HTTP local que imita las APIs de versiones (GitHub REST y GraphQL,
+# GitLab y CocoaPods trunk) a partir de fixtures/remote_versions.json, para
+# reproducir los benchmarks y comprobaciones de la resolución de versiones sin
+# red. Cada respuesta tiene la forma de la API real, incluidos los errores por
+# alias de GraphQL (NOT_FOUND, FORBIDDEN).
+#
+# Los repositorios y pods con un sufijo numérico (Alamofire-7, Firebase-3)
+# responden como su plantilla del fixture, para generar lotes de cualquier tamaño.
+
+import os
+import re
+import json
+import time
+import threading
+from urllib.parse import urlparse, parse_qs, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'remote_versions.json')
+
+# Alias de una consulta GraphQL en lote: r0: repository(owner: "...", name: "...")
+GRAPHQL_ALIAS_PATTERN = re.compile(r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\)')
+
+COPY_SUFFIX_PATTERN = re.compile(r'-\d+$')
+
+
+def load_fixture(path=FIXTURE_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def template_name(name):
+    """Nombre de la plantilla del fixture para un repositorio o pod copiado (Alamofire-7 -> Alamofire)"""
+    return COPY_SUFFIX_PATTERN.sub('', name)
+
+
+class APIStub:
+    """
+    Servidor de las APIs de versiones en un hilo daemon.
+    Cuenta las peticiones de cada tipo y la concurrencia máxima por servicio
+    (github, gitlab, trunk), y puede añadir latencia a cada respuesta.
+    """
+
+    def __init__(self, fixture=None, latency=0.0, graphql_mode='ok', delays=None):
+        """
+        Args:
+            fixture (dict): Contenido de remote_versions.json (por defecto, el del repositorio)
+            latency (float): Segundos de espera en cada respuesta
+            graphql_mode (str): 'ok' o 'error' (la consulta entera falla, como con un token inválido)
+            delays (dict): Espera adicional de las respuestas de un repositorio o pod concreto
+        """
+        self.fixture = fixture or load_fixture()
+        self.latency = latency
+        self.delays = delays or {}
+        self.graphql_mode = graphql_mode
+        self.requests = {}
+        self.max_concurrency = {}
+        self._running = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests.clear()
+            self.max_concurrency.clear()
+
+    def environment(self):
+        """Variables de entorno que dirigen el VersionChecker a este servidor"""
+        return {
+            'GITHUB_API_URL': self.url,
+            'GITHUB_GRAPHQL_URL': f'{self.url}/graphql',
+            'GITLAB_API_URL': self.url,
+            'COCOAPODS_TRUNK_URL': self.url
+        }
+
+    def _enter(self, service, kind):
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+            running = self._running.get(service, 0) + 1
+            self._running[service] = running
+            self.max_concurrency[service] = max(self.max_concurrency.get(service, 0), running)
+
+    def _leave(self, service):
+        with self._lock:
+            self._running[service] -= 1
+
+    def _entry(self, section, name):
+        if name in self.delays:
+            time.sleep(self.delays[name])
+        entries = self.fixture[section]
+        return entries.get(name) or entries.get(template_name(name))
+
+    # Respuestas de cada API: (estado, cuerpo)
+
+    def github_rest(self, path, query):
+        match = re.match(r'/repos/([^/]+)/([^/]+)/(tags|releases/latest)$', path)
+        entry = self._entry('github', f'{match.group(1)}/{match.group(2)}') if match else None
+        if not entry or entry.get('rest_status') == 404:
+            return 404, {'message': 'Not Found'}
+        if match.group(3) == 'tags':
+            per_page = int(query.get('per_page', ['30'])[0])
+            page = int(query.get('page', ['1'])[0])
+            tags = entry.get('tags', [])[(page - 1) * per_page:page * per_page]
+            return 200, [{'name': tag} for tag in tags]
+        if entry.get('latest_release'):
+            return 200, {'tag_name': entry['latest_release']}
+        return 404, {'message': 'Not Found'}
+
+    def github_graphql(self, body):
+        if self.graphql_mode == 'error':
+            return 200, {'errors': [{'message': 'Bad credentials'}]}
+        data = {}
+        errors = []
+        for alias, owner, name in GRAPHQL_ALIAS_PATTERN.findall(body.get('query', '')):
+            entry = self._entry('github', f'{owner}/{name}')
+            error_type = 'NOT_FOUND' if entry is None else entry.get('graphql_error')
+            if error_type:
+                data[alias] = None
+                errors.append({
+                    'type': error_type,
+                    'path': [alias],
+                    'message': f"Could not resolve to a Repository with the name '{owner}/{name}'."
+                    if error_type == 'NOT_FOUND' else 'Resource protected by organization SAML enforcement.'
+                })
+                continue
+            data[alias] = {
+                'latestRelease': {'tagName': entry['latest_release']} if entry.get('latest_release') else None,
+                'refs': {'nodes': [{'name': tag} for tag in entry.get('tags', [])[:100]]}
+            }
+        data['rateLimit'] = {'cost': 1, 'remaining': 4999}
+        payload = {'data': data}
+        if errors:
+            payload['errors'] = errors
+        return 200, payload
+
+    def gitlab(self, path):
+        match = re.match(r'/projects/([^/]+)/(repository/tags|releases)$', path)
+        entry = self._entry('gitlab', unquote(match.group(1))) if match else None
+        if not entry:
+            return 404, {'message': '404 Project Not Found'}
+        if match.group(2) == 'releases':
+            return 200, [{'tag_name': release} for release in entry.get('releases', [])]
+        return 200, [{'name': tag} for tag in entry.get('tags', [])]
+
+    def trunk(self, path):
+        entry = self._entry('pods', unquote(path[len('/pods/'):]))
+        if not entry or entry.get('rest_status') == 404:
+            return 404, {}
+        versions = entry.get('versions', [])
+        return 200, {'versions': [{'name': version, 'created_at': f'2024-01-{len(versions) - i:02d}'}
+                                  for i, version in enumerate(versions)]}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Cabeceras y cuerpo se escriben por separado: sin esto, cada respuesta espera al ACK retardado
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _serve(self, service, kind, respond):
+                stub._enter(service, kind)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    status, body = respond()
+                finally:
+                    stub._leave(service)
+                self._send(status, body)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                path, query = parsed.path, parse_qs(parsed.query)
+                if path.startswith('/repos/'):
+                    kind = 'github_tags' if path.endswith('/tags') else 'github_release'
+                    self._serve('github', kind, lambda: stub.github_rest(path, query))
+                elif path.startswith('/projects/'):
+                    self._serve('gitlab', 'gitlab', lambda: stub.gitlab(path))
+                elif path.startswith('/pods/'):
+                    self._serve('trunk', 'trunk', lambda: stub.trunk(path))
+                else:
+                    self._send(404, {})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if urlparse(self.path).path == '/graphql':
+                    self._serve('github', 'github_graphql', lambda: stub.github_graphql(body))
+                else:
+                    self._send(404, {})
+
+        return Handler
+
+
+def expected_versions(fixture, urls_by_section):
+    """Versión esperada de cada URL según su plantilla del fixture"""
+    expected = {}
+    for section, urls in urls_by_section.items():
+        for url, name in urls.items():
+            expected[url] = fixture[section][template_name(name)]['expected']
+    return expected
@@ -0,0 +1,135 @@
+# benchmarks/dependency_audit_benchmark.py
+#
+# Genera un proyecto sintético de paquetes locales con problemas conocidos
+# (dependencias locales sin usar, módulos locales importados sin declarar y
+# paquetes remotos importados sin declarar), ejecuta la auditoría en frío y con
+# la caché de parseo, y comprueba que informa exactamente de esos problemas.
+# Termina con código 1 si el informe no coincide.
+#
+# Uso:
+#   python3 benchmarks/dependency_audit_benchmark.py [--packages 600] [--files 40]
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.generator import SPMDiagramGenerator
+from utils.version_checker import CachePolicy
+
+# Paquetes remotos comunes a todos los manifiestos; cada target declara e importa uno
+REMOTE_PACKAGES = 10
+
+# Paquete remoto que algunos manifiestos declaran pero ningún target declara como producto
+UNDECLARED_REMOTE = ('Kingfisher', 'https://github.com/onevcat/Kingfisher.git')
+
+
+def generate_project(directory, packages, files):
+    """
+    Paquetes Module0..N: cada uno depende del siguiente y de un paquete remoto.
+    Returns:
+        dict: Target -> (dependencias sin usar, módulos sin declarar) esperados
+    """
+    expected = {}
+    for i in range(packages):
+        name = f'Module{i}'
+        package_dependencies = [f'.package(url: "https://github.com/vendor/Remote{i % REMOTE_PACKAGES}.git", from: "1.0.0")']
+        target_dependencies = [f'.product(name: "Remote{i % REMOTE_PACKAGES}", package: "Remote{i % REMOTE_PACKAGES}")']
+        imports = ['Foundation', 'UIKit', f'Remote{i % REMOTE_PACKAGES}']
+        unused, missing = set(), set()
+
+        if i + 1 < packages:
+            package_dependencies.append(f'.package(path: "../Module{i + 1}")')
+            target_dependencies.append(f'.product(name: "Module{i + 1}", package: "Module{i + 1}")')
+            imports.append(f'Module{i + 1}')
+        if i % 7 == 0 and i + 2 < packages:
+            # Declarada y nunca importada
+            package_dependencies.append(f'.package(path: "../Module{i + 2}")')
+            target_dependencies.append(f'.product(name: "Module{i + 2}", package: "Module{i + 2}")')
+            unused.add(f'Module{i + 2} (Module{i + 2})')
+        if i % 11 == 0 and i + 3 < packages:
+            # Módulo local importado sin declararlo
+            imports.append(f'Module{i + 3}')
+            missing.add(f'Module{i + 3}')
+        if i % 13 == 0:
+            # Paquete remoto del manifiesto importado sin declarar su producto
+            package_dependencies.append(f'.package(url: "{UNDECLARED_REMOTE[1]}", from: "7.0.0")')
+            imports.append(UNDECLARED_REMOTE[0])
+            missing.add(UNDECLARED_REMOTE[0])
+
+        package_dir = os.path.join(directory, 'Modules', name)
+        sources_dir = os.path.join(package_dir, 'Sources', name)
+        os.makedirs(sources_dir)
+        with open(os.path.join(package_dir, 'Package.swift'), 'w', encoding='utf-8') as f:
+            f.write('// swift-tools-version:5.7\nimport PackageDescription\n\nlet package = Package(\n')
+            f.write(f'    name: "{name}",\n')
+            f.write(f'    products: [\n        .library(name: "{name}", targets: ["{name}"]),\n    ],\n')
+            f.write('    dependencies: [\n' + ''.join(f'        {d},\n' for d in package_dependencies) + '    ],\n')
+            f.write(f'    targets: [\n        .target(\n            name: "{name}",\n            dependencies: [\n')
+            f.write(''.join(f'                {d},\n' for d in target_dependencies))
+            f.write('            ]),\n    ]\n)\n')
+
+        for f_index in range(files):
+            # El primer archivo importa todos los módulos; el resto solo Foundation
+            file_imports = imports if f_index == 0 else ['Foundation']
+            with open(os.path.join(sources_dir, f'File{f_index}.swift'), 'w', encoding='utf-8') as f:
+                f.write(''.join(f'import {module}\n' for module in file_imports))
+                f.write(f'\nfinal class {name}File{f_index} {{\n    let value = {f_index}\n}}\n')
+
+        if unused or missing:
+            expected[name] = (unused, missing)
+    return expected
+
+
+def run_audit(project):
+    generator = SPMDiagramGenerator(project, cache_policy=CachePolicy.OFFLINE)
+    start = time.perf_counter()
+    result = generator.audit_dependencies()
+    return time.perf_counter() - start, result
+
+
+def compare(expected, result):
+    """Diferencias entre los problemas esperados y los informados"""
+    reported = {issue['target']: (set(issue['unused']), set(issue['missing'])) for issue in result['issues']}
+    differences = []
+    for target in sorted(set(expected) | set(reported)):
+        if expected.get(target) != reported.get(target):
+            differences.append(f"{target}: esperado {expected.get(target)}, informado {reported.get(target)}")
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark y comprobación de la auditoría de dependencias')
+    parser.add_argument('--packages', type=int, default=600, help='Paquetes locales del proyecto sintético')
+    parser.add_argument('--files', type=int, default=40, help='Archivos Swift por paquete')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        project = os.path.join(directory, 'project')
+        expected = generate_project(project, args.packages, args.files)
+        print(f"📊 Proyecto sintético: {args.packages} paquetes, {args.packages * args.files} archivos Swift, "
+              f"{len(expected)} targets con problemas")
+
+        # La caché de parseo y la de versiones se guardan en results/ del directorio de trabajo
+        os.chdir(directory)
+        differences = []
+        for label in ('Auditoría en frío', 'Auditoría con caché'):
+            elapsed, result = run_audit(project)
+            differences = compare(expected, result)
+            print(f"  {label:28} {elapsed * 1000:9.1f} ms   ({result['unused']} sin usar, {result['missing']} sin declarar)")
+
+    if differences:
+        print(f"❌ El informe no coincide con los problemas generados ({len(differences)} targets):")
+        for difference in differences[:20]:
+            print(f"   {difference}")
+        sys.exit(1)
+    print("✅ El informe coincide con los problemas generados")
+
+
+if __name__ == '__main__':
+    main()
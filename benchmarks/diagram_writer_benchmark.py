@@ -0,0 +1,222 @@
+# benchmarks/diagram_writer_benchmark.py
+#
+# Compara la escritura incremental del diagrama unificado (MXFileWriter) con el
+# camino anterior: páginas de módulos concatenadas en una cadena, reparseadas con
+# ET.fromstring, serializadas con ET.tostring y reindentadas con minidom (incluido
+# aquí tal cual estaba en el generador).
+#
+# Uso:
+#   python3 benchmarks/diagram_writer_benchmark.py [--modules 400] [--targets 6] [--deps 8] [--repeat 3]
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from xml.dom import minidom
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from diagram.components import write_module_pages
+from diagram.mxfile_writer import MXFileWriter
+
+
+def generate_packages_data(modules, targets, deps):
+    """Paquetes sintéticos: {ruta: (nombre, {target: dependencias})}"""
+    packages_data = {}
+    for m in range(modules):
+        package_targets = {}
+        for t in range(targets):
+            package_targets[f'Module{m}Target{t}'] = [f'Dependency{d} (package{m}-{d})' for d in range(deps)]
+        packages_data[f'Modules/Module{m}/Package.swift'] = (f'Module{m}', package_targets)
+    return packages_data
+
+
+def build_main_mxfile(modules):
+    """Diagrama principal sintético con la forma del generado por el generador"""
+    mxfile = ET.Element('mxfile')
+    diagram = ET.SubElement(mxfile, 'diagram')
+    diagram.set('id', 'main')
+    diagram.set('name', 'Diagrama Principal')
+    model = ET.SubElement(diagram, 'mxGraphModel')
+    model.set('dx', '3000')
+    model.set('dy', '2000')
+    root = ET.SubElement(model, 'root')
+    ET.SubElement(root, 'mxCell').set('id', '0')
+    for m in range(modules):
+        cell = ET.SubElement(root, 'mxCell')
+        cell.set('id', f'module_{m}')
+        cell.set('value', f'<p style="margin:0px;font-weight:bold;">Module{m}</p><hr size="1"/><p>Targets: 6</p>')
+        cell.set('style', 'shape=module;align=left;spacingLeft=20;verticalAlign=top;whiteSpace=wrap;html=1;')
+        cell.set('vertex', '1')
+        cell.set('parent', 'base_layer')
+        geo = ET.SubElement(cell, 'mxGeometry')
+        geo.set('x', str(m * 320.0))
+        geo.set('y', '120')
+        geo.set('width', '240')
+        geo.set('height', '180')
+        geo.set('as', 'geometry')
+        if m:
+            edge = ET.SubElement(root, 'mxCell')
+            edge.set('id', f'edge_{m}')
+            edge.set('style', 'edgeStyle=orthogonalEdgeStyle;rounded=1;html=1;')
+            edge.set('edge', '1')
+            edge.set('source', f'module_{m}')
+            edge.set('target', f'module_{m - 1}')
+            edge.set('parent', 'base_layer')
+            edge_geo = ET.SubElement(edge, 'mxGeometry')
+            edge_geo.set('relative', '1')
+            edge_geo.set('as', 'geometry')
+            ET.SubElement(edge_geo, 'Array').set('as', 'points')
+    return mxfile
+
+
+def legacy_module_pages_xml(packages_data):
+    """Páginas de módulos como en el generador anterior: una cadena construida con +="""
+    ITEMS_PER_ROW = 4
+    ITEM_WIDTH = 280
+    CONTAINER_PADDING = 40
+    BASE_HEIGHT = 60
+    DEP_HEIGHT = 20
+    PADDING = 40
+
+    def calculate_target_height(dependencies):
+        if not dependencies:
+            return BASE_HEIGHT
+        return BASE_HEIGHT + (len(dependencies) * DEP_HEIGHT) + 20
+
+    xml = '''<?xml version="1.0" encoding="UTF-8"?>
+        <mxfile host="app.diagrams.net" modified="{}" agent="SPM Module Generator" version="21.6.8" type="device">'''.format(
+        datetime.now().isoformat()
+    )
+
+    for idx, (package_path, (package_name, targets)) in enumerate(packages_data.items()):
+        max_target_height = max(calculate_target_height(deps) for deps in targets.values())
+        ROW_HEIGHT = max_target_height + PADDING
+        num_targets = len(targets)
+        num_rows = (num_targets + ITEMS_PER_ROW - 1) // ITEMS_PER_ROW
+        total_width = min(num_targets, ITEMS_PER_ROW) * (ITEM_WIDTH + PADDING)
+        total_height = 100 + (num_rows * ROW_HEIGHT)
+        container_width = total_width + (2 * CONTAINER_PADDING) + 40
+        container_height = total_height + (2 * CONTAINER_PADDING)
+
+        xml += f'''
+        <diagram id="module-{idx}" name="{package_name}">
+            <mxGraphModel dx="1422" dy="794" grid="1" gridSize="10" guides="1" tooltips="1" connect="1" arrows="1" fold="1" page="1" pageScale="1" pageWidth="{max(850, container_width + 200)}" pageHeight="{max(1100, container_height + 200)}">
+            <root>
+                <mxCell id="0"/>
+                <mxCell id="1" parent="0"/>
+
+                <mxCell id="title_{idx}" value="{package_name}" style="text;html=1;strokeColor=none;fillColor=none;align=center;verticalAlign=middle;whiteSpace=wrap;rounded=0;fontSize=24;fontStyle=1" vertex="1" parent="1">
+                    <mxGeometry x="{(container_width - 200) / 2 + CONTAINER_PADDING}" y="20" width="200" height="40" as="geometry"/>
+                </mxCell>
+
+                <mxCell id="module_container_{idx}" value="Módulo: {package_name}" style="swimlane;fontStyle=1;childLayout=stackLayout;horizontal=1;startSize=30;horizontalStack=0;resizeParent=1;resizeParentMax=0;resizeLast=0;collapsible=1;marginBottom=0;fillColor=#f5f5f5;strokeColor=#666666;" vertex="1" parent="1">
+                    <mxGeometry x="{CONTAINER_PADDING}" y="80" width="{container_width - 2 * CONTAINER_PADDING + 40}" height="{container_height - 80}" as="geometry"/>
+                </mxCell>'''
+
+        for i, (target_name, dependencies) in enumerate(targets.items()):
+            row = i // ITEMS_PER_ROW
+            col = i % ITEMS_PER_ROW
+            x = 40 + (col * (ITEM_WIDTH + PADDING))
+            y = 40 + (row * ROW_HEIGHT)
+            height = calculate_target_height(dependencies)
+            xml += f'''
+                <mxCell id="target_{idx}_{i}" value="" style="swimlane;fontStyle=1;childLayout=stackLayout;horizontal=1;startSize=30;horizontalStack=0;resizeParent=1;resizeParentMax=0;resizeLast=0;collapsible=1;marginBottom=0;fillColor=#dae8fc;strokeColor=#6c8ebf;" vertex="1" parent="module_container_{idx}">
+                    <mxGeometry x="{x}" y="{y}" width="{ITEM_WIDTH}" height="{height}" as="geometry"/>
+                </mxCell>
+
+                <mxCell id="target_{idx}_{i}_name" value="{target_name}" style="text;strokeColor=none;fillColor=none;align=center;verticalAlign=middle;spacingLeft=4;spacingRight=4;overflow=hidden;points=[[0,0.5],[1,0.5]];portConstraint=eastwest;rotatable=0;fontStyle=1" vertex="1" parent="target_{idx}_{i}">
+                    <mxGeometry y="0" width="{ITEM_WIDTH}" height="30" as="geometry"/>
+                </mxCell>'''
+            for j, dep in enumerate(dependencies):
+                xml += f'''
+                <mxCell id="target_{idx}_{i}_dep_{j}" value="• {dep}" style="text;strokeColor=none;fillColor=none;align=left;verticalAlign=middle;spacingLeft=12;spacingRight=4;overflow=hidden;points=[[0,0.5],[1,0.5]];portConstraint=eastwest;rotatable=0;" vertex="1" parent="target_{idx}_{i}">
+                    <mxGeometry y="{30 + j * DEP_HEIGHT}" width="{ITEM_WIDTH}" height="{DEP_HEIGHT}" as="geometry"/>
+                </mxCell>'''
+
+        xml += '''
+            </root>
+            </mxGraphModel>
+        </diagram>'''
+
+    xml += '\n</mxfile>'
+    return xml
+
+
+def legacy_write(path, modules, packages_data):
+    """Camino anterior: árbol completo -> cadena -> minidom -> cadena indentada -> archivo"""
+    mxfile = ET.Element('mxfile')
+    mxfile.set('host', 'app.diagrams.net')
+    mxfile.append(build_main_mxfile(modules).find('diagram'))
+    modules_root = ET.fromstring(legacy_module_pages_xml(packages_data))
+    for diagram in modules_root.findall('diagram'):
+        mxfile.append(diagram)
+    xml_str = '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(mxfile, encoding='unicode')
+    pretty_xml = minidom.parseString(xml_str).toprettyxml(indent="  ")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(pretty_xml)
+
+
+def streaming_write(path, modules, packages_data, indent='  ', compress=False):
+    """Camino nuevo: el diagrama principal se vuelca elemento a elemento y las páginas se emiten al generarse"""
+    main_mxfile = build_main_mxfile(modules)
+    with open(path, 'w', encoding='utf-8') as f:
+        writer = MXFileWriter(f, indent=indent, compress=compress)
+        writer.start_file(host='app.diagrams.net')
+        writer.element(main_mxfile.find('diagram'))
+        main_mxfile.clear()
+        write_module_pages(writer, packages_data)
+        writer.end_file()
+
+
+def measure(function, repeat):
+    """Mejor tiempo de 'repeat' ejecuciones y pico de memoria de una ejecución adicional"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la escritura del diagrama unificado')
+    parser.add_argument('--modules', type=int, default=400, help='Módulos SPM del proyecto sintético')
+    parser.add_argument('--targets', type=int, default=6, help='Targets por módulo')
+    parser.add_argument('--deps', type=int, default=8, help='Dependencias por target')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones (se toma la mejor)')
+    args = parser.parse_args()
+
+    packages_data = generate_packages_data(args.modules, args.targets, args.deps)
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_path = os.path.join(directory, 'legacy.xml')
+        streaming_path = os.path.join(directory, 'streaming.xml')
+        compact_path = os.path.join(directory, 'compact.xml')
+        compressed_path = os.path.join(directory, 'compressed.xml')
+
+        scenarios = [
+            ('ET + minidom (anterior)', legacy_path, lambda: legacy_write(legacy_path, args.modules, packages_data)),
+            ('MXFileWriter, indentado', streaming_path, lambda: streaming_write(streaming_path, args.modules, packages_data)),
+            ('MXFileWriter, compacto', compact_path, lambda: streaming_write(compact_path, args.modules, packages_data, indent=None)),
+            ('MXFileWriter, comprimido', compressed_path,
+             lambda: streaming_write(compressed_path, args.modules, packages_data, compress=True)),
+        ]
+
+        print(f"📊 Proyecto sintético: {args.modules} módulos x {args.targets} targets x {args.deps} dependencias")
+        for name, path, function in scenarios:
+            elapsed, peak = measure(function, args.repeat)
+            size = os.path.getsize(path)
+            print(f"  {name:26} {elapsed * 1000:9.1f} ms   pico {peak / 1048576:8.1f} MB   "
+                  f"archivo {size / 1048576:6.1f} MB ({peak / size:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# benchmarks/github_graphql_benchmark.py
+#
+# Resuelve un lote de repositorios de GitHub contra el servidor local de
+# api_stub.py (respuestas de fixtures/remote_versions.json) y comprueba la ruta
+# GraphQL del VersionChecker:
+#   - una consulta por cada bloque de 50 repositorios, con los alias reiniciados
+#     en cada bloque
+#   - un alias NOT_FOUND es un resultado ("N/A") y no se repite por REST
+#   - un alias con otro error (FORBIDDEN) se resuelve después por REST
+#   - si la consulta entera falla, todo el lote se resuelve por REST
+# y compara el tiempo y el número de peticiones con la resolución solo por REST.
+# Termina con código 1 si alguna comprobación falla.
+#
+# Uso:
+#   python3 benchmarks/github_graphql_benchmark.py [--repos 120] [--latency 0.03]
+
+import io
+import os
+import sys
+import math
+import time
+import argparse
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_stub import APIStub, load_fixture, expected_versions, template_name
+from utils.github_graphql import GitHubGraphQLClient
+from utils.http_session import HTTPSessionPool
+from utils.version_checker import VersionChecker, CachePolicy
+
+CHUNK_SIZE = 50
+
+
+def repository_names(fixture, count):
+    """Repositorios del lote: las plantillas del fixture y copias numeradas (Alamofire-1...)"""
+    templates = list(fixture['github'])
+    return [templates[i % len(templates)] + (f'-{i // len(templates)}' if i >= len(templates) else '')
+            for i in range(count)]
+
+
+def resolve(urls, token):
+    """Resuelve el lote con un VersionChecker nuevo; con token, por GraphQL"""
+    if token:
+        os.environ['GITHUB_TOKEN'] = 'stub-token'
+    else:
+        os.environ.pop('GITHUB_TOKEN', None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        checker = VersionChecker(cache_policy=CachePolicy.FORCE_REFRESH)
+        start = time.perf_counter()
+        results = checker.get_latest_versions(urls)
+        elapsed = time.perf_counter() - start
+        checker.close()
+    return elapsed, results
+
+
+def check_chunk_boundaries(stub, fixture, failures):
+    """El bloque 1 termina en un NOT_FOUND y el bloque 2 empieza por un FORBIDDEN"""
+    names = repository_names(fixture, 2 * CHUNK_SIZE + 1)
+    names[CHUNK_SIZE - 1] = 'example/removed-repo-90'
+    names[CHUNK_SIZE] = 'example/saml-protected-90'
+    repos = [tuple(name.split('/')) for name in names]
+
+    client = GitHubGraphQLClient(HTTPSessionPool(), 'stub-token', f'{stub.url}/graphql', chunk_size=CHUNK_SIZE)
+    stub.reset_counters()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = client.fetch_repositories(repos)
+
+    checks = {
+        'consultas GraphQL por bloque': stub.requests.get('github_graphql') == 3,
+        'NOT_FOUND al final del bloque -> None': results.get(repos[CHUNK_SIZE - 1], 'ausente') is None,
+        'FORBIDDEN al principio del bloque -> pendiente': repos[CHUNK_SIZE] not in results,
+        'último repositorio (bloque de 1)': (results.get(repos[-1]) or {}).get('latest_release')
+        == fixture['github'][template_name(names[-1])]['latest_release'],
+        'los demás FORBIDDEN quedan pendientes': len(results) == sum(
+            1 for name in names if fixture['github'][template_name(name)].get('graphql_error') != 'FORBIDDEN'),
+    }
+    for label, ok in checks.items():
+        print(f"  {'✅' if ok else '❌'} {label}")
+        if not ok:
+            failures.append(label)
+
+
+def check_batch(label, elapsed, results, expected, failures):
+    wrong = {url: (results.get(url), version) for url, version in expected.items() if results.get(url) != version}
+    print(f"  {'✅' if not wrong else '❌'} {label:30} {elapsed * 1000:9.1f} ms")
+    for url, (got, version) in list(wrong.items())[:10]:
+        print(f"     {url}: {got} (esperado {version})")
+    if wrong:
+        failures.append(label)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark y comprobación de la resolución por GraphQL de GitHub')
+    parser.add_argument('--repos', type=int, default=120, help='Repositorios del lote')
+    parser.add_argument('--latency', type=float, default=0.03, help='Latencia de cada respuesta del servidor local (s)')
+    args = parser.parse_args()
+
+    fixture = load_fixture()
+    names = repository_names(fixture, args.repos)
+    urls = {f'https://github.com/{name}.git': name for name in names}
+    expected = expected_versions(fixture, {'github': urls})
+    forbidden = sum(1 for name in names if fixture['github'][template_name(name)].get('graphql_error') == 'FORBIDDEN')
+    failures = []
+
+    with APIStub(latency=args.latency) as stub, tempfile.TemporaryDirectory() as directory:
+        os.environ.update(stub.environment())
+        os.chdir(directory)
+        print(f"📊 {args.repos} repositorios de GitHub, latencia {args.latency * 1000:.0f} ms por petición")
+
+        stub.reset_counters()
+        elapsed, results = resolve(urls, token=True)
+        check_batch('GraphQL', elapsed, results, expected, failures)
+        graphql_requests = dict(stub.requests)
+        print(f"     peticiones: {graphql_requests}")
+        checks = {
+            f'una consulta por bloque de {CHUNK_SIZE}': graphql_requests.get('github_graphql') == math.ceil(args.repos / CHUNK_SIZE),
+            'solo los FORBIDDEN pasan a REST': graphql_requests.get('github_tags', 0) == forbidden
+            and graphql_requests.get('github_release', 0) == 0,
+        }
+        for label, ok in checks.items():
+            print(f"  {'✅' if ok else '❌'} {label}")
+            if not ok:
+                failures.append(label)
+
+        stub.reset_counters()
+        elapsed, results = resolve(urls, token=False)
+        check_batch('Solo REST', elapsed, results, expected, failures)
+        print(f"     peticiones: {dict(stub.requests)}")
+
+        stub.graphql_mode = 'error'
+        stub.reset_counters()
+        elapsed, results = resolve(urls, token=True)
+        check_batch('GraphQL con error -> REST', elapsed, results, expected, failures)
+        stub.graphql_mode = 'ok'
+
+        print("🧩 Límites de bloque:")
+        check_chunk_boundaries(stub, fixture, failures)
+        os.chdir(os.path.dirname(directory))
+
+    if failures:
+        print(f"❌ {len(failures)} comprobaciones fallidas")
+        sys.exit(1)
+    print("✅ Todas las comprobaciones correctas")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/import_scanner_benchmark.py
+#
+# Mide el escáner de import de Swift sobre un proyecto sintético: escaneo en frío
+# (sin caché de parseo), en caliente (caché cargada desde disco) y con un 1% de
+# archivos modificados, comparado con leer y buscar en cada archivo completo.
+#
+# Uso:
+#   python3 benchmarks/import_scanner_benchmark.py [--files 25000] [--lines 300] [--jobs 4]
+
+import os
+import re
+import sys
+import time
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.import_scanner import ImportScanner
+from utils.parse_cache import ParseCache
+
+LICENSE_HEADER = '//\n//  {name}.swift\n//  Synthetic\n//\n//  Copyright © 2024. All rights reserved.\n//\n\n'
+
+
+def generate_project(directory, files, lines):
+    """Archivos Swift sintéticos: cabecera de licencia, 2-6 import y 'lines' líneas de código"""
+    paths = []
+    for i in range(files):
+        module_dir = os.path.join(directory, f'Module{i % 200}', 'Sources')
+        os.makedirs(module_dir, exist_ok=True)
+        path = os.path.join(module_dir, f'File{i}.swift')
+        imports = ['import Foundation', 'import UIKit'] + [f'import Module{(i + d) % 200}' for d in range(1, i % 5)]
+        if i % 7 == 0:
+            imports.append('@testable import Core')
+        body = '\n'.join(f'    let value{line} = "import-like text {line}"' for line in range(lines))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(LICENSE_HEADER.format(name=f'File{i}'))
+            f.write('\n'.join(imports))
+            f.write(f'\n\nfinal class File{i} {{\n{body}\n}}\n')
+        paths.append(path)
+    return paths
+
+
+def full_read_scan(paths):
+    """Referencia: leer cada archivo completo como texto y buscar con la regex sobre todo su contenido"""
+    pattern = re.compile(r'^(@testable\s+)?import\s+(\w+)', re.MULTILINE)
+    result = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            result[path] = [match.group(2) for match in pattern.finditer(f.read())]
+    return result
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del escáner de import de Swift')
+    parser.add_argument('--files', type=int, default=25000, help='Archivos Swift del proyecto sintético')
+    parser.add_argument('--lines', type=int, default=300, help='Líneas de código por archivo')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Procesos del escáner')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = generate_project(os.path.join(directory, 'project'), args.files, args.lines)
+        cache_path = os.path.join(directory, 'parse_cache.json')
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"📊 Proyecto sintético: {args.files} archivos Swift, {size / 1048576:.1f} MB")
+
+        elapsed, _ = timed(lambda: full_read_scan(paths))
+        print(f"  {'Lectura completa':28} {elapsed * 1000:9.1f} ms")
+
+        for jobs in sorted({1, args.jobs}):
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            cache = ParseCache(cache_path)
+            elapsed, _ = timed(lambda: ImportScanner(cache, jobs=jobs).scan(paths))
+            cache.save()
+            print(f"  {f'Escáner en frío, {jobs} proc.':28} {elapsed * 1000:9.1f} ms")
+
+        elapsed, _ = timed(lambda: ImportScanner(ParseCache(cache_path), jobs=args.jobs).scan(paths))
+        print(f"  {'Escáner con caché':28} {elapsed * 1000:9.1f} ms   (incluye cargar la caché)")
+
+        # Los archivos modificados se detectan por el cambio de mtime
+        for path in paths[::100]:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write('// modificado\n')
+        elapsed, _ = timed(lambda: ImportScanner(ParseCache(cache_path), jobs=args.jobs).scan(paths))
+        print(f"  {'Escáner, 1% modificados':28} {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
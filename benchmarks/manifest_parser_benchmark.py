@@ -0,0 +1,169 @@
+# benchmarks/manifest_parser_benchmark.py
+#
+# Compara el parser de Package.swift basado en tokens con el parseo anterior por
+# expresiones regulares (incluido aquí tal cual estaba en el generador).
+#
+# Uso:
+#   python3 benchmarks/manifest_parser_benchmark.py [ruta/Package.swift] [--lines 3000] [--repeat 5]
+
+import os
+import re
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.package_manifest import PackageManifest
+
+
+def legacy_parse(content):
+    """Parseo anterior: nueve pasadas de re.finditer para dependencias y regex .*? para targets"""
+    dependencies = []
+    dependency_patterns = {
+        'standard': [
+            r'\.package\(url:\s*"([^"]+)",\s*from:\s*"([^"]+)"\)',
+            r'\.package\(url:\s*"([^"]+)",\s*exact:\s*"([^"]+)"\)',
+            r'\.package\(url:\s*"([^"]+)",\s*branch:\s*"([^"]+)"\)',
+            r'\.package\(url:\s*"([^"]+)",\s*revision:\s*"([^"]+)"\)',
+        ],
+        'range': [
+            r'\.package\(url:\s*"([^"]+)",\s*\.upToNextMajor\(from:\s*"([^"]+)"\)\)',
+            r'\.package\(url:\s*"([^"]+)",\s*\.upToNextMinor\(from:\s*"([^"]+)"\)\)',
+        ],
+        'custom': [
+            r'\.package\(url:\s*"([^"]+)",\s*exact:\s*\.init\(stringLiteral:\s*"([^"]+)"\)\)'
+        ]
+    }
+    for pattern_type, patterns in dependency_patterns.items():
+        for pattern in patterns:
+            for match in re.finditer(pattern, content):
+                dependencies.append({'url': match.group(1), 'version': match.group(2), 'type': pattern_type})
+    for pattern in [r'\.package\(path:\s*"([^"]+)"\)', r'\.package\(name:\s*"([^"]+)",\s*path:\s*"([^"]+)"\)']:
+        for match in re.finditer(pattern, content):
+            dependencies.append({'path': match.groups()[-1], 'isLocal': True})
+
+    package_name = re.search(r'name:\s*"([^"]+)"', content)
+    targets = {}
+    for block in re.finditer(r'\.target\(\s*name:\s*"([^"]+)".*?dependencies:\s*\[(.*?)\]', content, re.DOTALL):
+        deps_text = block.group(2)
+        deps = set()
+        for dep in re.finditer(r'"([^"]+)\s*\(([^)]+)\)"', deps_text):
+            deps.add(f"{dep.group(1)} ({dep.group(2).strip()})")
+        for dep in re.finditer(r'\.product\s*\(\s*name:\s*"([^"]+)"\s*,\s*package:\s*"([^"]+)"\s*\)', deps_text):
+            deps.add(f"{dep.group(1)} ({dep.group(2)})")
+        for dep in re.finditer(r'"([^"(]+?)"(?!\s*\()', deps_text):
+            if not any(dep.group(1) in d for d in deps):
+                deps.add(dep.group(1))
+        targets[block.group(1)] = sorted(deps)
+
+    return package_name.group(1) if package_name else "Unknown", targets, dependencies
+
+
+def generate_umbrella_manifest(lines, grouped=False):
+    """
+    Genera un manifiesto paraguas sintético de aproximadamente 'lines' líneas, con la
+    mezcla habitual: dependencias en una y varias líneas, targets con y sin
+    'dependencies:' (recursos y binarios) y tests.
+    Con grouped=True los targets sin dependencias van agrupados al final del array,
+    que es el caso en el que la regex '.*?dependencies:' recorre el resto del archivo
+    por cada target.
+    """
+    features = max(1, lines // 18)
+    out = ['// swift-tools-version:5.9', 'import PackageDescription', '', 'let package = Package(',
+           '    name: "Umbrella",', '    products: [']
+    for i in range(features):
+        out.append(f'        .library(name: "Feature{i}", targets: ["Feature{i}"]),')
+    out += ['    ],', '    dependencies: [']
+    for i in range(features):
+        if i % 3 == 0:
+            out.append(f'        .package(url: "https://github.com/org/dep{i}.git", from: "{i % 9}.{i % 7}.0"),')
+        elif i % 3 == 1:
+            out += ['        .package(',
+                    f'            url: "https://github.com/org/dep{i}.git",',
+                    f'            .upToNextMajor(from: "1.{i}.0")',
+                    '        ),']
+        else:
+            out.append(f'        .package(path: "../Local{i}"),')
+    out += ['    ],', '    targets: [']
+
+    resource_targets = []
+    for i in range(features):
+        out += [
+            '        .target(',
+            f'            name: "Feature{i}",',
+            '            dependencies: [',
+            f'                .product(name: "Dep{i}", package: "dep{i}"),',
+            f'                "Feature{i}Resources",',
+            '                // Dependencia comentada',
+            '            ],',
+            f'            path: "Sources/Feature{i}"',
+            '        ),',
+            f'        .testTarget(name: "Feature{i}Tests", dependencies: ["Feature{i}"]),',
+        ]
+        resources = [
+            '        .target(',
+            f'            name: "Feature{i}Resources",',
+            f'            path: "Sources/Feature{i}Resources",',
+            '            resources: [.process("Assets")]',
+            '        ),',
+        ]
+        if i % 5 == 0:
+            resources.append(f'        .binaryTarget(name: "Vendor{i}", path: "Frameworks/Vendor{i}.xcframework"),')
+        if grouped:
+            resource_targets += resources
+        else:
+            out += resources
+    out += resource_targets
+    out += ['    ]', ')']
+    return '\n'.join(out) + '\n'
+
+
+def measure(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del parser de Package.swift')
+    parser.add_argument('manifest', nargs='?', help='Package.swift a medir (por defecto uno sintético)')
+    parser.add_argument('--lines', type=int, default=3000, help='Líneas del manifiesto sintético')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeticiones (se toma la mejor)')
+    args = parser.parse_args()
+
+    if args.manifest:
+        with open(args.manifest, 'r', encoding='utf-8') as f:
+            scenarios = [(args.manifest, f.read())]
+    else:
+        scenarios = [
+            ('sintético, targets intercalados', generate_umbrella_manifest(args.lines)),
+            ('sintético, recursos agrupados al final', generate_umbrella_manifest(args.lines, grouped=True)),
+        ]
+
+    for source, content in scenarios:
+        run_benchmark(source, content, args.repeat)
+
+
+def run_benchmark(source, content, repeat):
+    print(f"📄 Manifiesto ({source}): {len(content.splitlines())} líneas, {len(content)} bytes")
+
+    legacy = measure(lambda: legacy_parse(content), repeat)
+    tokenized = measure(lambda: PackageManifest.from_source('<benchmark>', content), repeat)
+
+    _, legacy_targets, legacy_dependencies = legacy_parse(content)
+    manifest = PackageManifest.from_source('<benchmark>', content)
+
+    print(f"  Regex (anterior):  {legacy * 1000:8.2f} ms  "
+          f"({len(legacy_dependencies)} dependencias, {len(legacy_targets)} targets)")
+    print(f"  Tokenizer + AST:   {tokenized * 1000:8.2f} ms  "
+          f"({len(manifest.dependencies)} dependencias, {len(manifest.targets)} targets)")
+    print(f"  Relación: {legacy / tokenized:.2f}x")
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
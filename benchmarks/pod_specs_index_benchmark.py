@@ -0,0 +1,236 @@
+# benchmarks/pod_specs_index_benchmark.py
+#
+# Compila el índice local de specs (PodSpecsIndex) a partir de los shards del CDN
+# de fixtures/pod_specs/ y de los mismos pods en un checkout de Specs generado
+# (con reparto Specs/<a>/<b>/<c>/<Pod>/<versión>/ y en el formato antiguo sin
+# reparto), y comprueba que:
+#   - los tres orígenes dan las versiones esperadas, con y sin prereleases,
+#     para subspecs y sin distinguir mayúsculas
+#   - el índice solo se recompila cuando cambia la firma del origen (tamaño de
+#     un shard, commit de git del checkout)
+#   - PodfileAnalyzer solo consulta trunk (servidor local de api_stub.py) para
+#     los pods que no están en el índice
+# y mide la compilación y las consultas con un origen CDN sintético grande.
+# Termina con código 1 si alguna comprobación falla.
+#
+# Uso:
+#   python3 benchmarks/pod_specs_index_benchmark.py [--pods 100000] [--lookups 150]
+
+import io
+import os
+import sys
+import time
+import random
+import shutil
+import hashlib
+import logging
+import argparse
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_stub import APIStub
+from core.pod_analyzer import PodfileAnalyzer
+from utils.pod_specs_index import PodSpecsIndex
+from utils.version_checker import VersionChecker, CachePolicy
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pod_specs')
+
+# Consulta -> (última versión, última versión estable); None si el índice no la resuelve
+EXPECTED = {
+    'Alamofire': ('5.9.1', '5.9.1'),
+    'alamofire': ('5.9.1', '5.9.1'),
+    'Firebase/Analytics': ('10.18.0', '10.18.0'),
+    'GoogleMaps': ('8.4.0', '8.4.0'),
+    'Realm': ('10.45.2', '10.45.2'),
+    'SnapshotKit': ('0.1.0-alpha.2', None),
+    'LegacyPod': ('v1.10', 'v1.10'),
+    'SwiftLint': ('0.55.1', '0.55.1'),
+    'NightlyOnly': (None, None),
+    'NotInIndex': (None, None),
+}
+
+# Pods de la comprobación con trunk: los dos últimos no están en el índice (o no tienen versión semver)
+ANALYZER_PODS = ['Firebase/Analytics', 'GoogleMaps', 'Realm', 'RemovedPod', 'NightlyOnly']
+ANALYZER_EXPECTED = {'Firebase/Analytics': '10.18.0', 'GoogleMaps': '8.4.0', 'Realm': '10.45.2',
+                     'RemovedPod': 'N/A', 'NightlyOnly': 'N/A'}
+
+
+def read_fixture():
+    """Pods de los shards del fixture: {pod: [versiones]}"""
+    pods = {}
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.strip().split('/')
+                if len(fields) > 1:
+                    pods[fields[0]] = fields[1:]
+    return pods
+
+
+def write_specs(root, pods, sharded=True):
+    """Checkout de Specs con un podspec por versión, repartido por el md5 del nombre como CocoaPods"""
+    for name, versions in pods.items():
+        shard = list(hashlib.md5(name.encode()).hexdigest()[:3]) if sharded else []
+        for version in versions:
+            directory = os.path.join(root, 'Specs', *shard, name, version)
+            os.makedirs(directory)
+            with open(os.path.join(directory, f'{name}.podspec.json'), 'w', encoding='utf-8') as f:
+                f.write(f'{{"name": "{name}", "version": "{version}"}}\n')
+
+
+def write_cdn(directory, count):
+    """Origen CDN sintético de count pods repartidos en 16 shards"""
+    random.seed(count)
+    os.makedirs(directory)
+    shards = {}
+    for i in range(count):
+        versions = [f'{major}.{minor}.{random.randint(0, 9)}' for major in range(random.randint(1, 4))
+                    for minor in range(random.randint(1, 5))]
+        shards.setdefault(i % 16, []).append('/'.join([f'Pod{i}'] + versions))
+    for shard, lines in shards.items():
+        with open(os.path.join(directory, f'all_pods_versions_{shard:x}.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+
+def report(label, ok, failures, detail=''):
+    print(f"  {'✅' if ok else '❌'} {label}{detail}")
+    if not ok:
+        failures.append(label)
+
+
+def check_lookups(label, index, failures):
+    """Versiones del índice frente a EXPECTED, una a una y en lote"""
+    wrong = []
+    for include_prereleases, column in ((True, 0), (False, 1)):
+        expected = {name: versions[column] for name, versions in EXPECTED.items() if versions[column]}
+        batch = index.latest_versions(EXPECTED, include_prereleases)
+        single = {name: index.latest_version(name, include_prereleases) for name in EXPECTED}
+        wrong += [f"{name} (prereleases={include_prereleases}): {single[name]} / {batch.get(name)}, "
+                  f"esperado {expected.get(name)}"
+                  for name in EXPECTED if single[name] != expected.get(name) or batch.get(name) != expected.get(name)]
+    report(f'{label}: versiones esperadas', not wrong, failures)
+    for line in wrong[:10]:
+        print(f"     {line}")
+
+
+def check_sources(directory, pods, failures):
+    # Shards del CDN del fixture
+    cdn = os.path.join(directory, 'cdn')
+    shutil.copytree(FIXTURE_DIR, cdn)
+    index = PodSpecsIndex(cdn, os.path.join(directory, 'cdn.sqlite'))
+    first, second = index.build(), index.build()
+    check_lookups('CDN', index, failures)
+    report('CDN: todas las versiones publicadas', index.versions('Firebase') == pods['Firebase'], failures)
+    report('CDN: sin cambios no se recompila', first and not second, failures)
+    shard = os.path.join(cdn, sorted(os.listdir(cdn))[0])
+    with open(shard, 'a', encoding='utf-8') as f:
+        f.write('NewPod/1.0.0\n')
+    report('CDN: un shard modificado se recompila', index.build() and index.latest_version('NewPod') == '1.0.0',
+           failures)
+    index.close()
+
+    # Checkout de Specs repartido, con la firma del commit de git
+    specs = os.path.join(directory, 'specs')
+    write_specs(specs, pods)
+    os.makedirs(os.path.join(specs, '.git', 'refs', 'heads'))
+    with open(os.path.join(specs, '.git', 'HEAD'), 'w') as f:
+        f.write('ref: refs/heads/master\n')
+    ref = os.path.join(specs, '.git', 'refs', 'heads', 'master')
+    with open(ref, 'w') as f:
+        f.write('1' * 40 + '\n')
+    index = PodSpecsIndex(specs, os.path.join(directory, 'specs.sqlite'))
+    first, second = index.build(), index.build()
+    check_lookups('Specs', index, failures)
+    report('Specs: firma del commit de git', index.source_signature() == 'git:' + '1' * 40, failures)
+    report('Specs: sin cambios no se recompila', first and not second, failures)
+    write_specs(specs, {'Realm': ['10.46.0']})
+    with open(ref, 'w') as f:
+        f.write('2' * 40 + '\n')
+    report('Specs: un commit nuevo se recompila', index.build() and index.latest_version('Realm') == '10.46.0',
+           failures)
+    index.close()
+
+    # Formato antiguo sin reparto y sin git
+    flat = os.path.join(directory, 'flat')
+    write_specs(flat, pods, sharded=False)
+    index = PodSpecsIndex(os.path.join(flat, 'Specs'), os.path.join(directory, 'flat.sqlite'))
+    index.build()
+    check_lookups('Specs sin reparto', index, failures)
+    index.close()
+
+
+def check_analyzer(directory, failures):
+    """Los pods del índice no se consultan en trunk"""
+    index = PodSpecsIndex(FIXTURE_DIR, os.path.join(directory, 'analyzer.sqlite'))
+    index.build()
+    with APIStub() as stub:
+        os.environ.update(stub.environment())
+        with contextlib.redirect_stdout(io.StringIO()):
+            checker = VersionChecker(cache_policy=CachePolicy.FORCE_REFRESH)
+            analyzer = PodfileAnalyzer(directory, specs_index=index, version_checker=checker)
+            results = analyzer.get_latest_pod_versions(ANALYZER_PODS)
+            checker.close()
+        trunk_requests = stub.requests.get('trunk', 0)
+    index.close()
+    report('PodfileAnalyzer: versiones esperadas', results == ANALYZER_EXPECTED, failures,
+           '' if results == ANALYZER_EXPECTED else f" {results}")
+    report('PodfileAnalyzer: trunk solo para los pods fuera del índice', trunk_requests == 2, failures,
+           f" ({trunk_requests} peticiones)")
+
+
+def measure(directory, count, lookups):
+    source = os.path.join(directory, 'large')
+    write_cdn(source, count)
+    index = PodSpecsIndex(source, os.path.join(directory, 'large.sqlite'))
+    start = time.perf_counter()
+    index.build()
+    build_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    index.build()
+    skip_elapsed = time.perf_counter() - start
+
+    names = [f'Pod{i}' for i in random.sample(range(count), min(lookups, count))]
+    start = time.perf_counter()
+    for name in names:
+        index.latest_version(name)
+    single_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    index.latest_versions(names)
+    batch_elapsed = time.perf_counter() - start
+    index.close()
+
+    print(f"📊 Origen CDN sintético: {count} pods")
+    print(f"  {'Compilación':28} {build_elapsed * 1000:9.1f} ms")
+    print(f"  {'Índice al día':28} {skip_elapsed * 1000:9.1f} ms")
+    print(f"  {f'{len(names)} consultas una a una':28} {single_elapsed * 1000:9.1f} ms")
+    print(f"  {f'{len(names)} consultas en lote':28} {batch_elapsed * 1000:9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark y comprobación del índice local de specs de CocoaPods')
+    parser.add_argument('--pods', type=int, default=100000, help='Pods del origen CDN sintético')
+    parser.add_argument('--lookups', type=int, default=150, help='Pods consultados en la medición')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    pods = read_fixture()
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        # La caché de versiones se guarda en results/ del directorio de trabajo
+        os.chdir(directory)
+        print(f"📚 Fixture: {len(pods)} pods en {len(os.listdir(FIXTURE_DIR))} shards del CDN")
+        check_sources(directory, pods, failures)
+        check_analyzer(directory, failures)
+        measure(directory, args.pods, args.lookups)
+        os.chdir(os.path.dirname(directory))
+
+    if failures:
+        print(f"❌ {len(failures)} comprobaciones fallidas")
+        sys.exit(1)
+    print("✅ Todas las comprobaciones correctas")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# benchmarks/version_batch_benchmark.py
+#
+# Resuelve un lote de dependencias de GitHub, GitLab y CocoaPods trunk contra el
+# servidor local de api_stub.py (respuestas de fixtures/remote_versions.json),
+# una a una como antes y con get_latest_versions, y comprueba que:
+#   - ambos caminos devuelven las versiones esperadas del fixture
+#   - las URLs repetidas se consultan una sola vez
+#   - ningún host recibe más de max_per_host consultas simultáneas
+#   - con deadline, una consulta lenta se da como "N/A" sin retrasar el lote
+# Termina con código 1 si alguna comprobación falla.
+#
+# Uso:
+#   python3 benchmarks/version_batch_benchmark.py [--deps 60] [--latency 0.05] [--workers 8] [--per-host 4]
+
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_stub import APIStub, load_fixture, expected_versions
+from utils.version_checker import VersionChecker, CachePolicy
+
+# Repositorio que el servidor retrasa en la comprobación del deadline
+SLOW_REPOSITORY = 'SnapKit/SnapKit-99'
+SLOW_DELAY = 2.0
+DEADLINE = 0.5
+
+
+def build_urls(fixture, count, trunk_url):
+    """URLs del lote repartidas entre GitHub, GitLab y trunk: {sección: {url: nombre}}"""
+    sections = {'github': {}, 'gitlab': {}, 'pods': {}}
+    templates = {section: list(fixture[section]) for section in sections}
+    for i in range(count):
+        section = ('github', 'gitlab', 'pods')[i % 3]
+        names = templates[section]
+        index = i // 3
+        name = names[index % len(names)] + (f'-{index // len(names)}' if index >= len(names) else '')
+        if section == 'github':
+            url = f'https://github.com/{name}.git'
+        elif section == 'gitlab':
+            url = f'https://gitlab.com/{name}.git'
+        else:
+            url = f'{trunk_url}/pods/{name}'
+        sections[section][url] = name
+    return sections
+
+
+def new_checker(args):
+    return VersionChecker(cache_policy=CachePolicy.FORCE_REFRESH, max_workers=args.workers, max_per_host=args.per_host)
+
+
+def report(label, ok, failures, detail=''):
+    print(f"  {'✅' if ok else '❌'} {label}{detail}")
+    if not ok:
+        failures.append(label)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark y comprobación de la resolución de versiones en lote')
+    parser.add_argument('--deps', type=int, default=60, help='Dependencias del lote')
+    parser.add_argument('--latency', type=float, default=0.05, help='Latencia de cada respuesta del servidor local (s)')
+    parser.add_argument('--workers', type=int, default=8, help='Hilos del lote (max_workers)')
+    parser.add_argument('--per-host', type=int, default=4, help='Consultas simultáneas por host (max_per_host)')
+    args = parser.parse_args()
+
+    fixture = load_fixture()
+    failures = []
+    os.environ.pop('GITHUB_TOKEN', None)
+
+    with APIStub(latency=args.latency, delays={SLOW_REPOSITORY: SLOW_DELAY}) as stub, \
+            tempfile.TemporaryDirectory() as directory:
+        os.environ.update(stub.environment())
+        os.chdir(directory)
+        sections = build_urls(fixture, args.deps, stub.url)
+        expected = expected_versions(fixture, sections)
+        urls = list(expected)
+        print(f"📊 {len(urls)} dependencias (GitHub, GitLab y trunk), latencia {args.latency * 1000:.0f} ms por petición")
+
+        # Una a una, como se resolvían antes del lote
+        stub.reset_counters()
+        with contextlib.redirect_stdout(io.StringIO()):
+            checker = new_checker(args)
+            start = time.perf_counter()
+            serial = {url: checker.get_latest_version(url) for url in urls}
+            serial_elapsed = time.perf_counter() - start
+            checker.close()
+        serial_requests = sum(stub.requests.values())
+        print(f"  {'Una a una':28} {serial_elapsed * 1000:9.1f} ms   ({serial_requests} peticiones)")
+
+        # En lote, con cada URL repetida para comprobar que se consulta una sola vez
+        stub.reset_counters()
+        with contextlib.redirect_stdout(io.StringIO()):
+            checker = new_checker(args)
+            start = time.perf_counter()
+            batch = checker.get_latest_versions(urls + urls[::2])
+            batch_elapsed = time.perf_counter() - start
+            checker.close()
+        batch_requests = sum(stub.requests.values())
+        concurrency = dict(stub.max_concurrency)
+        print(f"  {'En lote':28} {batch_elapsed * 1000:9.1f} ms   ({batch_requests} peticiones, "
+              f"{serial_elapsed / batch_elapsed:.1f}x)")
+
+        wrong = {url: (serial.get(url), batch.get(url), version) for url, version in expected.items()
+                 if serial.get(url) != version or batch.get(url) != version}
+        report('versiones esperadas (una a una y en lote)', not wrong, failures)
+        for url, (got_serial, got_batch, version) in list(wrong.items())[:10]:
+            print(f"     {url}: {got_serial} / {got_batch} (esperado {version})")
+        report('URLs repetidas consultadas una vez', batch_requests == serial_requests, failures,
+               f" ({batch_requests} de {serial_requests})")
+        report(f'como mucho {args.per_host} consultas simultáneas por host',
+               max(concurrency.values()) <= args.per_host, failures, f" {concurrency}")
+
+        # Deadline: la consulta lenta no retrasa el lote
+        slow_url = f'https://github.com/{SLOW_REPOSITORY}.git'
+        with contextlib.redirect_stdout(io.StringIO()):
+            checker = new_checker(args)
+            start = time.perf_counter()
+            results = checker.get_latest_versions(urls[:10] + [slow_url], deadline=DEADLINE + args.latency * 10)
+            elapsed = time.perf_counter() - start
+            # La consulta lenta termina en segundo plano antes de cerrar la caché
+            time.sleep(SLOW_DELAY)
+            checker.close()
+        report('deadline: la consulta lenta queda como N/A',
+               results.get(slow_url) == 'N/A' and all(results.get(url) == expected[url] for url in urls[:10])
+               and elapsed < SLOW_DELAY, failures, f" ({elapsed * 1000:.0f} ms)")
+        os.chdir(os.path.dirname(directory))
+
+    if failures:
+        print(f"❌ {len(failures)} comprobaciones fallidas")
+        sys.exit(1)
+    print("✅ Todas las comprobaciones correctas")
+
+
+if __name__ == '__main__':
+    main()
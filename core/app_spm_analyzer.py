@@ -6,6 +6,9 @@ import re
 import logging
 import plistlib
 from typing import Dict, List, Optional, Tuple
+from utils.project_index import ProjectIndex
+from utils.parse_cache import ParseCache
+from .pbxproj_parser import PBXProject, SPM_ISA
 
 class AppSPMDependencyAnalyzer:
     """
@@ -14,9 +17,12 @@ class AppSPMDependencyAnalyzer:
     de proyecto Xcode.
     """
     
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, project_index: Optional[ProjectIndex] = None,
+                 parse_cache: Optional[ParseCache] = None):
         self.project_root = os.path.abspath(project_root)
         self.logger = self._setup_logging()
+        self.project_index = project_index or ProjectIndex(self.project_root)
+        self.parse_cache = parse_cache or ParseCache()
         self.direct_dependencies = []
         
     def _setup_logging(self):
@@ -30,183 +36,66 @@ class AppSPMDependencyAnalyzer:
     def _debug_extract_spm_info(self, file_path: str) -> List[Dict]:
         """
         Función de diagnóstico para extraer toda la información posible sobre paquetes SPM
-        del archivo project.pbxproj, mostrando los bloques completos encontrados.
+        del archivo project.pbxproj, mostrando los objetos completos encontrados.
         """
         dependencies = []
         debug_info = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            project = PBXProject.from_file(file_path, SPM_ISA)
             
             self.logger.info(f"🔍 ANÁLISIS DE DIAGNÓSTICO: {file_path}")
+            self.logger.info(f"archiveVersion={project.archive_version}, objectVersion={project.object_version}")
             
-            # 1. Buscar sección de XCRemoteSwiftPackageReference
-            self.logger.info("1. Buscando sección XCRemoteSwiftPackageReference")
-            section_match = re.search(r'\/\* Begin XCRemoteSwiftPackageReference section \*\/\s+(.*?)\/\* End XCRemoteSwiftPackageReference section \*\/', content, re.DOTALL)
-            
-            if section_match:
-                section = section_match.group(1)
-                self.logger.info(f"✅ Sección encontrada: {len(section)} bytes")
-                debug_info.append({"section": "XCRemoteSwiftPackageReference", "content_size": len(section)})
-                
-                # Extraer todos los bloques de la sección
-                blocks = re.finditer(r'([A-F0-9]+)\s+\/\*\s+(.*?)\s+\*\/\s+=\s+{(.*?)};', section, re.DOTALL)
-                
-                for i, block in enumerate(blocks):
-                    block_id = block.group(1)
-                    block_name = block.group(2)
-                    block_content = block.group(3)
-                    
-                    self.logger.info(f"\nBloque #{i+1}: ID={block_id}, Nombre={block_name}")
-                    self.logger.info(f"Contenido: {block_content}")
-                    
-                    # Extraer URL y requirement
-                    url_match = re.search(r'repositoryURL\s+=\s+"([^"]+)"', block_content)
-                    req_match = re.search(r'requirement\s+=\s+{(.*?)}', block_content, re.DOTALL)
-                    
-                    url = url_match.group(1) if url_match else "No URL encontrada"
-                    req = req_match.group(1) if req_match else "No requirement encontrado"
-                    
-                    self.logger.info(f"URL: {url}")
-                    self.logger.info(f"Requirement: {req}")
-                    
-                    # Guardar la información de debug
-                    debug_info.append({
-                        "block_id": block_id,
-                        "block_name": block_name,
-                        "url": url,
-                        "requirement": req,
-                        "full_content": block_content
-                    })
-                    
-                    # Intentar extraer detalles del requirement
-                    if req_match:
-                        kind_match = re.search(r'kind\s+=\s+([^;]+);', req)
-                        version_match = re.search(r'version\s+=\s+"([^"]+)"', req)
-                        min_version_match = re.search(r'minimumVersion\s+=\s+"([^"]+)"', req)
-                        max_version_match = re.search(r'maximumVersion\s+=\s+"([^"]+)"', req)
-                        branch_match = re.search(r'branch\s+=\s+"([^"]+)"', req)
-                        revision_match = re.search(r'revision\s+=\s+"([^"]+)"', req)
-                        
-                        kind = kind_match.group(1) if kind_match else "No kind encontrado"
-                        self.logger.info(f"Kind: {kind}")
-                        
-                        if version_match:
-                            self.logger.info(f"Version: {version_match.group(1)}")
-                        if min_version_match:
-                            self.logger.info(f"Min Version: {min_version_match.group(1)}")
-                        if max_version_match:
-                            self.logger.info(f"Max Version: {max_version_match.group(1)}")
-                        if branch_match:
-                            self.logger.info(f"Branch: {branch_match.group(1)}")
-                        if revision_match:
-                            self.logger.info(f"Revision: {revision_match.group(1)}")
-                    
-                    # Añadir a las dependencias
-                    name = block_name.strip() or url.split('/')[-1].replace('.git', '')
-                    version = "Extracción en diagnóstico"
-                    
-                    dependencies.append({
-                        'name': name,
-                        'url': url if url_match else "Desconocida",
-                        'version': version,
-                        'type': 'spm_app_direct',
-                        'source': 'project.pbxproj_debug',
-                        'debug_info': debug_info[-1]
-                    })
-            else:
-                self.logger.info("❌ No se encontró sección XCRemoteSwiftPackageReference")
-            
-            # 2. Buscar patrones de paquetes individuales
-            self.logger.info("\n2. Buscando patrones de paquetes individuales")
-            package_patterns = [
-                r'XCRemoteSwiftPackageReference\s+"([^"]+)"\s+=\s+{(.*?)};',
-                r'isa\s+=\s+XCRemoteSwiftPackageReference;\s+repositoryURL\s+=\s+"([^"]+)";\s+requirement\s+=\s+{(.*?)}'
-            ]
+            # 1. Referencias a paquetes remotos y locales
+            self.logger.info("1. Buscando objetos XCRemoteSwiftPackageReference / XCLocalSwiftPackageReference")
+            for isa in ('XCRemoteSwiftPackageReference', 'XCLocalSwiftPackageReference'):
+                references = project.objects_of(isa)
+                self.logger.info(f"{'✅' if references else '❌'} {len(references)} objetos {isa}")
+                debug_info.append({"section": isa, "objects": len(references)})
             
-            for pattern_idx, pattern in enumerate(package_patterns):
-                self.logger.info(f"Probando patrón #{pattern_idx+1}: {pattern[:30]}...")
-                matches = re.finditer(pattern, content, re.DOTALL)
-                
-                for i, match in enumerate(matches):
-                    if pattern_idx == 0:  # Primer patrón con nombre
-                        name = match.group(1)
-                        content_block = match.group(2)
-                        self.logger.info(f"\nPaquete #{i+1} (Patrón 1): Nombre={name}")
-                        self.logger.info(f"Contenido: {content_block}")
-                        
-                        url_match = re.search(r'repositoryURL\s+=\s+"([^"]+)"', content_block)
-                        url = url_match.group(1) if url_match else "No URL encontrada"
-                        self.logger.info(f"URL: {url}")
-                        
-                        req_match = re.search(r'requirement\s+=\s+{(.*?)}', content_block, re.DOTALL)
-                        req = req_match.group(1) if req_match else "No requirement encontrado"
-                        self.logger.info(f"Requirement: {req}")
-                    else:  # Segundo patrón con URL directa
-                        url = match.group(1)
-                        req = match.group(2)
-                        name = url.split('/')[-1].replace('.git', '')
-                        self.logger.info(f"\nPaquete #{i+1} (Patrón 2): URL={url}")
-                        self.logger.info(f"Requirement: {req}")
-                    
-                    # Guardar información de debug
-                    debug_info.append({
-                        "pattern": f"Package Pattern #{pattern_idx+1}",
-                        "name": name,
-                        "url": url,
-                        "requirement": req
-                    })
-                    
-                    # Añadir a las dependencias si no está duplicada
-                    if not any(d['url'] == url for d in dependencies):
-                        dependencies.append({
-                            'name': name,
-                            'url': url,
-                            'version': "Extracción en diagnóstico",
-                            'type': 'spm_app_direct',
-                            'source': f'project.pbxproj_pattern_{pattern_idx+1}',
-                            'debug_info': debug_info[-1]
-                        })
+            products_by_package, targets_by_package = self._resolve_package_usage(project)
             
-            # 3. Buscar URLs directamente
-            self.logger.info("\n3. Buscando URLs de repositorios directamente")
-            url_pattern = r'repositoryURL\s+=\s+"(https://[^"]+)"'
-            url_matches = re.finditer(url_pattern, content)
-            
-            for i, match in enumerate(url_matches):
-                url = match.group(1)
-                name = url.split('/')[-1].replace('.git', '')
-                self.logger.info(f"\nURL #{i+1}: {url}")
+            for i, (reference_id, reference) in enumerate(project.objects_of('XCRemoteSwiftPackageReference')):
+                url = reference.get('repositoryURL')
+                requirement = reference.get('requirement', {})
                 
-                # Intentar encontrar el requirement asociado
-                context_start = max(0, match.start() - 500)
-                context_end = min(len(content), match.end() + 500)
-                context = content[context_start:context_end]
+                self.logger.info(f"\nReferencia #{i+1}: ID={reference_id}")
+                self.logger.info(f"Contenido: {reference}")
+                self.logger.info(f"URL: {url or 'No URL encontrada'}")
+                self.logger.info(f"Requirement: {requirement or 'No requirement encontrado'}")
                 
-                req_match = re.search(r'requirement\s+=\s+{(.*?)}', context, re.DOTALL)
-                req = req_match.group(1) if req_match else "No requirement encontrado en contexto"
-                self.logger.info(f"Requirement (en contexto): {req}")
+                # 2. Productos y targets que usan el paquete
+                products = products_by_package.get(reference_id, [])
+                targets = targets_by_package.get(reference_id, [])
+                self.logger.info(f"Productos: {', '.join(products) or 'ninguno'}")
+                self.logger.info(f"Targets: {', '.join(targets) or 'ninguno'}")
                 
-                # Guardar información de debug
+                # Guardar la información de debug
                 debug_info.append({
-                    "pattern": "Direct URL",
+                    "block_id": reference_id,
                     "url": url,
-                    "context_size": len(context),
-                    "requirement_context": req
+                    "requirement": requirement,
+                    "products": products,
+                    "targets": targets,
+                    "full_content": reference
                 })
                 
-                # Añadir a las dependencias si no está duplicada
-                if not any(d['url'] == url for d in dependencies):
+                if url and not any(d['url'] == url for d in dependencies):
                     dependencies.append({
-                        'name': name,
+                        'name': url.split('/')[-1].replace('.git', ''),
                         'url': url,
-                        'version': "Extracción en diagnóstico",
+                        'version': self._parse_requirement_block(requirement),
                         'type': 'spm_app_direct',
-                        'source': 'project.pbxproj_url_direct',
+                        'source': 'project.pbxproj_debug',
                         'debug_info': debug_info[-1]
                     })
             
+            # 3. Paquetes locales
+            for reference_id, reference in project.objects_of('XCLocalSwiftPackageReference'):
+                self.logger.info(f"\nPaquete local: ID={reference_id}, ruta={reference.get('relativePath')}")
+                debug_info.append({"block_id": reference_id, "relative_path": reference.get('relativePath')})
+            
             # Guardar toda la información de diagnóstico en un archivo
             debug_file = os.path.join('results', 'pbxproj_debug_info.json')
             os.makedirs(os.path.dirname(debug_file), exist_ok=True)
@@ -240,7 +129,7 @@ class AppSPMDependencyAnalyzer:
             
             if os.path.exists(main_pbxproj):
                 # Usar la función mejorada para analizar el archivo
-                dependencies = self._parse_pbxproj_for_spm(main_pbxproj)
+                dependencies = self.parse_cache.get_or_parse(main_pbxproj, 'pbxproj_spm', self._parse_pbxproj_for_spm)
                 all_dependencies.extend(dependencies)
         
         # También buscar Package.resolved en el proyecto principal
@@ -258,13 +147,13 @@ class AppSPMDependencyAnalyzer:
         
         # En el proyecto principal
         if main_xcodeproj:
-            main_package_resolved = os.path.join(main_xcodeproj, "project.xcworkspace", "xcshareddata", "swiftpm", "Package.resolved")
+            main_package_resolved = ProjectIndex.xcodeproj_package_resolved(main_xcodeproj)
             if os.path.exists(main_package_resolved):
                 package_resolved_paths.append(main_package_resolved)
         
         # Procesar los Package.resolved encontrados
         for path in package_resolved_paths:
-            dependencies = self._parse_package_resolved(path)
+            dependencies = self.parse_cache.get_or_parse(path, 'package_resolved', self._parse_package_resolved)
             
             # Añadir solo las que no están duplicadas (por URL)
             for dep in dependencies:
@@ -284,51 +173,15 @@ class AppSPMDependencyAnalyzer:
         - Dentro de .xcodeproj
         - Dentro de .swiftpm
         """
-        package_resolved_paths = []
-        
-        # Buscar en la raíz del proyecto
-        root_package_resolved = os.path.join(self.project_root, "Package.resolved")
-        if os.path.exists(root_package_resolved):
-            package_resolved_paths.append(root_package_resolved)
-        
-        # Buscar dentro de .swiftpm
-        swiftpm_package_resolved = os.path.join(self.project_root, ".swiftpm", "Package.resolved")
-        if os.path.exists(swiftpm_package_resolved):
-            package_resolved_paths.append(swiftpm_package_resolved)
-        
-        # Buscar dentro de .xcodeproj
-        for root, dirs, files in os.walk(self.project_root):
-            for dir_name in dirs:
-                if dir_name.endswith('.xcodeproj'):
-                    xcodeproj_package_resolved = os.path.join(root, dir_name, "project.xcworkspace", "xcshareddata", "swiftpm", "Package.resolved")
-                    if os.path.exists(xcodeproj_package_resolved):
-                        package_resolved_paths.append(xcodeproj_package_resolved)
-        
-        return package_resolved_paths
+        return self.project_index.find_package_resolved_files()
     
     def _find_xcodeproj_files(self) -> List[str]:
         """Busca archivos .xcodeproj en el proyecto"""
-        xcodeproj_paths = []
-        
-        for root, dirs, files in os.walk(self.project_root):
-            for dir_name in dirs:
-                if dir_name.endswith('.xcodeproj'):
-                    xcodeproj_paths.append(os.path.join(root, dir_name))
-        
-        return xcodeproj_paths
+        return self.project_index.find_xcodeprojs()
     
     def _find_pbxproj_files(self) -> List[str]:
         """Busca archivos project.pbxproj dentro de .xcodeproj"""
-        pbxproj_paths = []
-        
-        for root, dirs, files in os.walk(self.project_root):
-            for dir_name in dirs:
-                if dir_name.endswith('.xcodeproj'):
-                    pbxproj_path = os.path.join(root, dir_name, "project.pbxproj")
-                    if os.path.exists(pbxproj_path):
-                        pbxproj_paths.append(pbxproj_path)
-        
-        return pbxproj_paths
+        return self.project_index.find_pbxproj_files()
     
     def _parse_package_resolved(self, file_path: str) -> List[Dict]:
         """
@@ -437,54 +290,27 @@ class AppSPMDependencyAnalyzer:
     def _parse_pbxproj_for_spm(self, file_path: str) -> List[Dict]:
         """
         Parsea un archivo project.pbxproj para buscar referencias a dependencias SPM.
-        Versión limpia sin logs excesivos.
+        Los productos y targets de cada paquete se resuelven por ID en la tabla de objetos.
         """
         dependencies = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            project = PBXProject.from_file(file_path, SPM_ISA)
             
             self.logger.info(f"Analizando archivo project.pbxproj")
             
-            # Buscar todos los bloques con repositoryURL y requirement juntos
-            repo_req_blocks = re.finditer(r'repositoryURL\s*=\s*"([^"]+)";\s*requirement\s*=\s*\{([^{]+?)(?=\n\t\t[A-Z0-9]|\Z)', content, re.DOTALL)
+            products_by_package, targets_by_package = self._resolve_package_usage(project)
             
-            for match in repo_req_blocks:
-                url = match.group(1)
-                req_block = match.group(2)
+            for reference_id, reference in project.objects_of('XCRemoteSwiftPackageReference'):
+                url = reference.get('repositoryURL')
+                if not url:
+                    continue
                 
                 # Determinar el nombre basado en la URL
                 name = url.split('/')[-1].replace('.git', '')
                 
                 # Extraer la versión basada en el tipo de requisito
-                version = "N/A"
-                
-                if 'kind = exactVersion' in req_block:
-                    version_match = re.search(r'version\s*=\s*([^;]+);', req_block)
-                    if version_match:
-                        version = version_match.group(1).strip().replace('"', '')
-                
-                elif 'kind = upToNextMajorVersion' in req_block or 'kind = upToNextMinorVersion' in req_block:
-                    min_version_match = re.search(r'minimumVersion\s*=\s*([^;]+);', req_block)
-                    if min_version_match:
-                        version = min_version_match.group(1).strip().replace('"', '')
-                
-                elif 'kind = branch' in req_block:
-                    branch_match = re.search(r'branch\s*=\s*([^;]+);', req_block)
-                    if branch_match:
-                        version = branch_match.group(1).strip().replace('"', '')
-                
-                elif 'kind = revision' in req_block:
-                    revision_match = re.search(r'revision\s*=\s*([^;]+);', req_block)
-                    if revision_match:
-                        version = revision_match.group(1).strip().replace('"', '')
-                
-                # Si no se encontró con los patrones específicos, intentar con un patrón genérico
-                if version == "N/A":
-                    any_version_match = re.search(r'(version|minimumVersion|branch|revision)\s*=\s*([^;]+);', req_block)
-                    if any_version_match:
-                        version = any_version_match.group(2).strip().replace('"', '')
+                version = self._requirement_version(reference.get('requirement'))
                 
                 # Añadir a la lista de dependencias, evitando duplicados
                 if not any(d['url'] == url for d in dependencies):
@@ -493,7 +319,9 @@ class AppSPMDependencyAnalyzer:
                         'url': url,
                         'version': version,
                         'type': 'spm_app_direct',
-                        'source': 'project.pbxproj'
+                        'source': 'project.pbxproj',
+                        'products': products_by_package.get(reference_id, []),
+                        'targets': targets_by_package.get(reference_id, [])
                     }
                     
                     dependencies.append(dependency)
@@ -505,9 +333,53 @@ class AppSPMDependencyAnalyzer:
         
         return dependencies
     
-    def _parse_requirement_block(self, req_block: str) -> str:
+    def _requirement_version(self, requirement: Optional[Dict]) -> str:
+        """Versión declarada en el requirement de un XCRemoteSwiftPackageReference"""
+        if not isinstance(requirement, dict):
+            return "N/A"
+        
+        field = {
+            'exactVersion': 'version',
+            'upToNextMajorVersion': 'minimumVersion',
+            'upToNextMinorVersion': 'minimumVersion',
+            'branch': 'branch',
+            'revision': 'revision'
+        }.get(requirement.get('kind'))
+        version = requirement.get(field) if field else None
+        
+        # Si el tipo no es uno de los conocidos, usar el primer campo de versión disponible
+        if not isinstance(version, str):
+            version = next((requirement[key] for key in ('version', 'minimumVersion', 'branch', 'revision')
+                            if isinstance(requirement.get(key), str)), "N/A")
+        return version
+    
+    def _resolve_package_usage(self, project: PBXProject) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        """
+        Relaciona cada referencia de paquete con sus productos y con los targets que los usan.
+        Returns:
+            tuple: (ID de paquete -> productos, ID de paquete -> targets)
+        """
+        products_by_package = {}
+        for _, product in project.objects_of('XCSwiftPackageProductDependency'):
+            package_id = product.get('package')
+            if package_id and product.get('productName'):
+                products_by_package.setdefault(package_id, []).append(product['productName'])
+        
+        targets_by_package = {}
+        for _, target in project.objects_of('PBXNativeTarget'):
+            for product_id in target.get('packageProductDependencies', []):
+                package_id = (project.get(product_id) or {}).get('package')
+                if package_id and target.get('name'):
+                    targets = targets_by_package.setdefault(package_id, [])
+                    if target['name'] not in targets:
+                        targets.append(target['name'])
+        
+        return products_by_package, targets_by_package
+    
+    def _parse_requirement_block(self, req_block: Optional[Dict]) -> str:
         """
-        Analiza un bloque de requirement para extraer la información de versión.
+        Analiza el diccionario requirement de un XCRemoteSwiftPackageReference para
+        extraer la información de versión.
         Esta versión es más robusta y reporta más detalles sobre el process.
         """
         if not req_block:
@@ -516,62 +388,57 @@ class AppSPMDependencyAnalyzer:
         self.logger.debug(f"Analizando bloque requirement: {req_block}")
         
         # Determinar el tipo de requirement
-        kind_match = re.search(r'kind\s*=\s*([^;]+);', req_block)
-        if not kind_match:
+        kind = req_block.get('kind')
+        if not kind:
             self.logger.debug("No se encontró 'kind' en el bloque")
             return "N/A"
         
-        kind = kind_match.group(1).strip()
         self.logger.debug(f"Tipo de requirement: {kind}")
         
         # Extraer versión según el tipo
         if 'exactVersion' in kind:
-            version_match = re.search(r'version\s*=\s*"([^"]+)"', req_block)
-            if version_match:
-                version = version_match.group(1)
+            version = req_block.get('version')
+            if version:
                 self.logger.debug(f"Versión exacta encontrada: {version}")
                 return version
         
         elif 'versionRange' in kind:
-            min_match = re.search(r'minimumVersion\s*=\s*"([^"]+)"', req_block)
-            max_match = re.search(r'maximumVersion\s*=\s*"([^"]+)"', req_block)
+            min_ver = req_block.get('minimumVersion')
+            max_ver = req_block.get('maximumVersion')
             
-            if min_match and max_match:
-                min_ver = min_match.group(1)
-                max_ver = max_match.group(1)
+            if min_ver and max_ver:
                 version = f"{min_ver} ... {max_ver}"
                 self.logger.debug(f"Rango de versiones encontrado: {version}")
                 return version
-            elif min_match:
-                version = f">= {min_match.group(1)}"
+            elif min_ver:
+                version = f">= {min_ver}"
                 self.logger.debug(f"Versión mínima encontrada: {version}")
                 return version
         
         elif 'upToNextMajorVersion' in kind:
-            min_match = re.search(r'minimumVersion\s*=\s*"([^"]+)"', req_block)
-            if min_match:
-                version = f"~> {min_match.group(1)}"
+            min_ver = req_block.get('minimumVersion')
+            if min_ver:
+                version = f"~> {min_ver}"
                 self.logger.debug(f"Versión up-to-next-major encontrada: {version}")
                 return version
         
         elif 'upToNextMinorVersion' in kind:
-            min_match = re.search(r'minimumVersion\s*=\s*"([^"]+)"', req_block)
-            if min_match:
-                version = f"~> {min_match.group(1)}"
+            min_ver = req_block.get('minimumVersion')
+            if min_ver:
+                version = f"~> {min_ver}"
                 self.logger.debug(f"Versión up-to-next-minor encontrada: {version}")
                 return version
         
         elif 'branch' in kind:
-            branch_match = re.search(r'branch\s*=\s*"([^"]+)"', req_block)
-            if branch_match:
-                version = f"branch: {branch_match.group(1)}"
+            branch = req_block.get('branch')
+            if branch:
+                version = f"branch: {branch}"
                 self.logger.debug(f"Branch encontrado: {version}")
                 return version
         
         elif 'revision' in kind:
-            revision_match = re.search(r'revision\s*=\s*"([^"]+)"', req_block)
-            if revision_match:
-                revision = revision_match.group(1)
+            revision = req_block.get('revision')
+            if revision:
                 # Acortar el hash si es demasiado largo
                 if len(revision) > 8:
                     revision = revision[:8]
@@ -586,6 +453,7 @@ class AppSPMDependencyAnalyzer:
         self.logger.debug(f"Bloque completo: {req_block}")
         
         return "N/A"
+    
     def _parse_package_swift(self, file_path: str) -> List[Dict]:
         """
         Parsea un archivo Package.swift para extraer dependencias SPM.
@@ -649,13 +517,8 @@ class AppSPMDependencyAnalyzer:
         3. Si hay varios, buscar el que contenga AppDelegate.swift
         4. Si todo falla, retornar el primer .xcodeproj encontrado
         """
-        xcodeproj_paths = []
-        
         # Buscar todos los .xcodeproj
-        for root, dirs, _ in os.walk(self.project_root):
-            for dir_name in dirs:
-                if dir_name.endswith('.xcodeproj'):
-                    xcodeproj_paths.append(os.path.join(root, dir_name))
+        xcodeproj_paths = self._find_xcodeproj_files()
         
         if not xcodeproj_paths:
             self.logger.warning("⚠️ No se encontraron archivos .xcodeproj")
@@ -677,30 +540,22 @@ class AppSPMDependencyAnalyzer:
         # Estrategia 2: Buscar el que contenga AppDelegate.swift
         for xcodeproj_path in xcodeproj_paths:
             parent_dir = os.path.dirname(xcodeproj_path)
-            for root, _, files in os.walk(parent_dir):
-                if 'AppDelegate.swift' in files:
-                    self.logger.info(f"✅ Proyecto principal detectado por AppDelegate: {xcodeproj_path}")
-                    return xcodeproj_path
+            if self.project_index.contains_swift_file(parent_dir, 'AppDelegate.swift'):
+                self.logger.info(f"✅ Proyecto principal detectado por AppDelegate: {xcodeproj_path}")
+                return xcodeproj_path
         
         # Si todo falla, usar el primer .xcodeproj
         self.logger.info(f"⚠️ No se pudo determinar el proyecto principal, usando el primero: {xcodeproj_paths[0]}")
         return xcodeproj_paths[0]
     
-    def _extract_version_info(self, content: str, url: str) -> str:
+    def _extract_version_info(self, project: PBXProject, url: str) -> str:
         """
-        Busca información de versión para una URL específica en todo el contenido.
+        Busca información de versión para una URL específica en la tabla de objetos.
         Versión mejorada que busca el requirement asociado a una URL.
         """
-        # Escapar caracteres especiales en la URL para la búsqueda regex
-        escaped_url = re.escape(url)
+        reference = project.get(project.find('XCRemoteSwiftPackageReference', 'repositoryURL', url))
+        if reference is not None:
+            return self._parse_requirement_block(reference.get('requirement'))
         
-        # Buscar el bloque que contiene esta URL y su requirement
-        pattern = rf'repositoryURL\s*=\s*"{escaped_url}";\s*requirement\s*=\s*\{{(.*?)\}}'
-        req_match = re.search(pattern, content, re.DOTALL)
-        
-        if not req_match:
-            self.logger.debug(f"No se encontró bloque requirement para URL: {url}")
-            return "N/A"
-        
-        req_block = req_match.group(1)
-        return self._parse_requirement_block(req_block)
\ No newline at end of file
+        self.logger.debug(f"No se encontró bloque requirement para URL: {url}")
+        return "N/A"
@@ -0,0 +1,164 @@
+import os
+import logging
+from typing import Dict, List, Set
+from utils.parse_cache import ParseCache
+from utils.project_index import ProjectIndex
+from .dependency_audit import DependencyAudit
+from .dependency_graph import DependencyGraph
+
+logger = logging.getLogger(__name__)
+
+
+def count_lines(path: str) -> int:
+    """
+    Líneas de un archivo, contadas por bloques de bytes. Es una función de nivel de
+    módulo para poder enviarla a los procesos del pool de parseo.
+    """
+    lines = 0
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            lines += chunk.count(b'\n')
+    return lines
+
+
+class BuildCostAnalysis:
+    """
+    Estimación del coste de compilación sobre el grafo de módulos locales.
+    Cada módulo pesa lo que sus fuentes Swift (líneas o bytes). Con esos pesos se
+    calcula la ruta crítica (la cadena de dependencias más cara, que ninguna
+    cantidad de núcleos puede acortar), el paralelismo teórico máximo (trabajo
+    total / ruta crítica) y qué módulos acortarían más la ruta si se dividieran.
+
+    Dividir un módulo se modela como partirlo en dos mitades que se compilan en
+    paralelo con las mismas dependencias: su peso en la ruta pasa a ser la mitad.
+    """
+
+    METRICS = ('lines', 'bytes')
+    PARSER_KEY = 'swift_line_count'
+
+    def __init__(self, project_root: str, spm_modules: List[Dict], graph: DependencyGraph,
+                 project_index: ProjectIndex, parse_cache: ParseCache, jobs: int = 1, metric: str = 'lines'):
+        if metric not in self.METRICS:
+            raise ValueError(f"Métrica desconocida: {metric} (opciones: {', '.join(self.METRICS)})")
+        self.project_root = os.path.abspath(project_root)
+        self.modules = [module for package_group in spm_modules for module in package_group['modules']]
+        self.graph = graph
+        self.project_index = project_index
+        self.parse_cache = parse_cache
+        self.jobs = jobs
+        self.metric = metric
+
+    def test_directories(self) -> Set[str]:
+        """Directorios de tests de los paquetes (Tests/ y el de cada testTarget), que no forman parte de la app"""
+        directories = set()
+        for module in self.modules:
+            package_root = os.path.normpath(os.path.join(self.project_root, module['path']))
+            directories.update(os.path.join(package_root, name) for name in DependencyAudit.TEST_DIRECTORIES)
+            manifest = module['manifest']
+            for target, target_type in manifest.target_types.items():
+                if target_type == 'testTarget':
+                    directory = DependencyAudit.target_directory(package_root, manifest, target)
+                    if directory:
+                        directories.add(directory)
+        return directories
+
+    def module_weights(self) -> Dict[str, int]:
+        """Peso de cada módulo: líneas o bytes de los .swift de su paquete (sin el Package.swift ni los tests)"""
+        roots = {os.path.normpath(os.path.join(self.project_root, module['path'])): module['name']
+                 for module in self.modules}
+        owners = self.project_index.assign_swift_files(list(roots))
+        test_directories = self.test_directories()
+
+        def is_test_directory(directory):
+            while directory not in test_directories:
+                parent = os.path.dirname(directory)
+                if parent == directory or directory in roots:
+                    return False
+                directory = parent
+            return True
+
+        files_by_module = {}
+        for root, swift_directories in owners.items():
+            paths = files_by_module.setdefault(roots[root], [])
+            for directory, swift_files in swift_directories.items():
+                if is_test_directory(os.path.normpath(directory)):
+                    continue
+                paths.extend(os.path.join(directory, name) for name in swift_files if name != 'Package.swift')
+
+        paths = [path for module_paths in files_by_module.values() for path in module_paths]
+        if self.metric == 'lines':
+            # Como los import, el recuento se guarda en la caché de parseo por tamaño y mtime
+            results, errors = self.parse_cache.get_or_parse_many(paths, self.PARSER_KEY, count_lines,
+                                                                 jobs=self.jobs, verify_content=False)
+            for path, error in errors.items():
+                logger.warning(f"⚠️ No se pudieron contar las líneas de {path}: {error}")
+            sizes = dict(zip(paths, (result or 0 for result in results)))
+        else:
+            sizes = {}
+            for path in paths:
+                try:
+                    sizes[path] = os.path.getsize(path)
+                except OSError as e:
+                    logger.warning(f"⚠️ No se pudo leer {path}: {str(e)}")
+                    sizes[path] = 0
+
+        weights = {name: 0 for name in self.graph.names}
+        for name, module_paths in files_by_module.items():
+            weights[name] = weights.get(name, 0) + sum(sizes[path] for path in module_paths)
+        return weights
+
+    def split_candidates(self, weights: Dict[str, int], critical: Dict, limit: int = 5) -> List[Dict]:
+        """
+        Módulos de la ruta crítica ordenados por cuánto la acortaría dividirlos en
+        dos. La nueva ruta crítica puede pasar por otra cadena, así que se recalcula
+        el camino más largo del grafo completo para cada candidato.
+        Dividir un módulo ahorra como mucho la mitad de su peso: recorriéndolos de
+        más a menos pesado, en cuanto esa mitad no alcanza la reducción del último
+        de los 'limit' mejores ya no hace falta recalcular los demás.
+        """
+        if limit <= 0:
+            return []
+        names = sorted((name for step in critical['path'] for name in step['modules'] if weights.get(name)),
+                       key=lambda name: (-weights[name], name))
+        candidates = []
+        for name in names:
+            if len(candidates) >= limit and weights[name] / 2 < candidates[limit - 1]['reduction']:
+                break
+            split_weights = dict(weights)
+            split_weights[name] = weights[name] / 2
+            length = self.graph.longest_path_length(split_weights)
+            candidates.append({
+                'module': name,
+                'weight': weights[name],
+                'critical_path_after_split': length,
+                'reduction': critical['length'] - length,
+                'reduction_percent': round(100 * (critical['length'] - length) / critical['length'], 1)
+            })
+            candidates.sort(key=lambda candidate: (-candidate['reduction'], -candidate['weight'], candidate['module']))
+        return candidates[:limit]
+
+    def run(self, splits: int = 5) -> Dict:
+        """
+        Returns:
+            dict: Pesos, ruta crítica, paralelismo y candidatos a dividir (serializable a JSON)
+        """
+        weights = self.module_weights()
+        critical = self.graph.critical_path(weights)
+        length = critical['length']
+        result = {
+            'metric': self.metric,
+            'modules': len(self.graph),
+            'total_weight': critical['total'],
+            'critical_path': {
+                'length': length,
+                'percent_of_total': round(100 * length / critical['total'], 1) if critical['total'] else 0,
+                'modules': critical['path']
+            },
+            'parallelism': round(critical['total'] / length, 2) if length else 0,
+            'max_concurrency': critical['max_concurrency'],
+            'split_candidates': self.split_candidates(weights, critical, splits) if length else [],
+            'weights': dict(sorted(weights.items(), key=lambda item: (-item[1], item[0])))
+        }
+        logger.info(f"⏱️ Ruta crítica: {len(critical['path'])} módulos, {length} {self.metric} de {critical['total']} "
+                    f"(paralelismo máximo {result['parallelism']})")
+        return result
@@ -0,0 +1,233 @@
+import os
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from utils.import_scanner import ImportScanner
+from utils.project_index import ProjectIndex
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyAudit:
+    """
+    Cruza los import de las fuentes de cada target con las dependencias que declara
+    en su Package.swift:
+    - Dependencias sin usar: ningún archivo del target importa un módulo que provea.
+    - Dependencias no declaradas: el target importa un módulo conocido del proyecto
+      (un target o producto local, un producto que algún target declara o un paquete
+      remoto de algún manifiesto) que no provee ninguna de sus dependencias.
+    Los módulos que no son del proyecto (UIKit, Foundation...) se ignoran, así que
+    no hace falta mantener una lista de módulos del sistema.
+    """
+
+    # Tipos de target con fuentes Swift propias
+    AUDITED_KINDS = ('target', 'executableTarget', 'testTarget', 'macro')
+
+    # Directorios en los que SwiftPM busca las fuentes de un target sin path:
+    SOURCE_DIRECTORIES = ('Sources', 'Source', 'src', 'srcs')
+    TEST_DIRECTORIES = ('Tests',)
+
+    # Prefijo y sufijos habituales en el nombre de un repositorio que no forman parte del módulo
+    REMOTE_NAME_PREFIX = 'swift-'
+    REMOTE_NAME_SUFFIXES = ('.swift', '-ios', '-swift')
+
+    def __init__(self, project_root: str, spm_modules: List[Dict], project_index: ProjectIndex,
+                 import_scanner: ImportScanner, ignore: Iterable[str] = ()):
+        """
+        Args:
+            project_root (str): Raíz del proyecto
+            spm_modules (list): Módulos encontrados por find_spm_modules, con su manifiesto
+            project_index (ProjectIndex): Índice de archivos del proyecto
+            import_scanner (ImportScanner): Escáner de import (con la caché de parseo compartida)
+            ignore (list): Módulos o dependencias que no se revisan (p.ej. plugins o re-exportados)
+        """
+        self.project_root = os.path.abspath(project_root)
+        self.modules = [module for package_group in spm_modules for module in package_group['modules']]
+        self.project_index = project_index
+        self.import_scanner = import_scanner
+        self.ignore = set(ignore)
+
+        # Productos locales: nombre -> [(paquete, tipo, targets)]
+        self.local_products = {}
+        # Paquetes remotos de los manifiestos: nombre normalizado -> nombre del repositorio
+        self.remote_packages = {}
+        for module in self.modules:
+            manifest = module['manifest']
+            for product in manifest.products:
+                self.local_products.setdefault(product['name'], []).append(
+                    (manifest.name, product['type'], product['targets'])
+                )
+            for dependency in manifest.remote_dependencies:
+                self.remote_packages.setdefault(self._remote_key(dependency['name']), dependency['name'])
+
+    @classmethod
+    def _remote_key(cls, name: str) -> str:
+        """
+        Nombre normalizado para comparar un import con el nombre de un repositorio:
+        lottie-ios -> lottie, swift-collections -> collections, Kingfisher -> kingfisher.
+        Los productos de un paquete remoto no se conocen sin descargar su manifiesto,
+        así que solo se reconocen los módulos que se llaman como el repositorio.
+        """
+        key = name.lower()
+        for suffix in cls.REMOTE_NAME_SUFFIXES:
+            if key.endswith(suffix) and len(key) > len(suffix):
+                key = key[:-len(suffix)]
+        # Identificadores del registro: scope.Nombre
+        key = key.rsplit('.', 1)[-1]
+        if key.startswith(cls.REMOTE_NAME_PREFIX) and len(key) > len(cls.REMOTE_NAME_PREFIX):
+            key = key[len(cls.REMOTE_NAME_PREFIX):]
+        return key.replace('-', '').replace('_', '')
+
+    @staticmethod
+    def _split_dependency(dependency: str) -> Tuple[str, Optional[str]]:
+        """'Producto (paquete)' -> ('Producto', 'paquete'); 'Nombre' -> ('Nombre', None)"""
+        if dependency.endswith(')') and ' (' in dependency:
+            name, package = dependency[:-1].split(' (', 1)
+            return name, package
+        return dependency, None
+
+    def _dependency_modules(self, dependency: str) -> Tuple[Set[str], bool]:
+        """
+        Módulos que un target puede importar gracias a una dependencia declarada.
+        Returns:
+            tuple: (módulos, es un plugin). Los plugins no se importan, así que nunca se marcan como sin usar.
+        """
+        name, package = self._split_dependency(dependency)
+        candidates = self.local_products.get(name, [])
+        if package:
+            candidates = [candidate for candidate in candidates if candidate[0] == package] or candidates
+        modules = {name}
+        plugin = False
+        for _, product_type, targets in candidates:
+            modules.update(targets)
+            plugin = plugin or product_type == 'plugin'
+        return modules, plugin
+
+    @classmethod
+    def target_directory(cls, package_root: str, manifest, target: str) -> Optional[str]:
+        """Directorio de fuentes de un target: su path: o el directorio por defecto de SwiftPM"""
+        if target in manifest.target_paths:
+            return os.path.normpath(os.path.join(package_root, manifest.target_paths[target]))
+        directories = cls.TEST_DIRECTORIES if manifest.target_types.get(target) == 'testTarget' else cls.SOURCE_DIRECTORIES
+        for directory in directories:
+            path = os.path.join(package_root, directory, target)
+            if os.path.isdir(path):
+                return path
+        return None
+
+    def _collect_targets(self) -> List[Dict]:
+        """Targets a revisar, con su directorio de fuentes"""
+        targets = []
+        for module in self.modules:
+            manifest = module['manifest']
+            package_root = os.path.join(self.project_root, module['path'])
+            for target, dependencies in manifest.targets.items():
+                if manifest.target_types.get(target, 'target') not in self.AUDITED_KINDS:
+                    continue
+                targets.append({
+                    'package': manifest.name,
+                    'path': module['path'],
+                    'target': target,
+                    'type': manifest.target_types.get(target, 'target'),
+                    'dependencies': dependencies,
+                    'directory': self.target_directory(package_root, manifest, target),
+                    'files': [],
+                    'relative_files': []
+                })
+        return targets
+
+    def _assign_files(self, targets: List[Dict]):
+        """Reparte los archivos .swift del índice entre los directorios de fuentes de los targets"""
+        by_directory = {target['directory']: target for target in targets if target['directory']}
+        owners = self.project_index.assign_swift_files(list(by_directory))
+        for directory, swift_directories in owners.items():
+            target = by_directory[directory]
+            for path, swift_files in swift_directories.items():
+                target['files'].extend(os.path.join(path, name) for name in swift_files)
+                relative_directory = os.path.relpath(path, self.project_root)
+                target['relative_files'].extend(os.path.join(relative_directory, name) for name in swift_files)
+
+    def _is_remote_module(self, module: str, declared_packages: Set[str]) -> bool:
+        """Indica si el módulo es un paquete remoto del proyecto del que el target no declara ningún producto"""
+        key = self._remote_key(module)
+        return key in self.remote_packages and key not in declared_packages
+
+    def run(self) -> Dict:
+        """
+        Ejecuta la auditoría.
+        Returns:
+            dict: Resumen y, por cada target con problemas, sus dependencias sin usar
+            y los módulos importados sin declarar (con los archivos que los importan)
+        """
+        targets = self._collect_targets()
+        self._assign_files(targets)
+
+        # Un único lote para que el escáner reparta todos los archivos entre sus procesos
+        paths = [path for target in targets for path in target['files']]
+        imports = self.import_scanner.scan(paths, base_path=self.project_root)
+
+        # Módulos conocidos del proyecto: fuera de ellos, un import no puede ser una dependencia no declarada
+        dependency_modules = {}
+        known_modules = set(self.local_products)
+        for module in self.modules:
+            known_modules.update(module['manifest'].targets)
+        for target in targets:
+            for dependency in target['dependencies']:
+                if dependency not in dependency_modules:
+                    dependency_modules[dependency] = self._dependency_modules(dependency)
+                known_modules.update(dependency_modules[dependency][0])
+
+        issues = []
+        skipped = []
+        for target in targets:
+            if not target['files']:
+                skipped.append(f"{target['package']}/{target['target']}")
+                continue
+
+            # Módulo importado -> archivos del target que lo importan
+            imported = {}
+            for relative_path in target['relative_files']:
+                for module in imports.get(relative_path, ()):
+                    imported.setdefault(module, []).append(relative_path)
+
+            provided = {target['target']}
+            # Paquetes de los que el target declara algún producto: sus módulos no se marcan como no declarados
+            declared_packages = set()
+            unused = []
+            for dependency in target['dependencies']:
+                modules, plugin = dependency_modules[dependency]
+                provided.update(modules)
+                declared_packages.add(self._remote_key(self._split_dependency(dependency)[1] or dependency))
+                if plugin or dependency in self.ignore or modules & self.ignore:
+                    continue
+                if not any(module in imported for module in modules):
+                    unused.append(dependency)
+
+            missing = {
+                module: sorted(files) for module, files in sorted(imported.items())
+                if module not in provided and module not in self.ignore
+                and (module in known_modules or self._is_remote_module(module, declared_packages))
+            }
+
+            if unused or missing:
+                issues.append({
+                    'package': target['package'],
+                    'path': target['path'],
+                    'target': target['target'],
+                    'type': target['type'],
+                    'files': len(target['files']),
+                    'unused': unused,
+                    'missing': missing
+                })
+
+        result = {
+            'packages': len(self.modules),
+            'targets': len(targets) - len(skipped),
+            'files': len(paths),
+            'unused': sum(len(issue['unused']) for issue in issues),
+            'missing': sum(len(issue['missing']) for issue in issues),
+            'skipped': skipped,
+            'issues': issues
+        }
+        logger.info(f"🔍 Auditoría: {result['targets']} targets, {result['unused']} dependencias sin usar, "
+                    f"{result['missing']} sin declarar")
+        return result
@@ -0,0 +1,357 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownModuleError(KeyError):
+    """El módulo consultado no existe en el grafo"""
+
+
+class DependencyGraph:
+    """
+    Grafo de dependencias entre módulos locales (módulo -> módulo del que depende).
+    Los nodos tienen IDs enteros consecutivos y las aristas se guardan como listas
+    de adyacencia en ambos sentidos.
+
+    Las consultas se resuelven sobre el grafo de componentes fuertemente conexas
+    (Tarjan): los ciclos son las componentes con más de un módulo (o con un
+    módulo que depende de sí mismo), los niveles topológicos se calculan por
+    componente y el cierre transitivo se guarda como un bitset (entero de Python)
+    por componente, de modo que "qué módulos se ven afectados si cambia X" es una
+    OR de unos pocos enteros.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names = []         # ID -> nombre
+        self.ids = {}           # nombre -> ID
+        self.successors = []    # ID -> IDs de sus dependencias
+        self.predecessors = []  # ID -> IDs de los módulos que dependen de él
+        self._edges = set()
+        for name in names:
+            self.add_node(name)
+        self._invalidate()
+
+    @classmethod
+    def from_modules(cls, spm_modules: List[Dict]) -> 'DependencyGraph':
+        """
+        Construye el grafo a partir de los módulos SPM encontrados en el proyecto
+        ([{'directory', 'modules': [{'name', 'dependencies'}]}]). Solo se enlazan
+        las dependencias locales que corresponden a un módulo del proyecto.
+        """
+        modules = [module for package_group in spm_modules for module in package_group['modules']]
+        graph = cls(module['name'] for module in modules)
+        for module in modules:
+            for dep in module['dependencies']:
+                if dep.get('isLocal', False) and dep['name'] in graph.ids:
+                    graph.add_edge(module['name'], dep['name'])
+        logger.debug(f"Grafo de dependencias: {len(graph)} módulos, {graph.edge_count} aristas")
+        return graph
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edges)
+
+    def add_node(self, name: str) -> int:
+        node = self.ids.get(name)
+        if node is None:
+            node = len(self.names)
+            self.ids[name] = node
+            self.names.append(name)
+            self.successors.append([])
+            self.predecessors.append([])
+            self._invalidate()
+        return node
+
+    def add_edge(self, source: str, target: str):
+        """Añade la dependencia source -> target (las repetidas se ignoran)"""
+        u = self.add_node(source)
+        v = self.add_node(target)
+        if (u, v) not in self._edges:
+            self._edges.add((u, v))
+            self.successors[u].append(v)
+            self.predecessors[v].append(u)
+            self._invalidate()
+
+    def node_id(self, name: str) -> int:
+        try:
+            return self.ids[name]
+        except KeyError:
+            raise UnknownModuleError(f"Módulo desconocido: {name}")
+
+    def edges(self) -> List[Tuple[str, str]]:
+        """Aristas (módulo, dependencia) en orden de inserción por módulo"""
+        return [(self.names[u], self.names[v]) for u in range(len(self.names)) for v in self.successors[u]]
+
+    def _invalidate(self):
+        self._components = None      # Componentes en orden topológico inverso (dependencias primero)
+        self._component_of = None    # ID -> índice de su componente
+        self._closure = None         # Componente -> bitset de módulos alcanzables (incluida ella misma)
+        self._reverse_closure = None # Componente -> bitset de módulos que la alcanzan (incluida ella misma)
+        self._levels = None
+
+    # Componentes fuertemente conexas
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """
+        Algoritmo de Tarjan iterativo. Las componentes salen en orden topológico
+        inverso: cada una después de todas aquellas de las que depende.
+        """
+        if self._components is not None:
+            return self._components
+
+        count = len(self.names)
+        index = [-1] * count
+        lowlink = [0] * count
+        on_stack = [False] * count
+        stack = []
+        components = []
+        component_of = [0] * count
+        counter = 0
+
+        for root in range(count):
+            if index[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child_index = work[-1]
+                if child_index == 0:
+                    index[node] = lowlink[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                children = self.successors[node]
+                if child_index < len(children):
+                    work[-1] = (node, child_index + 1)
+                    child = children[child_index]
+                    if index[child] == -1:
+                        work.append((child, 0))
+                    elif on_stack[child] and index[child] < lowlink[node]:
+                        lowlink[node] = index[child]
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component_of[member] = len(components)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        self._components = components
+        self._component_of = component_of
+        return components
+
+    def cycles(self) -> List[List[str]]:
+        """Grupos de módulos con dependencias circulares"""
+        result = []
+        for component in self.strongly_connected_components():
+            node = component[0]
+            if len(component) > 1 or (node, node) in self._edges:
+                result.append(sorted(self.names[member] for member in component))
+        return result
+
+    def levels(self) -> Dict[str, int]:
+        """
+        Nivel topológico de cada módulo: 0 si no depende de ningún otro y, en
+        general, uno más que la dependencia de mayor nivel. Los módulos de un
+        mismo ciclo comparten nivel. Es también un orden de compilación válido.
+        """
+        if self._levels is None:
+            components = self.strongly_connected_components()
+            component_of = self._component_of
+            component_levels = [0] * len(components)
+            for c, component in enumerate(components):
+                level = 0
+                for member in component:
+                    for dependency in self.successors[member]:
+                        d = component_of[dependency]
+                        if d != c and component_levels[d] + 1 > level:
+                            level = component_levels[d] + 1
+                component_levels[c] = level
+            self._levels = {self.names[node]: component_levels[component_of[node]] for node in range(len(self.names))}
+        return self._levels
+
+    # Cierre transitivo
+
+    def _closures(self, reverse: bool = False) -> List[int]:
+        """
+        Bitset de alcanzabilidad por componente. En orden topológico inverso las
+        dependencias de una componente ya están calculadas cuando se procesa.
+        """
+        cached = self._reverse_closure if reverse else self._closure
+        if cached is not None:
+            return cached
+
+        components = self.strongly_connected_components()
+        component_of = self._component_of
+        neighbors = self.predecessors if reverse else self.successors
+        order = range(len(components) - 1, -1, -1) if reverse else range(len(components))
+        closures = [0] * len(components)
+        for c in order:
+            bits = 0
+            for member in components[c]:
+                bits |= 1 << member
+            for member in components[c]:
+                for neighbor in neighbors[member]:
+                    d = component_of[neighbor]
+                    if d != c:
+                        bits |= closures[d]
+            closures[c] = bits
+
+        if reverse:
+            self._reverse_closure = closures
+        else:
+            self._closure = closures
+        return closures
+
+    def _reachable(self, node: int, reverse: bool = False) -> int:
+        """Bitset de los módulos alcanzables desde node por al menos una arista"""
+        closures = self._closures(reverse)
+        component_of = self._component_of
+        bits = 0
+        for neighbor in (self.predecessors if reverse else self.successors)[node]:
+            bits |= closures[component_of[neighbor]]
+        return bits
+
+    def _names_of(self, bits: int) -> List[str]:
+        names = []
+        while bits:
+            lowest = bits & -bits
+            names.append(self.names[lowest.bit_length() - 1])
+            bits ^= lowest
+        return sorted(names)
+
+    def dependencies_of(self, name: str, transitive: bool = True) -> List[str]:
+        """Módulos de los que depende name (directa o transitivamente)"""
+        node = self.node_id(name)
+        if not transitive:
+            return sorted(self.names[v] for v in self.successors[node])
+        return self._names_of(self._reachable(node))
+
+    def dependents_of(self, name: str, transitive: bool = True) -> List[str]:
+        """Módulos que dependen de name (directa o transitivamente)"""
+        node = self.node_id(name)
+        if not transitive:
+            return sorted(self.names[u] for u in self.predecessors[node])
+        return self._names_of(self._reachable(node, reverse=True))
+
+    def affected_by(self, names: Iterable[str]) -> List[str]:
+        """Módulos que hay que recompilar/probar si cambian los indicados (incluidos ellos)"""
+        bits = 0
+        for name in names:
+            node = self.node_id(name)
+            bits |= (1 << node) | self._reachable(node, reverse=True)
+        return self._names_of(bits)
+
+    def depends_on(self, source: str, target: str) -> bool:
+        """True si source depende (transitivamente) de target"""
+        return bool(self._reachable(self.node_id(source)) >> self.node_id(target) & 1)
+
+    # Ruta crítica
+
+    def _longest_chains(self, weights: Dict[str, float]) -> Tuple[List[float], List[float], List[Optional[int]]]:
+        """
+        Programación dinámica sobre las componentes en orden topológico inverso.
+        Returns:
+            tuple: (coste de cada componente, fin más temprano de cada componente si
+            se compila en cuanto terminan sus dependencias, dependencia que lo determina)
+        """
+        components = self.strongly_connected_components()
+        component_of = self._component_of
+        costs = [sum(weights.get(self.names[member], 0) for member in component) for component in components]
+        finish = [0] * len(components)
+        previous = [None] * len(components)
+        for c, component in enumerate(components):
+            start = 0
+            for member in component:
+                for dependency in self.successors[member]:
+                    d = component_of[dependency]
+                    if d != c and finish[d] > start:
+                        start = finish[d]
+                        previous[c] = d
+            finish[c] = start + costs[c]
+        return costs, finish, previous
+
+    def longest_path_length(self, weights: Dict[str, float]) -> float:
+        """Coste de la cadena de dependencias más cara (los módulos de un ciclo se compilan juntos)"""
+        if not self.names:
+            return 0
+        return max(self._longest_chains(weights)[1])
+
+    def critical_path(self, weights: Dict[str, float]) -> Dict:
+        """
+        Ruta crítica de compilación con un coste por módulo (p.ej. líneas de código).
+        Returns:
+            dict: {'length', 'total', 'path': [{'modules', 'weight', 'start', 'finish'}]
+            en orden de compilación, 'max_concurrency': máximo de módulos compilando a
+            la vez con trabajadores ilimitados}
+        """
+        if not self.names:
+            return {'length': 0, 'total': 0, 'path': [], 'max_concurrency': 0}
+        components = self.strongly_connected_components()
+        costs, finish, previous = self._longest_chains(weights)
+
+        last = max(range(len(components)), key=lambda c: finish[c])
+        chain = []
+        while last is not None:
+            chain.append(last)
+            last = previous[last]
+        path = [{
+            'modules': sorted(self.names[member] for member in components[c]),
+            'weight': costs[c],
+            'start': finish[c] - costs[c],
+            'finish': finish[c]
+        } for c in reversed(chain)]
+
+        # Barrido de intervalos [inicio, fin): los finales se procesan antes que los inicios del mismo instante
+        events = []
+        for c, cost in enumerate(costs):
+            if cost > 0:
+                events.append((finish[c] - cost, 1))
+                events.append((finish[c], -1))
+        running = max_concurrency = 0
+        for _, delta in sorted(events):
+            running += delta
+            max_concurrency = max(max_concurrency, running)
+
+        return {
+            'length': finish[chain[0]],
+            'total': sum(costs),
+            'path': path,
+            'max_concurrency': max_concurrency
+        }
+
+    def to_dict(self, affected: Optional[Iterable[str]] = None) -> Dict:
+        """Resumen serializable a JSON del grafo y, opcionalmente, de una consulta de impacto"""
+        levels = self.levels()
+        by_level = {}
+        for name in self.names:
+            by_level.setdefault(levels[name], []).append(name)
+        result = {
+            'modules': len(self.names),
+            'edges': self.edge_count,
+            'cycles': self.cycles(),
+            'levels': [sorted(by_level[level]) for level in sorted(by_level)],
+            'dependencies': {name: sorted(self.names[v] for v in self.successors[node])
+                             for node, name in enumerate(self.names)}
+        }
+        if affected is not None:
+            changed = list(affected)
+            result['changed'] = changed
+            result['affected'] = self.affected_by(changed)
+        return result
@@ -2,43 +2,83 @@ import os
 import logging
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from xml.dom import minidom
 import uuid
 import json
-import re
 from collections import defaultdict
 from .pod_analyzer import PodfileAnalyzer
 from .app_spm_analyzer import AppSPMDependencyAnalyzer
+from .package_manifest import PackageManifest, parse_package_manifest
+from .dependency_graph import DependencyGraph
+from .dependency_audit import DependencyAudit
+from .build_cost import BuildCostAnalysis
 from utils.app_structure_analyzer import AppStructureAnalyzer
-from utils.version_checker import VersionChecker
+from utils.version_checker import VersionChecker, CachePolicy
+from utils.http_session import HTTPSessionPool
+from utils.project_index import ProjectIndex
+from utils.parse_cache import ParseCache
+from utils.pod_specs_index import PodSpecsIndex
 from diagram.components import (
     add_version_legend,
     add_statistics,
     add_conflicts_section,
     add_spm_dependencies_section,
-    add_pods_dependencies_section
+    add_pods_dependencies_section,
+    write_module_pages
 )
+from diagram.mxfile_writer import MXFileWriter
+from diagram.layered_layout import LayeredLayout
 
 class SPMDiagramGenerator:
-    def __init__(self, project_root, use_cache=False, application_path=None):
+    def __init__(self, project_root, cache_policy=CachePolicy.READ_THROUGH, application_path=None, http_pool_size=10,
+                 cache_backend='json', pod_specs=None, layout='packages', jobs=1, highlight_critical_path=False):
         self.project_root = os.path.abspath(project_root)
         self.spm_modules = []
+        self.dependency_graph = DependencyGraph()
         self.app_name = os.path.basename(project_root)
         self.logger = self.setup_logging()
-        self.version_checker = VersionChecker(use_cache_only=not use_cache)
+        
+        # Índice de archivos del proyecto, construido con un único recorrido y compartido por todos los analizadores
+        self.project_index = ProjectIndex(self.project_root)
+        
+        # Resultados de parseo de manifiestos reutilizados entre ejecuciones si el archivo no cambia
+        self.parse_cache = ParseCache(os.path.join('results', 'parse_cache.json'))
+        # Procesos para parsear en paralelo los Package.swift que no están en la caché
+        self.jobs = max(1, jobs or 1)
+        
+        # Sesiones HTTP compartidas por todos los analizadores
+        self.http_sessions = HTTPSessionPool(pool_size=http_pool_size)
+        self.version_checker = VersionChecker(cache_policy=cache_policy, session_pool=self.http_sessions,
+                                              cache_backend=cache_backend)
         self.unique_dependencies = {}
         self.layers = defaultdict(list)
         
+        # Índice local de specs de CocoaPods (checkout de Specs o shards del CDN), si se indica
+        self.pod_specs_index = None
+        if pod_specs:
+            self.pod_specs_index = PodSpecsIndex(pod_specs, os.path.join('results', 'pod_specs_index.sqlite'))
+            self.pod_specs_index.build()
+        
         # Añadir el analizador de Pods
-        self.pod_analyzer = PodfileAnalyzer(project_root)
+        self.pod_analyzer = PodfileAnalyzer(project_root, session_pool=self.http_sessions,
+                                            project_index=self.project_index, parse_cache=self.parse_cache,
+                                            specs_index=self.pod_specs_index, version_checker=self.version_checker)
         self.pod_dependencies = []
         
         # Añadir el analizador de estructura de app con la ruta de aplicación directa
-        self.app_analyzer = AppStructureAnalyzer(project_root, application_path)
+        self.app_analyzer = AppStructureAnalyzer(project_root, application_path, project_index=self.project_index,
+                                                 parse_cache=self.parse_cache, jobs=self.jobs)
         self.app_structure = {}
+        self._module_usage = None
         
         # NUEVO: Añadir referencia para dependencias SPM directas de la aplicación
         self.app_spm_dependencies = []
+        
+        # Disposición de los módulos: 'packages' (columnas por paquete) o 'layered' (capas por dependencias)
+        self.layout = layout
+        self.module_layout = None
+        
+        # Resaltar en el diagrama la ruta crítica de compilación entre módulos locales
+        self.highlight_critical_path = highlight_critical_path
 
     def setup_logging(self):
         """Configura el sistema de logging"""
@@ -58,7 +98,8 @@ class SPMDiagramGenerator:
         
         # NUEVO: Analizar dependencias SPM directas de la aplicación
         self.logger.info("📦 Analizando dependencias SPM directas de la aplicación")
-        app_spm_analyzer = AppSPMDependencyAnalyzer(self.project_root)
+        app_spm_analyzer = AppSPMDependencyAnalyzer(self.project_root, project_index=self.project_index,
+                                                    parse_cache=self.parse_cache)
         self.app_spm_dependencies = app_spm_analyzer.find_app_spm_dependencies()
         self.logger.info(f"✅ Encontradas {len(self.app_spm_dependencies)} dependencias SPM directas en la aplicación")
         
@@ -77,30 +118,98 @@ class SPMDiagramGenerator:
         app_count = len(self.app_structure)
         total_files = sum(len(files) for app in self.app_structure.values() for files in app.values())
         self.logger.info(f"✅ Encontrados {app_count} directorios de aplicación con {total_files} archivos relevantes")
+        
+        self.parse_cache.save()
+
+    @property
+    def module_usage(self):
+        """
+        Módulos importados por los archivos Swift del proyecto (módulo -> archivos).
+        Se calcula la primera vez que se consulta: el diagrama y el JSON de
+        dependencias no lo usan y no deben pagar el escaneo de todo el árbol.
+        """
+        if self._module_usage is None:
+            self._module_usage = self.app_analyzer.get_module_usage()
+            self.parse_cache.save()
+        return self._module_usage
+
+    def build_dependency_graph(self):
+        """
+        Construye solo el grafo de dependencias entre módulos locales, sin consultar
+        versiones remotas ni analizar Pods (consultas rápidas, p.ej. antes de un merge).
+        """
+        self.find_spm_modules()
+        self.parse_cache.save()
+        return self.dependency_graph
+
+    def audit_dependencies(self, ignore=()):
+        """
+        Detecta dependencias de targets sin usar y módulos importados sin declarar,
+        cruzando los import de las fuentes con los Package.swift. Como el grafo, no
+        consulta versiones remotas.
+        Args:
+            ignore (list): Módulos o dependencias que no se revisan
+        """
+        self.find_spm_modules()
+        audit = DependencyAudit(self.project_root, self.spm_modules, self.project_index,
+                                self.app_analyzer.import_scanner, ignore=ignore)
+        result = audit.run()
+        self.parse_cache.save()
+        return result
+
+    def analyze_build_cost(self, metric='lines', splits=5):
+        """
+        Estima la ruta crítica de compilación entre módulos locales, pesando cada
+        módulo por sus fuentes Swift, y los módulos que convendría dividir.
+        Args:
+            metric (str): 'lines' o 'bytes'
+            splits (int): Número de candidatos a dividir que se informan
+        """
+        if not self.spm_modules:
+            self.find_spm_modules()
+        analysis = BuildCostAnalysis(self.project_root, self.spm_modules, self.dependency_graph, self.project_index,
+                                     self.parse_cache, jobs=self.jobs, metric=metric)
+        result = analysis.run(splits=splits)
+        self.parse_cache.save()
+        return result
+
+    def analyze_architecture(self):
+        """
+        Clasifica los archivos Swift de la aplicación en capas de arquitectura y
+        cuenta las dependencias entre capas no permitidas.
+        """
+        report = self.app_analyzer.get_architecture_report()
+        self.parse_cache.save()
+        return report
 
     def generate_dependencies_json(self):
         """Genera un JSON con la información de todas las dependencias"""
         self.analyze_dependencies()
         dependencies_info = {}
         
+        # Dependencias SPM directas de la aplicación (ya analizadas en analyze_dependencies)
+        app_spm_dependencies = self.app_spm_dependencies
+        
+        # Resolver todas las últimas versiones en un único lote
+        urls = [dependency['url'] for dependency in self.unique_dependencies.values()]
+        urls.extend(dependency['url'] for dependency in app_spm_dependencies)
+        latest_versions = self.version_checker.get_latest_versions(urls)
+        
         # Procesar dependencias SPM de módulos
         for dependency in self.unique_dependencies.values():
-            latest_version = self.version_checker.get_latest_version(dependency['url'])
+            latest_version = latest_versions.get(dependency['url'], 'N/A')
             status = self.version_checker._get_version_status(dependency['version'], latest_version, dependency['url'])
             
             dependencies_info[dependency['name']] = {
                 'url': dependency['url'],
                 'version_used': dependency['version'],
                 'latest_version': latest_version,
+                'latest_in_major': self._latest_in_current_major(dependency['url'], dependency['version']),
                 'timestamp': datetime.now().isoformat(),
                 'status': status,
                 'type': 'spm_module'
             }
         
-        # Procesar dependencias SPM directas de la aplicación
-        app_spm_analyzer = AppSPMDependencyAnalyzer(self.project_root)
-        app_spm_dependencies = app_spm_analyzer.find_app_spm_dependencies()
-        
         # Procesar dependencias SPM directas de la aplicación
         for dependency in app_spm_dependencies:
             # Evitar duplicados, solo añadir si no existe o si es un tipo diferente
@@ -108,13 +217,14 @@ class SPMDiagramGenerator:
                 # Extraer versión del campo correcto
                 version_used = dependency.get('version', 'N/A')
                 
-                latest_version = self.version_checker.get_latest_version(dependency['url'])
+                latest_version = latest_versions.get(dependency['url'], 'N/A')
                 status = self.version_checker._get_version_status(version_used, latest_version, dependency['url'])
                 
                 dependencies_info[dependency['name']] = {
                     'url': dependency['url'],
                     'version_used': version_used,
                     'latest_version': latest_version,
+                    'latest_in_major': self._latest_in_current_major(dependency['url'], version_used),
                     'timestamp': datetime.now().isoformat(),
                     'status': status,
                     'type': 'spm_app_direct',
@@ -157,44 +267,55 @@ class SPMDiagramGenerator:
         self.logger.info(f"\n📝 Información de dependencias guardada en: {output_file}")
         return output_file
 
+    def _latest_in_current_major(self, url, version_used):
+        """Última versión dentro de la major en uso, resuelta con los tags en caché"""
+        current = self.version_checker._parse_version(version_used)
+        if current is None:
+            return 'N/A'
+        return self.version_checker.get_latest_in_major(url, current[0])
+
     def find_spm_modules(self):
         """Buscar módulos de Swift Package Manager en el proyecto"""
         self.logger.info(f"Buscando en: {self.project_root}")
         
-        ignore_dirs = {'.git', 'build', 'DerivedData', 'Pods', '.build', '.swiftpm'}
         modules_by_directory = {}
         
-        for root, dirs, files in os.walk(self.project_root):
-            dirs[:] = [d for d in dirs if d not in ignore_dirs]
+        # Primero se descubren todos los manifiestos y se parsean en lote (en paralelo si
+        # jobs > 1); el resultado sigue el orden de descubrimiento, así que el diagrama
+        # no depende del número de procesos
+        package_paths = list(self.project_index.find_package_manifests())
+        manifests = self.load_package_manifests(package_paths)
+        
+        for package_path, manifest in zip(package_paths, manifests):
+            root = os.path.dirname(package_path)
+            module_name = os.path.basename(root)
+            relative_path = os.path.relpath(root, self.project_root)
             
-            if 'Package.swift' in files:
-                module_name = os.path.basename(root)
-                package_path = os.path.join(root, 'Package.swift')
-                relative_path = os.path.relpath(root, self.project_root)
+            try:
+                dependencies = self._register_dependencies(manifest)
+                parent_dir = os.path.dirname(relative_path) or "root"
                 
-                try:
-                    dependencies = self.parse_package_dependencies(package_path)
-                    parent_dir = os.path.dirname(relative_path) or "root"
-                    
-                    if parent_dir not in modules_by_directory:
-                        modules_by_directory[parent_dir] = []
-                    
-                    module_info = {
-                        'name': module_name,
-                        'path': relative_path,
-                        'dependencies': dependencies
-                    }
-                    
-                    modules_by_directory[parent_dir].append(module_info)
-                    self.logger.info(f"\n✅ Encontrado módulo SPM: {module_name}")
-                    
-                except Exception as e:
-                    self.logger.error(f"Error procesando módulo {module_name}: {str(e)}")
+                if parent_dir not in modules_by_directory:
+                    modules_by_directory[parent_dir] = []
+                
+                module_info = {
+                    'name': module_name,
+                    'path': relative_path,
+                    'dependencies': dependencies,
+                    'manifest': manifest
+                }
+                
+                modules_by_directory[parent_dir].append(module_info)
+                self.logger.info(f"\n✅ Encontrado módulo SPM: {module_name}")
+                
+            except Exception as e:
+                self.logger.error(f"Error procesando módulo {module_name}: {str(e)}")
         
         self.spm_modules = [
             {'directory': dir, 'modules': modules}
             for dir, modules in modules_by_directory.items()
         ]
+        self.dependency_graph = DependencyGraph.from_modules(self.spm_modules)
 
         # Logging de módulos encontrados
         self.logger.info(f"Módulos encontrados por directorio:")
@@ -203,86 +324,50 @@ class SPMDiagramGenerator:
         
         return self.spm_modules
     
-    def parse_package_dependencies(self, package_path):
-        """Analiza el archivo Package.swift para extraer dependencias"""
-        dependencies = []
+    def load_package_manifest(self, package_path):
+        """
+        Retorna el modelo del Package.swift, leyendo y parseando el archivo solo si
+        ha cambiado desde la última ejecución (caché de parseo).
+        Si no se puede leer, retorna un manifiesto vacío (que no se guarda en caché).
+        """
         try:
-            with open(package_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                
-                dependency_patterns = {
-                    'standard': [
-                        r'\.package\(url:\s*"([^"]+)",\s*from:\s*"([^"]+)"\)',
-                        r'\.package\(url:\s*"([^"]+)",\s*exact:\s*"([^"]+)"\)',
-                        r'\.package\(url:\s*"([^"]+)",\s*branch:\s*"([^"]+)"\)',
-                        r'\.package\(url:\s*"([^"]+)",\s*revision:\s*"([^"]+)"\)',
-                    ],
-                    'range': [
-                        r'\.package\(url:\s*"([^"]+)",\s*\.upToNextMajor\(from:\s*"([^"]+)"\)\)',
-                        r'\.package\(url:\s*"([^"]+)",\s*\.upToNextMinor\(from:\s*"([^"]+)"\)\)',
-                    ],
-                    'custom': [
-                        r'\.package\(url:\s*"([^"]+)",\s*exact:\s*\.init\(stringLiteral:\s*"([^"]+)"\)\)'
-                    ]
-                }
-                
-                # Procesar dependencias externas
-                for pattern_type, patterns in dependency_patterns.items():
-                    for pattern in patterns:
-                        matches = re.finditer(pattern, content)
-                        for match in matches:
-                            url = match.group(1)
-                            version = match.group(2)
-                            package_name = url.split('/')[-1].replace('.git', '')
-                            
-                            dependency = {
-                                'name': package_name,
-                                'url': url,
-                                'version': version,
-                                'type': pattern_type
-                            }
-                            
-                            if 'apple.com' in url.lower():
-                                dependency['isAppleDependency'] = True
-                            
-                            dependencies.append(dependency)
-                            
-                            if not dependency.get('isLocal', False):
-                                dep_key = dependency['name']
-                                if dep_key not in self.unique_dependencies:
-                                    self.unique_dependencies[dep_key] = dependency
-                                    # Procesar dependencias locales
-                local_patterns = [
-                    r'\.package\(path:\s*"([^"]+)"\)',
-                    r'\.package\(name:\s*"([^"]+)",\s*path:\s*"([^"]+)"\)',
-                ]
-                
-                for pattern in local_patterns:
-                    local_matches = re.finditer(pattern, content)
-                    for match in local_matches:
-                        if len(match.groups()) == 2:
-                            name = match.group(1)
-                            path = match.group(2)
-                            dependencies.append({
-                                'name': name,
-                                'path': path,
-                                'isLocal': True
-                            })
-                        else:
-                            path = match.group(1)
-                            name = os.path.basename(path)
-                            dependencies.append({
-                                'name': name,
-                                'path': path,
-                                'isLocal': True
-                            })
-                
-                self.logger.info(f"Analizadas {len(dependencies)} dependencias en {package_path}")
-                
+            data = self.parse_cache.get_or_parse(package_path, 'package_manifest', parse_package_manifest)
+            return PackageManifest.from_dict(data)
         except Exception as e:
             self.logger.error(f"Error al analizar Package.swift: {str(e)}")
-        
-        return dependencies
+            return PackageManifest(package_path)
+    
+    def load_package_manifests(self, package_paths):
+        """
+        Versión por lotes de load_package_manifest: los Package.swift que no están en
+        la caché se parsean en un pool de self.jobs procesos. Retorna los manifiestos
+        en el mismo orden que package_paths.
+        """
+        results, errors = self.parse_cache.get_or_parse_many(
+            package_paths, 'package_manifest', parse_package_manifest, jobs=self.jobs
+        )
+        manifests = []
+        for package_path, data in zip(package_paths, results):
+            if data is None:
+                error = errors.get(os.path.abspath(package_path), 'resultado vacío')
+                self.logger.error(f"Error al analizar Package.swift: {error}")
+                manifests.append(PackageManifest(package_path))
+            else:
+                manifests.append(PackageManifest.from_dict(data))
+        return manifests
+    
+    def parse_package_dependencies(self, package_path):
+        """Analiza el archivo Package.swift para extraer dependencias"""
+        return self._register_dependencies(self.load_package_manifest(package_path))
+    
+    def _register_dependencies(self, manifest):
+        """Registra las dependencias remotas del manifiesto en unique_dependencies y retorna todas"""
+        for dependency in manifest.remote_dependencies:
+            dep_key = dependency['name']
+            if dep_key not in self.unique_dependencies:
+                self.unique_dependencies[dep_key] = dependency
+        
+        return manifest.dependencies
 
     def analyze_dependency_conflicts(self):
         """Analiza conflictos potenciales entre dependencias"""
@@ -312,43 +397,24 @@ class SPMDiagramGenerator:
         
         return conflicts
     
-    def generate_unified_diagram(self):
+    def generate_unified_diagram(self, indent='  ', compress=False):
         """
         Genera un único archivo XML que contiene tanto el diagrama principal
         como las páginas individuales de cada módulo.
+        El archivo se escribe de forma incremental: cada página se emite en cuanto
+        se genera, sin construir ni reparsear el documento completo en memoria.
+        Args:
+            indent (str): Indentación por nivel del XML; None o '' para una salida compacta
+            compress (bool): Comprimir cada página (deflate + base64) como hace draw.io
         """
         self.logger.info("\n🔄 Generando diagrama unificado...")
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # Crear el elemento raíz mxfile
-        mxfile = ET.Element('mxfile')
-        mxfile.set('host', 'app.diagrams.net')
-        mxfile.set('modified', datetime.now().isoformat())
-        mxfile.set('agent', 'Python SPM Diagram Generator v2.0')
-        mxfile.set('version', '21.6.8')
-        mxfile.set('type', 'device')
-        
-        # Generar y añadir el diagrama principal
+        # Generar el diagrama principal (se analiza el proyecto antes de abrir el archivo)
         self.logger.info("📊 Generando diagrama principal...")
         main_mxfile = self.generate_drawio_diagram()
         main_diagram = main_mxfile.find('diagram')
-        if main_diagram is not None:
-            main_diagram.set('name', 'Diagrama Principal')  # Asegurar nombre correcto
-            mxfile.append(main_diagram)
         
-        # Generar y añadir los diagramas de módulos individuales
-        self.logger.info("📄 Generando diagramas de módulos individuales...")
-        modules_xml = self.generate_module_pages_diagram()
-        
-        # Parsear el XML de módulos y añadir cada diagrama
-        try:
-            modules_root = ET.fromstring(modules_xml)
-            for diagram in modules_root.findall('diagram'):
-                mxfile.append(diagram)
-        except ET.ParseError as e:
-            self.logger.error(f"Error parseando diagramas de módulos: {e}")
-        
-        # Guardar el archivo combinado
         results_dir = "results"
         if not os.path.exists(results_dir):
             os.makedirs(results_dir)
@@ -356,16 +422,29 @@ class SPMDiagramGenerator:
         
         output_file = os.path.join(results_dir, f'diagrama_spm_unificado_{timestamp}.xml')
         
-        # Generar el XML final
-        xml_str = ET.tostring(mxfile, encoding='unicode')
-        xml_str = '<?xml version="1.0" encoding="UTF-8"?>\n' + xml_str
-        pretty_xml = minidom.parseString(xml_str).toprettyxml(indent="  ")
-        
-        # Guardar el archivo
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(pretty_xml)
+            writer = MXFileWriter(f, indent=indent, compress=compress)
+            writer.start_file(
+                host='app.diagrams.net',
+                modified=datetime.now().isoformat(),
+                agent='Python SPM Diagram Generator v2.0',
+                version='21.6.8',
+                type='device'
+            )
+            
+            if main_diagram is not None:
+                main_diagram.set('name', 'Diagrama Principal')  # Asegurar nombre correcto
+                writer.element(main_diagram)
+            # El árbol del diagrama principal ya está en disco
+            main_mxfile.clear()
+            
+            # Añadir los diagramas de módulos individuales
+            self.logger.info("📄 Generando diagramas de módulos individuales...")
+            self.generate_module_pages_diagram(writer)
+            writer.end_file()
         
-        self.logger.info(f"\n✅ Diagrama unificado generado exitosamente en: {output_file}")
+        self.logger.info(f"\n✅ Diagrama unificado generado exitosamente en: {output_file} "
+                         f"({writer.cells_written} celdas)")
         self.logger.info("\nPuedes abrir este archivo en draw.io o en la aplicación de escritorio Diagrams")
         
         return output_file
@@ -563,6 +642,9 @@ class SPMDiagramGenerator:
         """Generar diagrama Draw.io con módulos SPM y Pods agrupados"""
         # Analizar todas las dependencias
         self.analyze_dependencies()
+        
+        if self.layout == 'layered':
+            self.module_layout = self._compute_layered_layout()
 
         # Calcular dimensiones necesarias
         dimensions = self._calculate_dimensions()
@@ -582,11 +664,18 @@ class SPMDiagramGenerator:
         # Calcular posición inicial para centrado
         current_x = (dimensions['canvas_width'] - dimensions['total_width']) / 2
         
-        # Generar sección SPM
-        module_cells = self._generate_packages_and_modules(root, dimensions, current_x)
+        if self.module_layout:
+            # Módulos por capas con las aristas ya enrutadas
+            self._generate_layered_modules(root, current_x)
+        else:
+            # Generar sección SPM
+            module_cells = self._generate_packages_and_modules(root, dimensions, current_x)
+            
+            # Agregar conexiones entre módulos SPM
+            self._add_dependencies_connections(root, module_cells)
         
-        # Agregar conexiones entre módulos SPM
-        self._add_dependencies_connections(root, module_cells)
+        if self.highlight_critical_path:
+            self._highlight_critical_path(root, self.analyze_build_cost())
         
         # Generar sección Pods si existe
         if self.pod_dependencies:
@@ -599,6 +688,29 @@ class SPMDiagramGenerator:
         
         return mxfile
 
+    def _highlight_critical_path(self, root, build_cost):
+        """Resalta los módulos de la ruta crítica y las dependencias que los encadenan"""
+        module_ids = {}
+        for pkg_idx, package_group in enumerate(self.spm_modules):
+            for i, module in enumerate(package_group['modules']):
+                module_ids.setdefault(module['name'], f'module_{pkg_idx}_{i}')
+        
+        path = [[module_ids[name] for name in step['modules']] for step in build_cost['critical_path']['modules']]
+        cell_ids = {cell_id for step in path for cell_id in step}
+        # Las aristas van del módulo dependiente a su dependencia: del paso siguiente al anterior
+        edge_ids = {f'dep_edge_{source}_{target}' for dependencies, dependents in zip(path, path[1:])
+                    for source in dependents for target in dependencies}
+        # Dentro de un ciclo de la ruta, todas sus aristas forman parte de ella
+        edge_ids.update(f'dep_edge_{source}_{target}' for step in path for source in step for target in step)
+        
+        for cell in root.iter('mxCell'):
+            cell_id = cell.get('id')
+            if cell_id in cell_ids:
+                cell.set('style', cell.get('style', '') + 'strokeColor=#d6336c;strokeWidth=3;fontColor=#d6336c;')
+            elif cell_id in edge_ids:
+                cell.set('style', cell.get('style', '') + 'strokeColor=#d6336c;strokeWidth=3;dashed=0;')
+        self.logger.info(f"⏱️ Ruta crítica resaltada: {' → '.join(name for step in build_cost['critical_path']['modules'] for name in step['modules'])}")
+
     def _calculate_dimensions(self):
         """Calcula las dimensiones necesarias para el diagrama"""
         dimensions = {
@@ -619,8 +731,11 @@ class SPMDiagramGenerator:
         dimensions['package_widths'] = package_widths
         
         # Calcular dimensiones para SPM
-        max_spm_modules_per_package = max(len(pkg['modules']) for pkg in self.spm_modules) if self.spm_modules else 0
-        spm_height = dimensions['package_padding'] + (max_spm_modules_per_package * (dimensions['module_height'] + dimensions['module_spacing']))
+        if self.module_layout:
+            spm_height = self.module_layout['height']
+        else:
+            max_spm_modules_per_package = max(len(pkg['modules']) for pkg in self.spm_modules) if self.spm_modules else 0
+            spm_height = dimensions['package_padding'] + (max_spm_modules_per_package * (dimensions['module_height'] + dimensions['module_spacing']))
         
         # Calcular dimensiones para Pods
         pods_height = 0
@@ -655,6 +770,8 @@ class SPMDiagramGenerator:
             total_package_width += package_width
         
         spm_width = total_package_width + ((len(self.spm_modules) - 1) * dimensions['package_spacing'])
+        if self.module_layout:
+            spm_width = self.module_layout['width']
         
         # Ancho para sección Pods
         pods_width = 0
@@ -742,6 +859,9 @@ class SPMDiagramGenerator:
         app_height = 60
         app_x = (dimensions['canvas_width'] - app_width) / 2
         app_y = 40
+        if self.module_layout:
+            # En la disposición por capas la app es la raíz del grafo
+            app_x, _ = self._layered_position('app', (dimensions['canvas_width'] - dimensions['total_width']) / 2)
         
         app_cell = ET.SubElement(root, 'mxCell')
         app_cell.set('id', 'app')
@@ -788,6 +908,93 @@ class SPMDiagramGenerator:
         
         return module_cells
 
+    def _compute_layered_layout(self):
+        """
+        Calcula la disposición por capas del grafo app -> módulos -> dependencias locales.
+        La app se enlaza con los módulos de los que no depende ningún otro.
+        """
+        self.logger.info("📐 Calculando disposición por capas...")
+        module_ids = {}
+        nodes = ['app']
+        for pkg_idx, package_group in enumerate(self.spm_modules):
+            for i, module in enumerate(package_group['modules']):
+                module_id = f'module_{pkg_idx}_{i}'
+                module_ids.setdefault(module['name'], module_id)
+                nodes.append(module_id)
+        
+        edges = [(module_ids[source], module_ids[target]) for source, target in self.dependency_graph.edges()]
+        
+        dependents = {target for _, target in edges}
+        edges = [('app', node) for node in nodes[1:] if node not in dependents] + edges
+        
+        layout = LayeredLayout(node_width=240, node_height=180, layer_spacing=120, node_spacing=80).layout(
+            nodes, edges, sizes={'app': (300, 60)}
+        )
+        self.logger.info(f"📐 {len(nodes) - 1} módulos en {layout['layers'] - 1} capas, "
+                         f"{len(edges)} conexiones, {layout['crossings']} cruces")
+        return layout
+    
+    def _layered_position(self, node, origin_x, origin_y=40):
+        """Posición absoluta de un nodo de la disposición por capas"""
+        x, y = self.module_layout['positions'][node]
+        return origin_x + x, origin_y + y
+    
+    def _generate_layered_modules(self, root, origin_x, origin_y=40):
+        """Genera los módulos y sus conexiones en la disposición por capas"""
+        for pkg_idx, package_group in enumerate(self.spm_modules):
+            for i, module in enumerate(package_group['modules']):
+                x, y = self._layered_position(f'module_{pkg_idx}_{i}', origin_x, origin_y)
+                self._create_module(root, pkg_idx, i, module, x, y, 240, 180)
+        
+        module_layers = {}
+        for pkg_idx, package_group in enumerate(self.spm_modules):
+            for i, module in enumerate(package_group['modules']):
+                module_layers[f'module_{pkg_idx}_{i}'] = self.layers[module['name']]
+        
+        for (source_id, target_id), points in self.module_layout['edges'].items():
+            points = [(origin_x + x, origin_y + y) for x, y in points]
+            reversed_edge = (source_id, target_id) in self.module_layout['reversed']
+            if source_id == 'app':
+                self._create_routed_connection(
+                    root, f'edge_app_{target_id}', source_id, target_id, 'base_layer', points, reversed_edge,
+                    'endArrow=block;dashed=1;endFill=0;endSize=12;html=1;strokeColor=#9370db;'
+                )
+            else:
+                self._create_routed_connection(
+                    root, f'dep_edge_{source_id}_{target_id}', source_id, target_id, module_layers[source_id],
+                    points, reversed_edge,
+                    'dashed=1;endArrow=open;endFill=0;strokeWidth=1.5;strokeColor=#0066CC;'
+                )
+    
+    def _create_routed_connection(self, root, edge_id, source_id, target_id, parent, points, reversed_edge, style):
+        """
+        Crea una conexión con puntos de paso explícitos (edgeStyle=none), que
+        draw.io dibuja tal cual sin enrutarla al abrir el archivo.
+        """
+        edge = ET.SubElement(root, 'mxCell')
+        edge.set('id', edge_id)
+        edge.set('edge', '1')
+        edge.set('parent', parent)
+        edge.set('source', source_id)
+        edge.set('target', target_id)
+        # Sale por la parte inferior del origen y entra por la superior del destino
+        # (al revés en las aristas que cierran un ciclo)
+        exit_y, entry_y = ('0', '1') if reversed_edge else ('1', '0')
+        edge.set('style', f'edgeStyle=none;html=1;rounded=1;exitX=0.5;exitY={exit_y};exitDx=0;exitDy=0;'
+                          f'entryX=0.5;entryY={entry_y};entryDx=0;entryDy=0;' + style)
+        
+        edge_geo = ET.SubElement(edge, 'mxGeometry')
+        edge_geo.set('relative', '1')
+        edge_geo.set('as', 'geometry')
+        
+        if points:
+            array = ET.SubElement(edge_geo, 'Array')
+            array.set('as', 'points')
+            for x, y in points:
+                point = ET.SubElement(array, 'mxPoint')
+                point.set('x', str(x))
+                point.set('y', str(y))
+
     def _create_package(self, root, pkg_idx, directory, x, y, width, height):
         """Crea un paquete individual"""
         package_cell = ET.SubElement(root, 'mxCell')
@@ -868,15 +1075,15 @@ class SPMDiagramGenerator:
 
     def _add_dependencies_connections(self, root, module_cells):
         """Agrega las conexiones entre módulos basadas en sus dependencias"""
+        graph = self.dependency_graph
         for pkg_idx, package_group in enumerate(self.spm_modules):
             for i, module in enumerate(package_group['modules']):
                 source_id = f'module_{pkg_idx}_{i}'
                 layer_id = self.layers[module['name']]
                 
-                for dep in module['dependencies']:
-                    if dep.get('isLocal', False) and dep['name'] in module_cells:
-                        target_id = module_cells[dep['name']]
-                        self._create_dependency_connection(root, source_id, target_id, layer_id)
+                for dependency in graph.successors[graph.node_id(module['name'])]:
+                    target_id = module_cells[graph.names[dependency]]
+                    self._create_dependency_connection(root, source_id, target_id, layer_id)
 
     def _create_dependency_connection(self, root, source_id, target_id, layer_id):
         """Crea una conexión de dependencia entre dos módulos"""
@@ -914,6 +1121,11 @@ class SPMDiagramGenerator:
         # Ajustar posición Y inicial para los contenedores
         containers_y = base_y + legend_height + 20
         
+        # Resolver en un único lote las versiones de todas las dependencias SPM
+        urls = [dep['url'] for dep in self.unique_dependencies.values()]
+        urls.extend(dep['url'] for dep in self.app_spm_dependencies)
+        latest_versions = self.version_checker.get_latest_versions(urls)
+        
         # Contenedor SPM Módulos
         spm_container = ET.SubElement(root, 'mxCell')
         spm_id = f'statistics_spm_{uuid.uuid4().hex[:8]}'
@@ -933,7 +1145,7 @@ class SPMDiagramGenerator:
         # SPM Dependencies de Módulos
         y_offset = 30  # Empezar después del título
         if self.unique_dependencies:
-            y_offset = add_spm_dependencies_section(root, spm_id, y_offset, self.unique_dependencies, self.version_checker)
+            y_offset = add_spm_dependencies_section(root, spm_id, y_offset, self.unique_dependencies, self.version_checker, latest_versions)
             spm_container.set('height', str(y_offset + 30))  # Ajustar altura del contenedor SPM
         
         # Contenedor SPM Directas
@@ -962,7 +1174,7 @@ class SPMDiagramGenerator:
             # Añadir dependencias SPM directas
             direct_y_offset = 30  # Empezar después del título
             if app_dependencies_dict:
-                direct_y_offset = add_spm_dependencies_section(root, spm_direct_id, direct_y_offset, app_dependencies_dict, self.version_checker)
+                direct_y_offset = add_spm_dependencies_section(root, spm_direct_id, direct_y_offset, app_dependencies_dict, self.version_checker, latest_versions)
                 spm_direct_container.set('height', str(direct_y_offset + 30))
         
         # Contenedor Pods (ajustar posición según lo anterior)
@@ -1082,149 +1294,25 @@ class SPMDiagramGenerator:
             pod_geo.set('height', str(module_height))
             pod_geo.set('as', 'geometry')
     
-    def generate_module_pages_diagram(self):
-        """Genera diagrama con páginas separadas para cada módulo SPM"""
+    def generate_module_pages_diagram(self, writer):
+        """
+        Escribe en el mxfile una página por cada módulo SPM.
+        Args:
+            writer (MXFileWriter): Escritor del archivo unificado
+        """
         self.logger.info("\n📄 Generando diagrama de módulos en páginas...")
         
+        # Se reutiliza el manifiesto ya parseado por find_spm_modules
         packages_data = {}
         for package_group in self.spm_modules:
             for module in package_group['modules']:
-                package_file = os.path.join(self.project_root, module['path'], 'Package.swift')
-                if os.path.exists(package_file):
-                    package_name, targets = self._parse_module_package(package_file)
-                    packages_data[package_file] = (package_name, targets)
-                    self.logger.info(f"✅ Procesado: {package_name}")
+                manifest = module['manifest']
+                packages_data[manifest.path] = (manifest.name, manifest.targets)
+                self.logger.info(f"✅ Procesado: {manifest.name}")
         
-        return self._generate_module_pages_xml(packages_data)
+        write_module_pages(writer, packages_data)
 
     def _parse_module_package(self, file_path):
         """Parsea un archivo Package.swift para extraer nombre y targets"""
-        try:
-            with open(file_path, 'r') as file:
-                content = file.read()
-            
-            package_name = re.search(r'name:\s*"([^"]+)"', content)
-            package_name = package_name.group(1) if package_name else "Unknown"
-            
-            targets = {}
-            target_blocks = re.finditer(r'\.target\(\s*name:\s*"([^"]+)".*?dependencies:\s*\[(.*?)\]', content, re.DOTALL)
-            
-            for block in target_blocks:
-                target_name = block.group(1)
-                deps_text = block.group(2)
-                dependencies = set()
-                
-                # Procesar dependencias compuestas
-                composite_deps = re.finditer(r'"([^"]+)\s*\(([^)]+)\)"', deps_text)
-                for dep in composite_deps:
-                    dep_name = f"{dep.group(1)} ({dep.group(2).strip()})"
-                    dependencies.add(dep_name)
-                
-                # Procesar productos
-                product_deps = re.finditer(r'\.product\s*\(\s*name:\s*"([^"]+)"\s*,\s*package:\s*"([^"]+)"\s*\)', deps_text)
-                for dep in product_deps:
-                    dep_name = f"{dep.group(1)} ({dep.group(2)})"
-                    dependencies.add(dep_name)
-                
-                # Procesar dependencias simples
-                simple_deps = re.finditer(r'"([^"(]+?)"(?!\s*\()', deps_text)
-                for dep in simple_deps:
-                    dep_name = dep.group(1)
-                    if not any(dep_name in d for d in dependencies):
-                        dependencies.add(dep_name)
-                
-                targets[target_name] = sorted(list(dependencies))
-            
-            return package_name, targets
-        except Exception as e:
-            self.logger.error(f"Error parseando {file_path}: {str(e)}")
-            return "Unknown", {}
-        
-    def _generate_module_pages_xml(self, packages_data):
-        """Genera el XML para las páginas de módulos"""
-        ITEMS_PER_ROW = 4
-        ITEM_WIDTH = 280
-        CONTAINER_PADDING = 40
-        BASE_HEIGHT = 60
-        DEP_HEIGHT = 20
-        PADDING = 40
-
-        def calculate_target_height(dependencies):
-            if not dependencies:
-                return BASE_HEIGHT
-            return BASE_HEIGHT + (len(dependencies) * DEP_HEIGHT) + 20
-
-        xml = '''<?xml version="1.0" encoding="UTF-8"?>
-        <mxfile host="app.diagrams.net" modified="{}" agent="SPM Module Generator" version="21.6.8" type="device">'''.format(
-            datetime.now().isoformat()
-        )
-
-        for idx, (package_path, (package_name, targets)) in enumerate(packages_data.items()):
-            if not targets:
-                total_width = ITEM_WIDTH + PADDING
-                total_height = 200  # Altura mínima para contenedor vacío
-            else:
-                max_target_height = max(calculate_target_height(deps) for deps in targets.values())
-                ROW_HEIGHT = max_target_height + PADDING
-                num_targets = len(targets)
-                num_rows = (num_targets + ITEMS_PER_ROW - 1) // ITEMS_PER_ROW
-                total_width = min(num_targets, ITEMS_PER_ROW) * (ITEM_WIDTH + PADDING)
-                total_height = 100 + (num_rows * ROW_HEIGHT)
-
-            # Ajustar dimensiones para el contenedor principal
-            container_width = total_width + (2 * CONTAINER_PADDING) + 40  # Margen derecho adicional
-            container_height = total_height + (2 * CONTAINER_PADDING)
-
-            xml += f'''
-        <diagram id="module-{idx}" name="{package_name}">
-            <mxGraphModel dx="1422" dy="794" grid="1" gridSize="10" guides="1" tooltips="1" connect="1" arrows="1" fold="1" page="1" pageScale="1" pageWidth="{max(850, container_width + 200)}" pageHeight="{max(1100, container_height + 200)}">
-            <root>
-                <mxCell id="0"/>
-                <mxCell id="1" parent="0"/>
-
-                <mxCell id="title_{idx}" value="{package_name}" style="text;html=1;strokeColor=none;fillColor=none;align=center;verticalAlign=middle;whiteSpace=wrap;rounded=0;fontSize=24;fontStyle=1" vertex="1" parent="1">
-                    <mxGeometry x="{(container_width - 200) / 2 + CONTAINER_PADDING}" y="20" width="200" height="40" as="geometry"/>
-                </mxCell>
-
-                <mxCell id="module_container_{idx}" value="Módulo: {package_name}" style="swimlane;fontStyle=1;childLayout=stackLayout;horizontal=1;startSize=30;horizontalStack=0;resizeParent=1;resizeParentMax=0;resizeLast=0;collapsible=1;marginBottom=0;fillColor=#f5f5f5;strokeColor=#666666;" vertex="1" parent="1">
-                    <mxGeometry x="{CONTAINER_PADDING}" y="80" width="{container_width - 2 * CONTAINER_PADDING + 40}" height="{container_height - 80}" as="geometry"/>
-                </mxCell>'''
-
-            if targets:
-                for i, (target_name, dependencies) in enumerate(targets.items()):
-                    row = i // ITEMS_PER_ROW
-                    col = i % ITEMS_PER_ROW
-                    x = 40 + (col * (ITEM_WIDTH + PADDING))
-                    y = 40 + (row * ROW_HEIGHT)
-                    height = calculate_target_height(dependencies)
-
-                    # Contenedor del target
-                    xml += f'''
-                <mxCell id="target_{idx}_{i}" value="" style="swimlane;fontStyle=1;childLayout=stackLayout;horizontal=1;startSize=30;horizontalStack=0;resizeParent=1;resizeParentMax=0;resizeLast=0;collapsible=1;marginBottom=0;fillColor=#dae8fc;strokeColor=#6c8ebf;" vertex="1" parent="module_container_{idx}">
-                    <mxGeometry x="{x}" y="{y}" width="{ITEM_WIDTH}" height="{height}" as="geometry"/>
-                </mxCell>
-                
-                <mxCell id="target_{idx}_{i}_name" value="{target_name}" style="text;strokeColor=none;fillColor=none;align=center;verticalAlign=middle;spacingLeft=4;spacingRight=4;overflow=hidden;points=[[0,0.5],[1,0.5]];portConstraint=eastwest;rotatable=0;fontStyle=1" vertex="1" parent="target_{idx}_{i}">
-                    <mxGeometry y="0" width="{ITEM_WIDTH}" height="30" as="geometry"/>
-                </mxCell>'''
-
-                    if dependencies:
-                        for j, dep in enumerate(dependencies):
-                            xml += f'''
-                <mxCell id="target_{idx}_{i}_dep_{j}" value="• {dep}" style="text;strokeColor=none;fillColor=none;align=left;verticalAlign=middle;spacingLeft=12;spacingRight=4;overflow=hidden;points=[[0,0.5],[1,0.5]];portConstraint=eastwest;rotatable=0;" vertex="1" parent="target_{idx}_{i}">
-                    <mxGeometry y="{30 + j * DEP_HEIGHT}" width="{ITEM_WIDTH}" height="{DEP_HEIGHT}" as="geometry"/>
-                </mxCell>'''
-            else:
-                # Agregar mensaje cuando no hay targets
-                xml += f'''
-                <mxCell id="no_targets_{idx}" value="No hay targets definidos" style="text;html=1;strokeColor=none;fillColor=none;align=center;verticalAlign=middle;whiteSpace=wrap;rounded=0;fontSize=12;fontStyle=2;textColor=#666666;" vertex="1" parent="module_container_{idx}">
-                    <mxGeometry x="{(container_width - 200) / 2}" y="60" width="200" height="30" as="geometry"/>
-                </mxCell>'''
-
-            xml += '''
-            </root>
-            </mxGraphModel>
-        </diagram>'''
-
-        xml += '\n</mxfile>'
-        return xml
\ No newline at end of file
+        manifest = self.load_package_manifest(file_path)
+        return manifest.name, manifest.targets
@@ -1,3 +1,6 @@
 from .generator import SPMDiagramGenerator
 from .generator import PodfileAnalyzer
-from .app_spm_analyzer import AppSPMDependencyAnalyzer
\ No newline at end of file
+from .app_spm_analyzer import AppSPMDependencyAnalyzer
+from .dependency_graph import DependencyGraph, UnknownModuleError
+from .dependency_audit import DependencyAudit
+from .build_cost import BuildCostAnalysis
\ No newline at end of file
@@ -0,0 +1,226 @@
+import os
+import logging
+from typing import Dict, List, Optional, Tuple
+from .swift_manifest import parse_manifest, Call, Str, Range, ManifestAST
+
+logger = logging.getLogger(__name__)
+
+# Tipos de target admitidos en un Package.swift
+TARGET_KINDS = ('target', 'executableTarget', 'testTarget', 'binaryTarget', 'systemLibrary', 'plugin', 'macro')
+PRODUCT_KINDS = ('library', 'executable', 'plugin')
+
+# Orden de las dependencias: se mantiene el del parser de expresiones regulares
+# anterior (agrupadas por forma del requisito) para no reordenar los diagramas
+REQUIREMENT_ORDER = {
+    'from': 0, 'exact': 1, 'branch': 2, 'revision': 3,
+    'upToNextMajor': 4, 'upToNextMinor': 5, 'custom': 6, 'range': 7, 'unknown': 8,
+    'local_path': 9, 'local_named': 10
+}
+REQUIREMENT_TYPES = {
+    'from': 'standard', 'exact': 'standard', 'branch': 'standard', 'revision': 'standard',
+    'upToNextMajor': 'range', 'upToNextMinor': 'range', 'range': 'range',
+    'custom': 'custom', 'unknown': 'standard'
+}
+
+
+class PackageManifest:
+    """
+    Modelo de un Package.swift: nombre del paquete, productos, targets con sus
+    dependencias y dependencias de paquetes (remotas y locales).
+    Se construye con una única lectura del archivo y lo consumen tanto el
+    diagrama principal como las páginas de cada módulo.
+    """
+
+    def __init__(self, path: str, name: str = "Unknown", products: Optional[List[Dict]] = None,
+                 targets: Optional[Dict[str, List[str]]] = None, dependencies: Optional[List[Dict]] = None,
+                 target_types: Optional[Dict[str, str]] = None, target_paths: Optional[Dict[str, str]] = None):
+        self.path = path
+        self.name = name
+        self.products = products or []          # [{'name', 'type', 'targets'}]
+        self.targets = targets or {}            # target -> dependencias ordenadas
+        self.target_types = target_types or {}  # target -> tipo (target, testTarget, binaryTarget, ...)
+        self.target_paths = target_paths or {}  # target -> directorio de fuentes, si se indica con path:
+        self.dependencies = dependencies or []  # Dependencias de paquetes (remotas y locales)
+
+    @property
+    def remote_dependencies(self) -> List[Dict]:
+        return [dependency for dependency in self.dependencies if not dependency.get('isLocal', False)]
+
+    @property
+    def local_dependencies(self) -> List[Dict]:
+        return [dependency for dependency in self.dependencies if dependency.get('isLocal', False)]
+
+    @classmethod
+    def from_file(cls, path: str) -> 'PackageManifest':
+        """Lee y parsea un Package.swift"""
+        with open(path, 'r', encoding='utf-8') as file:
+            content = file.read()
+        return cls.from_source(path, content)
+
+    @classmethod
+    def from_source(cls, path: str, content: str) -> 'PackageManifest':
+        """Construye el modelo a partir del contenido de un Package.swift"""
+        ast = parse_manifest(content)
+        name = ast.package.arg('name') if ast.package is not None else None
+        targets, target_types, target_paths = _build_targets(ast)
+        manifest = cls(
+            path,
+            name=name.value if isinstance(name, Str) else "Unknown",
+            products=_build_products(ast),
+            targets=targets,
+            dependencies=_build_dependencies(ast),
+            target_types=target_types,
+            target_paths=target_paths
+        )
+        logger.info(f"Analizadas {len(manifest.dependencies)} dependencias en {path}")
+        return manifest
+
+    def to_dict(self) -> Dict:
+        return {
+            'path': self.path,
+            'name': self.name,
+            'products': self.products,
+            'targets': self.targets,
+            'target_types': self.target_types,
+            'target_paths': self.target_paths,
+            'dependencies': self.dependencies
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PackageManifest':
+        return cls(data['path'], data.get('name', "Unknown"), data.get('products'),
+                   data.get('targets'), data.get('dependencies'), data.get('target_types'),
+                   data.get('target_paths'))
+
+
+def parse_package_manifest(path: str) -> Dict:
+    """
+    Parsea un Package.swift y retorna su modelo como diccionario. Es una función de
+    nivel de módulo para poder enviarla a los procesos del pool de parseo.
+    """
+    return PackageManifest.from_file(path).to_dict()
+
+
+def _string(node) -> Optional[str]:
+    return node.value if isinstance(node, Str) else None
+
+
+def _parse_requirement(call: Call) -> Tuple[str, Optional[str]]:
+    """
+    Interpreta el requisito de versión de un .package(...).
+    Returns:
+        tuple: (forma del requisito, versión o referencia)
+    """
+    for label in ('from', 'exact', 'branch', 'revision'):
+        value = call.arg(label)
+        if isinstance(value, Str):
+            return label, value.value
+        # exact: .init(stringLiteral: "1.0.0")
+        if label == 'exact' and isinstance(value, Call) and _string(value.arg('stringLiteral')):
+            return 'custom', value.arg('stringLiteral').value
+
+    for label, value in call.args:
+        if label is not None:
+            continue
+        # "1.0.0"..<"2.0.0" o "1.0.0"..."1.2.0": se toma el límite inferior
+        if isinstance(value, Range) and _string(value.lower):
+            return 'range', value.lower.value
+        # .upToNextMajor(from: "1.0.0"), .exact("1.0.0"), .branch("main"), ...
+        if isinstance(value, Call) and value.name in ('upToNextMajor', 'upToNextMinor'):
+            version = _string(value.arg('from'))
+            if version:
+                return value.name, version
+        if isinstance(value, Call) and value.name in ('exact', 'branch', 'revision'):
+            version = _string(value.arg(None))
+            if version:
+                return value.name, version
+
+    return 'unknown', None
+
+
+def _build_dependencies(ast: ManifestAST) -> List[Dict]:
+    """Dependencias de paquetes (remotas y locales) declaradas en el manifiesto"""
+    ordered = []
+    for position, call in enumerate(ast.package_items('dependencies')):
+        if not isinstance(call, Call) or call.name != 'package':
+            continue
+
+        url = _string(call.arg('url'))
+        path = _string(call.arg('path'))
+        registry_id = _string(call.arg('id'))
+
+        if url or registry_id:
+            requirement, version = _parse_requirement(call)
+            name = url.split('/')[-1].replace('.git', '') if url else registry_id
+            dependency = {
+                'name': name,
+                'url': url or registry_id,
+                'version': version or "N/A",
+                'type': REQUIREMENT_TYPES[requirement]
+            }
+            if url and 'apple.com' in url.lower():
+                dependency['isAppleDependency'] = True
+        elif path:
+            explicit_name = _string(call.arg('name'))
+            requirement = 'local_named' if explicit_name else 'local_path'
+            dependency = {
+                'name': explicit_name or os.path.basename(path),
+                'path': path,
+                'isLocal': True
+            }
+        else:
+            continue
+
+        ordered.append((REQUIREMENT_ORDER[requirement], position, dependency))
+
+    return [dependency for _, _, dependency in sorted(ordered, key=lambda item: item[:2])]
+
+
+def _build_products(ast: ManifestAST) -> List[Dict]:
+    """Productos (.library, .executable, .plugin) y sus targets"""
+    products = []
+    for call in ast.package_items('products'):
+        if isinstance(call, Call) and call.name in PRODUCT_KINDS and _string(call.arg('name')):
+            products.append({
+                'name': call.arg('name').value,
+                'type': call.name,
+                'targets': [target for target in map(_string, ast.items(call.arg('targets'))) if target]
+            })
+    return products
+
+
+def _target_dependency_name(node) -> Optional[str]:
+    """Nombre con el que se muestra una dependencia de target"""
+    if isinstance(node, Str):
+        return node.value
+    if isinstance(node, Call):
+        name = _string(node.arg('name')) or _string(node.arg(None))
+        if node.name == 'product' and name:
+            package = _string(node.arg('package'))
+            return f"{name} ({package})" if package else name
+        if node.name in ('target', 'byName') and name:
+            return name
+    return None
+
+
+def _build_targets(ast: ManifestAST) -> Tuple[Dict[str, List[str]], Dict[str, str], Dict[str, str]]:
+    """Targets de todos los tipos con sus dependencias ordenadas, su tipo y su path: explícito"""
+    targets = {}
+    target_types = {}
+    target_paths = {}
+    for call in ast.package_items('targets'):
+        if not isinstance(call, Call) or call.name not in TARGET_KINDS:
+            continue
+        name = _string(call.arg('name'))
+        if not name:
+            continue
+        dependencies = {
+            dependency for dependency in map(_target_dependency_name, ast.items(call.arg('dependencies')))
+            if dependency
+        }
+        targets[name] = sorted(dependencies)
+        target_types[name] = call.name
+        path = _string(call.arg('path'))
+        if path:
+            target_paths[name] = path
+    return targets, target_types, target_paths
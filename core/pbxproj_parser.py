@@ -0,0 +1,288 @@
+# pbxproj_parser.py
+
+import re
+import mmap
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Un project.pbxproj es un plist ASCII de estilo antiguo (OpenStep): diccionarios
+# { clave = valor; }, arrays ( a, b, ), cadenas con o sin comillas, datos <hex> y
+# comentarios. Los patrones trabajan sobre bytes para poder recorrer directamente
+# un archivo mapeado en memoria sin copiarlo a una cadena.
+BLOCK_COMMENT = rb'/\*[^*]*\*+(?:[^/*][^*]*\*+)*/'
+TRIVIA = rb'\s*(?:(?:' + BLOCK_COMMENT + rb'|//[^\n]*)\s*)*'
+TOKEN_PATTERN = re.compile(TRIVIA + rb'''(?:
+    "((?:[^"\\]|\\.)*)"
+  | ([A-Za-z0-9_$+/:.\-]+)
+  | <([0-9A-Fa-f\s]*)>
+  | ([{}()=;,])
+)''', re.VERBOSE | re.DOTALL)
+
+# Cabecera de un objeto tal como la escribe Xcode: ID = { isa = Tipo;
+STRING = rb'(?:"((?:[^"\\]|\\.)*)"|([A-Za-z0-9_$+/:.\-]+))'
+OBJECT_HEADER_PATTERN = re.compile(
+    TRIVIA + STRING + TRIVIA + rb'=' + TRIVIA + rb'\{' + TRIVIA + rb'isa' + TRIVIA + rb'=' + TRIVIA + STRING + TRIVIA + rb';',
+    re.DOTALL
+)
+
+# Salta en C todo lo que no sea una llave (cadenas y comentarios incluidos)
+SKIP_PATTERN = re.compile(rb'(?:[^"{}/]+|"(?:[^"\\]|\\.)*"|' + BLOCK_COMMENT + rb'|//[^\n]*|/)*', re.DOTALL)
+
+ESCAPE_PATTERN = re.compile(r'\\(U[0-9A-Fa-f]{4}|[0-7]{1,3}|.)', re.DOTALL)
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'a': '\a', 'b': '\b', 'f': '\f', 'v': '\v'}
+
+# Grupos del patrón de tokens
+QUOTED, UNQUOTED, DATA, PUNCTUATION = 1, 2, 3, 4
+
+OPEN_BRACE = ord('{')
+CLOSE_BRACE = ord('}')
+
+# Objetos que intervienen en las dependencias de Swift Package Manager
+SPM_ISA = (
+    'PBXProject',
+    'PBXNativeTarget',
+    'XCRemoteSwiftPackageReference',
+    'XCLocalSwiftPackageReference',
+    'XCSwiftPackageProductDependency',
+)
+
+
+class PBXProjError(ValueError):
+    """El archivo no es un plist ASCII válido"""
+
+
+class PBXProject:
+    """
+    Tabla de objetos de un project.pbxproj indexada por ID.
+    Todos los objetos quedan indexados por su 'isa'; solo se materializan como
+    diccionarios los de los tipos solicitados, de modo que en proyectos grandes
+    las secciones irrelevantes (archivos, fases de build, configuraciones) se
+    saltan sin construirlas.
+    """
+
+    def __init__(self, path: str, archive_version: Optional[str], object_version: Optional[str],
+                 root_object: Optional[str], objects: Dict[str, Dict], isa_index: Dict[str, List[str]]):
+        self.path = path
+        self.archive_version = archive_version
+        self.object_version = object_version
+        self.root_object = root_object
+        self.objects = objects          # ID -> diccionario del objeto (solo tipos materializados)
+        self.isa_index = isa_index      # isa -> IDs en orden de aparición
+        self._attribute_indexes = {}    # (isa, clave) -> {valor: ID}
+
+    @classmethod
+    def from_file(cls, path: str, isa: Optional[Iterable[str]] = None) -> 'PBXProject':
+        """
+        Parsea un project.pbxproj recorriendo el archivo mapeado en memoria.
+        Args:
+            path (str): Ruta del project.pbxproj
+            isa (iterable): Tipos de objeto a materializar (None para todos)
+        """
+        with open(path, 'rb') as f:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Los archivos vacíos no se pueden mapear
+                raise PBXProjError(f"Archivo vacío: {path}")
+            try:
+                return cls.from_buffer(path, buffer, isa)
+            finally:
+                buffer.close()
+
+    @classmethod
+    def from_buffer(cls, path: str, buffer, isa: Optional[Iterable[str]] = None) -> 'PBXProject':
+        """Parsea el contenido de un project.pbxproj (bytes o mmap)"""
+        parser = PBXProjParser(buffer, isa)
+        header, objects, isa_index = parser.parse()
+        project = cls(path, header.get('archiveVersion'), header.get('objectVersion'),
+                      header.get('rootObject'), objects, isa_index)
+        logger.debug(f"Indexados {sum(len(ids) for ids in isa_index.values())} objetos de {path}")
+        return project
+
+    def get(self, object_id: Optional[str]) -> Optional[Dict]:
+        """Retorna el objeto con ese ID, o None si no existe o no se materializó"""
+        return self.objects.get(object_id) if object_id else None
+
+    def ids_of(self, isa: str) -> List[str]:
+        """IDs de los objetos de un tipo, en orden de aparición en el archivo"""
+        return self.isa_index.get(isa, [])
+
+    def find(self, isa: str, key: str, value: str) -> Optional[str]:
+        """
+        ID del primer objeto de un tipo cuyo atributo 'key' vale 'value'.
+        El índice de cada (isa, clave) se construye en la primera consulta.
+        """
+        index = self._attribute_indexes.get((isa, key))
+        if index is None:
+            index = {}
+            for object_id, obj in self.objects_of(isa):
+                attribute = obj.get(key)
+                if isinstance(attribute, str):
+                    index.setdefault(attribute, object_id)
+            self._attribute_indexes[(isa, key)] = index
+        return index.get(value)
+
+    def objects_of(self, isa: str) -> List[Tuple[str, Dict]]:
+        """Pares (ID, objeto) de los objetos materializados de un tipo"""
+        return [(object_id, self.objects[object_id]) for object_id in self.ids_of(isa)
+                if object_id in self.objects]
+
+
+class PBXProjParser:
+    """Parser incremental de plists ASCII: avanza token a token sobre el buffer"""
+
+    def __init__(self, buffer, isa: Optional[Iterable[str]] = None):
+        self.buffer = buffer
+        self.position = 0
+        self.wanted_isa = set(isa) if isa is not None else None
+
+    def next_token(self) -> Tuple[int, bytes]:
+        match = TOKEN_PATTERN.match(self.buffer, self.position)
+        if match is None:
+            raise PBXProjError(f"Token no válido en el byte {self.position}")
+        self.position = match.end()
+        kind = match.lastindex
+        return kind, match.group(kind)
+
+    def expect(self, punctuation: bytes):
+        kind, value = self.next_token()
+        if kind != PUNCTUATION or value != punctuation:
+            raise PBXProjError(f"Se esperaba '{punctuation.decode()}' en el byte {self.position}")
+
+    def parse(self) -> Tuple[Dict, Dict[str, Dict], Dict[str, List[str]]]:
+        """
+        Recorre el diccionario raíz. La sección 'objects' se procesa objeto a objeto.
+        Returns:
+            tuple: (claves de la raíz, tabla de objetos, índice por isa)
+        """
+        header = {}
+        objects = {}
+        isa_index = {}
+
+        self.expect(b'{')
+        while True:
+            kind, value = self.next_token()
+            if kind == PUNCTUATION and value == b'}':
+                break
+            key = self._string(kind, value)
+            self.expect(b'=')
+            if key == 'objects':
+                self._parse_objects(objects, isa_index)
+            else:
+                header[key] = self.parse_value(*self.next_token())
+            self.expect(b';')
+
+        return header, objects, isa_index
+
+    def _parse_objects(self, objects: Dict[str, Dict], isa_index: Dict[str, List[str]]):
+        self.expect(b'{')
+        match_header = OBJECT_HEADER_PATTERN.match
+        wanted_isa = self.wanted_isa
+        while True:
+            # Xcode escribe siempre 'isa' como primera clave de cada objeto: el ID y
+            # el tipo se leen con una sola coincidencia y el resto se salta o se parsea
+            header = match_header(self.buffer, self.position)
+            if header is not None:
+                self.position = header.end()
+                object_id = _decode_string(header.group(1), header.group(2))
+                isa = _decode_string(header.group(3), header.group(4))
+                if wanted_isa is None or isa in wanted_isa:
+                    obj = {'isa': isa}
+                    obj.update(self._parse_dict())
+                    objects[object_id] = obj
+                else:
+                    self._skip_braced(depth=1)
+            else:
+                kind, value = self.next_token()
+                if kind == PUNCTUATION and value == b'}':
+                    return
+                object_id = self._string(kind, value)
+                self.expect(b'=')
+                obj = self.parse_value(*self.next_token())
+                isa = obj.get('isa') if isinstance(obj, dict) else None
+                if wanted_isa is None or isa in wanted_isa:
+                    objects[object_id] = obj
+
+            isa_index.setdefault(isa, []).append(object_id)
+            self.expect(b';')
+
+    def parse_value(self, kind: int, value: bytes):
+        if kind == PUNCTUATION:
+            if value == b'{':
+                return self._parse_dict()
+            if value == b'(':
+                return self._parse_array()
+            raise PBXProjError(f"'{value.decode()}' inesperado en el byte {self.position}")
+        if kind == DATA:
+            return bytes.fromhex(value.decode('ascii'))
+        return self._string(kind, value)
+
+    def _parse_dict(self) -> Dict:
+        result = {}
+        while True:
+            kind, value = self.next_token()
+            if kind == PUNCTUATION and value == b'}':
+                return result
+            key = self._string(kind, value)
+            self.expect(b'=')
+            result[key] = self.parse_value(*self.next_token())
+            self.expect(b';')
+
+    def _parse_array(self) -> List:
+        result = []
+        while True:
+            kind, value = self.next_token()
+            if kind == PUNCTUATION and value == b')':
+                return result
+            result.append(self.parse_value(kind, value))
+            kind, value = self.next_token()
+            if kind == PUNCTUATION and value == b')':
+                return result
+            if kind != PUNCTUATION or value != b',':
+                raise PBXProjError(f"Se esperaba ',' en el byte {self.position}")
+
+    def _skip_braced(self, depth: int = 0):
+        """Salta un diccionario sin construirlo (depth: llaves ya abiertas)"""
+        buffer = self.buffer
+        while True:
+            self.position = SKIP_PATTERN.match(buffer, self.position).end()
+            if self.position >= len(buffer):
+                raise PBXProjError("Fin de archivo dentro de un objeto")
+            char = buffer[self.position]
+            self.position += 1
+            if char == OPEN_BRACE:
+                depth += 1
+            elif char == CLOSE_BRACE:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _string(self, kind: int, value: bytes) -> str:
+        if kind == UNQUOTED:
+            return _decode_string(None, value)
+        if kind == QUOTED:
+            return _decode_string(value, None)
+        raise PBXProjError(f"Se esperaba una cadena en el byte {self.position}")
+
+
+def _decode_string(quoted: Optional[bytes], unquoted: Optional[bytes]) -> str:
+    if unquoted is not None:
+        return unquoted.decode('utf-8')
+    return _unescape(quoted.decode('utf-8'))
+
+
+def _unescape(text: str) -> str:
+    if '\\' not in text:
+        return text
+    return ESCAPE_PATTERN.sub(_replace_escape, text)
+
+
+def _replace_escape(match) -> str:
+    escape = match.group(1)
+    if escape[0] == 'U' and len(escape) == 5:
+        return chr(int(escape[1:], 16))
+    if escape[0].isdigit():
+        return chr(int(escape, 8))
+    return ESCAPES.get(escape, escape)
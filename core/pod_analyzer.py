@@ -3,17 +3,35 @@
 import os
 import re
 import logging
-import requests
-import yaml
 from typing import List, Dict, Optional
+from utils.http_session import HTTPSessionPool
+from utils.project_index import ProjectIndex
+from utils.parse_cache import ParseCache
+from utils.pod_specs_index import PodSpecsIndex
+from utils.version_checker import VersionChecker
+from .podfile_lock import PodfileLock
 
 class PodfileAnalyzer:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, session_pool: Optional[HTTPSessionPool] = None,
+                 project_index: Optional[ProjectIndex] = None, parse_cache: Optional[ParseCache] = None,
+                 specs_index: Optional[PodSpecsIndex] = None, version_checker: Optional[VersionChecker] = None,
+                 trunk_deadline: float = 60):
         self.project_root = os.path.abspath(project_root)
         self.logger = self._setup_logging()
+        self.session_pool = session_pool or HTTPSessionPool()
+        # Las consultas a trunk comparten el pool de hilos, los timeouts y la caché persistente del VersionChecker
+        self._version_checker = version_checker
+        # Tiempo máximo para resolver todos los pods en trunk
+        self.trunk_deadline = trunk_deadline
+        # Índice local de specs: si está configurado, las últimas versiones se resuelven sin red
+        self.specs_index = specs_index
+        self.project_index = project_index or ProjectIndex(self.project_root)
+        self.parse_cache = parse_cache or ParseCache()
+        self._podfile_lock = None
+        self._podfile_lock_loaded = False
         self.pods = []
         self.unique_dependencies = {}
-        self.pods_versions_cache = {}
+        self.pods_versions_cache = {}  # pod -> última versión, resuelta una sola vez por ejecución
 
     def _setup_logging(self):
         """Configura el sistema de logging"""
@@ -28,77 +46,89 @@ class PodfileAnalyzer:
       self.logger.info(f"\n🔍 Buscando Podfile en: {self.project_root}")
       
       podfile_path = os.path.join(self.project_root, 'Podfile')
-      if os.path.exists(podfile_path):
+      if podfile_path in self.project_index.build().podfiles:
           self.logger.info(f"✅ Podfile encontrado en: {podfile_path}")
           return podfile_path
       
       self.logger.info("❌ No se encontró Podfile")
       return None
   
-    def get_pod_info(self, pod_name: str) -> Dict:
-        try:
-            base_pod_name = pod_name.split('/')[0]
-            api_url = f"https://trunk.cocoapods.org/api/v1/pods/{base_pod_name}"
-            
-            response = requests.get(api_url)
-            if response.status_code == 200:
-                data = response.json()
-                versions = data.get('versions', [])
-                if versions:
-                    latest_version = max(versions, key=lambda x: x.get('created_at', ''))
-                    self.logger.info(latest_version)
-                    return {
-                        'version': latest_version.get('name'),
-                        'url': 'N/A'
-                    }
-            
-            self.logger.info(f"No se encontró información para {pod_name}")
-        except Exception as e:
-            self.logger.error(f"Error obteniendo info para {pod_name}: {str(e)}")
+    @property
+    def version_checker(self) -> VersionChecker:
+        if self._version_checker is None:
+            self._version_checker = VersionChecker(session_pool=self.session_pool)
+        return self._version_checker
+
+    def get_latest_pod_versions(self, pod_names: List[str]) -> Dict[str, str]:
+        """
+        Últimas versiones de varios pods: primero el índice local de specs y, para el
+        resto, consultas concurrentes a trunk con la caché del VersionChecker.
+        Returns:
+            dict: pod -> última versión ("N/A" si no se pudo determinar)
+        """
+        pending = [name for name in dict.fromkeys(pod_names) if name not in self.pods_versions_cache]
+        
+        if self.specs_index is not None and pending:
+            for pod_name, version in self.specs_index.latest_versions(pending).items():
+                self.pods_versions_cache[pod_name] = version
+            missing = [name for name in pending if name not in self.pods_versions_cache]
+            if missing:
+                self.logger.info(f"{len(missing)} pods no están en el índice local de specs, consultando trunk")
+            pending = missing
         
-        return {'version': 'N/A', 'url': 'N/A'}
+        if pending:
+            urls = {name: self.version_checker.trunk_pod_url(name) for name in pending}
+            latest_versions = self.version_checker.get_latest_versions(urls.values(), deadline=self.trunk_deadline)
+            for name, url in urls.items():
+                self.pods_versions_cache[name] = latest_versions.get(url, 'N/A')
+        
+        return {name: self.pods_versions_cache.get(name, 'N/A') for name in pod_names}
+
+    def get_pod_info(self, pod_name: str) -> Dict:
+        return {
+            'version': self.get_latest_pod_versions([pod_name])[pod_name],
+            'url': 'N/A'
+        }
 
-    def _process_pod_dependency(self, pod_name: str, version: str = None) -> Dict:
-        pod_info = self.get_pod_info(pod_name)
+    def _process_pod_dependency(self, pod_name: str, version: str = None, latest_version: str = None) -> Dict:
+        if latest_version is None:
+            latest_version = self.get_pod_info(pod_name).get('version')
         current_version = self.get_current_pod_version(pod_name)
         return {
             'name': pod_name,
             'version': current_version,
-            'latest_version': pod_info.get('version'),
-            'url': pod_info.get('url', 'N/A')
+            'latest_version': latest_version,
+            'url': 'N/A'
         }
     
+    def get_podfile_lock(self) -> Optional[PodfileLock]:
+        """
+        Podfile.lock del proyecto o de sus padres, localizado y parseado una sola vez
+        y compartido por todas las consultas de pods.
+        """
+        if not self._podfile_lock_loaded:
+            self._podfile_lock_loaded = True
+            lock_path = self.project_index.find_podfile_lock()
+            if lock_path:
+                try:
+                    data = self.parse_cache.get_or_parse(lock_path, 'podfile_lock',
+                                                         lambda path: PodfileLock.from_file(path).to_dict())
+                    self._podfile_lock = PodfileLock.from_dict(data)
+                except Exception as e:
+                    self.logger.error(f"Error leyendo Podfile.lock: {str(e)}")
+        return self._podfile_lock
+
     def get_current_pod_version(self, pod_name: str) -> str:
         """Obtiene la versión actual de un pod desde Podfile.lock"""
-        try:
-            # Buscar Podfile.lock en el directorio del proyecto y sus padres
-            current_dir = self.project_root
-            while current_dir != '/':
-                lock_path = os.path.join(current_dir, 'Podfile.lock')
-                if os.path.exists(lock_path):
-                    with open(lock_path, 'r') as file:
-                        lock_data = yaml.safe_load(file)
-                        pods = lock_data.get('PODS', [])
-                        for pod in pods:
-                            if isinstance(pod, str):
-                                name, version = pod.split(' (')
-                                if name == pod_name:
-                                    return version.rstrip(')')
-                            elif isinstance(pod, dict):
-                                for name, deps in pod.items():
-                                    if name.split(' (')[0] == pod_name:
-                                        return name.split(' (')[1].rstrip(')')
-                    return 'N/A'
-                current_dir = os.path.dirname(current_dir)
-            return 'N/A'
-        except Exception as e:
-            self.logger.error(f"Error leyendo Podfile.lock para {pod_name}: {str(e)}")
+        podfile_lock = self.get_podfile_lock()
+        if podfile_lock is None:
             return 'N/A'
+        return podfile_lock.version(pod_name) or 'N/A'
 
     def parse_podfile(self, podfile_path: str) -> List[Dict]:
         """Analiza el Podfile para extraer las dependencias"""
         self.logger.info(f"\n📝 Analizando Podfile: {podfile_path}")
-        dependencies_dict = {}  # Usar diccionario para evitar duplicados
+        declared_pods = {}  # Usar diccionario para evitar duplicados
         
         try:
             with open(podfile_path, 'r', encoding='utf-8') as file:
@@ -113,38 +143,27 @@ class PodfileAnalyzer:
                     
                     pod_name = pod_name_match.group(1).split('/')[0]  # Obtener nombre base del pod
                     
-                    # Si ya existe este pod, comparar versiones y mantener la más reciente
-                    if pod_name in dependencies_dict:
+                    # Si ya existe este pod, se mantiene la primera declaración
+                    if pod_name in declared_pods:
                         continue
                     
                     version_match = re.search(r'[\'"]([0-9][^\'"]*)[\'"]\s*[,}]', line)
-                    version = version_match.group(1) if version_match else None
-                    
-                    dependency = self._process_pod_dependency(pod_name, version)
-                    dependencies_dict[pod_name] = dependency
-                    self.logger.info(f"📦 Procesado: {dependency}")
+                    declared_pods[pod_name] = version_match.group(1) if version_match else None
         
         except Exception as e:
             self.logger.error(f"❌ Error al analizar Podfile: {str(e)}")
         
-        return list(dependencies_dict.values())
+        # Las últimas versiones de todos los pods se resuelven en un solo lote
+        latest_versions = self.get_latest_pod_versions(list(declared_pods))
+        
+        dependencies = []
+        for pod_name, version in declared_pods.items():
+            dependency = self._process_pod_dependency(pod_name, version, latest_versions[pod_name])
+            dependencies.append(dependency)
+            self.logger.info(f"📦 Procesado: {dependency}")
+        
+        return dependencies
     
     def get_latest_pod_version(self, pod_name: str) -> str:
-        """Obtiene la última versión disponible de un pod desde cocoapods.org"""
-        try:
-            url = f"https://cocoapods.org/pods/{pod_name}"
-            self.logger.info(f"🔍 Buscando versión para {pod_name} en {url}")
-            
-            response = requests.get(url)
-            if response.status_code == 200:
-                # Buscar la versión en el contenido HTML
-                version_pattern = r'<span class="version">(.*?)</span>'
-                match = re.search(version_pattern, response.text)
-                if match:
-                    version = match.group(1)
-                    self.logger.info(f"✅ Versión encontrada: {version}")
-                    return version
-        except Exception as e:
-            self.logger.error(f"❌ Error obteniendo versión para {pod_name}: {str(e)}")
-        
-        return "N/A"
\ No newline at end of file
+        """Obtiene la última versión disponible de un pod (índice local de specs o trunk)"""
+        return self.get_latest_pod_versions([pod_name])[pod_name]
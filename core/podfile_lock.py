@@ -0,0 +1,143 @@
+# podfile_lock.py
+
+import logging
+import yaml
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cargador YAML de libyaml (en C) si está disponible; con el de Python puro un
+# Podfile.lock de miles de líneas tarda varias veces más en cargarse
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+class PodfileLock:
+    """
+    Contenido de un Podfile.lock indexado por pod: versiones instaladas (PODS),
+    checksums (SPEC CHECKSUMS), repositorio de specs de cada pod (SPEC REPOS) y
+    orígenes externos (EXTERNAL SOURCES / CHECKOUT OPTIONS).
+    Se parsea una sola vez y lo comparten todas las consultas del analizador.
+    """
+
+    def __init__(self, path: str, pods: Optional[Dict[str, str]] = None,
+                 pod_dependencies: Optional[Dict[str, List[str]]] = None,
+                 dependencies: Optional[List[str]] = None, checksums: Optional[Dict[str, str]] = None,
+                 spec_repos: Optional[Dict[str, List[str]]] = None,
+                 external_sources: Optional[Dict[str, Dict]] = None,
+                 checkout_options: Optional[Dict[str, Dict]] = None,
+                 podfile_checksum: Optional[str] = None, cocoapods_version: Optional[str] = None):
+        self.path = path
+        self.pods = pods or {}                          # pod (o subspec) -> versión instalada
+        self.pod_dependencies = pod_dependencies or {}  # pod -> dependencias declaradas en PODS
+        self.dependencies = dependencies or []          # Requisitos del Podfile (DEPENDENCIES)
+        self.checksums = checksums or {}                # pod -> checksum de la spec
+        self.spec_repos = spec_repos or {}              # repositorio -> pods
+        self.external_sources = external_sources or {}  # pod -> {':git': ..., ':path': ...}
+        self.checkout_options = checkout_options or {}  # pod -> {':commit': ..., ':git': ...}
+        self.podfile_checksum = podfile_checksum
+        self.cocoapods_version = cocoapods_version
+
+        # Índices derivados: versión por nombre base (para pods declarados solo como
+        # subspecs, p.ej. 'Firebase/Analytics') y repositorio de specs por pod
+        self._base_versions = {}
+        for name, version in self.pods.items():
+            self._base_versions.setdefault(name.split('/')[0], version)
+        self._repo_by_pod = {pod: repo for repo, pods in self.spec_repos.items() for pod in pods}
+
+    @classmethod
+    def from_file(cls, path: str) -> 'PodfileLock':
+        """Lee y parsea un Podfile.lock"""
+        with open(path, 'r', encoding='utf-8') as file:
+            data = yaml.load(file, Loader=SafeLoader) or {}
+        lock = cls.from_yaml(path, data)
+        logger.info(f"🔒 Podfile.lock: {len(lock.pods)} pods en {path}")
+        return lock
+
+    @classmethod
+    def from_yaml(cls, path: str, data: Dict) -> 'PodfileLock':
+        """Construye el modelo a partir del YAML ya cargado"""
+        pods = {}
+        pod_dependencies = {}
+        for entry in data.get('PODS') or []:
+            if isinstance(entry, dict):
+                items = entry.items()
+            elif isinstance(entry, str):
+                items = [(entry, [])]
+            else:
+                continue
+            for name, subdependencies in items:
+                pod_name, version = _split_requirement(str(name))
+                if version is None:
+                    continue
+                # Se conserva la primera aparición, como en la búsqueda lineal anterior
+                pods.setdefault(pod_name, version)
+                pod_dependencies.setdefault(pod_name, [str(dependency) for dependency in subdependencies or []])
+
+        return cls(
+            path,
+            pods=pods,
+            pod_dependencies=pod_dependencies,
+            dependencies=[str(dependency) for dependency in data.get('DEPENDENCIES') or []],
+            checksums={str(pod): str(checksum) for pod, checksum in (data.get('SPEC CHECKSUMS') or {}).items()},
+            spec_repos={str(repo): [str(pod) for pod in pods or []]
+                        for repo, pods in (data.get('SPEC REPOS') or {}).items()},
+            external_sources=_string_options(data.get('EXTERNAL SOURCES')),
+            checkout_options=_string_options(data.get('CHECKOUT OPTIONS')),
+            podfile_checksum=_optional_string(data.get('PODFILE CHECKSUM')),
+            cocoapods_version=_optional_string(data.get('COCOAPODS'))
+        )
+
+    def version(self, pod_name: str) -> Optional[str]:
+        """Versión instalada de un pod o subspec (si solo hay subspecs, la del primero)"""
+        return self.pods.get(pod_name) or self._base_versions.get(pod_name)
+
+    def checksum(self, pod_name: str) -> Optional[str]:
+        return self.checksums.get(pod_name.split('/')[0])
+
+    def spec_repo(self, pod_name: str) -> Optional[str]:
+        """Repositorio de specs del que se instaló el pod (p.ej. 'trunk')"""
+        return self._repo_by_pod.get(pod_name.split('/')[0])
+
+    def external_source(self, pod_name: str) -> Optional[Dict]:
+        """Origen externo del pod (:git, :path, :podspec), si no viene de un repositorio de specs"""
+        return self.external_sources.get(pod_name.split('/')[0])
+
+    def to_dict(self) -> Dict:
+        return {
+            'path': self.path,
+            'pods': self.pods,
+            'pod_dependencies': self.pod_dependencies,
+            'dependencies': self.dependencies,
+            'checksums': self.checksums,
+            'spec_repos': self.spec_repos,
+            'external_sources': self.external_sources,
+            'checkout_options': self.checkout_options,
+            'podfile_checksum': self.podfile_checksum,
+            'cocoapods_version': self.cocoapods_version
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PodfileLock':
+        return cls(**data)
+
+
+def _split_requirement(entry: str):
+    """'Nombre (1.2.3)' -> ('Nombre', '1.2.3'); sin versión -> ('Nombre', None)"""
+    if ' (' not in entry:
+        return entry, None
+    name, version = entry.split(' (', 1)
+    return name, version.rstrip(')')
+
+
+def _optional_string(value) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def _string_options(section) -> Dict[str, Dict]:
+    """Normaliza EXTERNAL SOURCES / CHECKOUT OPTIONS a {pod: {opción: valor}} con cadenas"""
+    if not isinstance(section, dict):
+        return {}
+    return {
+        str(pod): {str(key): str(value) for key, value in options.items()}
+        for pod, options in section.items() if isinstance(options, dict)
+    }
@@ -0,0 +1,470 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Lexer del subconjunto de Swift que aparece en un Package.swift: cadenas (simples
+# y multilínea), números, identificadores, operadores y comentarios. Un único
+# patrón compilado recorre el texto de principio a fin sin retroceder; los
+# espacios y comentarios de línea se consumen en la misma coincidencia que el
+# token siguiente.
+TRIVIA = r'(?:\s|//[^\n]*(?![^\n]))*'
+TRIVIA_PATTERN = re.compile(TRIVIA)
+TOKEN_PATTERN = re.compile(TRIVIA + r'''
+    (?:
+        (?P<block_comment>/\*)
+      | (?P<mstring>"""(?:[^\\]|\\.)*?""")
+      | (?P<string>"(?:[^"\\\n]|\\.)*")
+      | (?P<number>\d[\d_]*(?:\.\d[\d_]*)?)
+      | (?P<ident>[A-Za-z_][A-Za-z0-9_]*|`[^`\n]+`)
+      | (?P<op>\.\.<|\.\.\.|\+=|==|!=|&&|\|\||->|\?\?|[()\[\]{},:.=+\-*/<>!?&|#@;])
+    )
+''', re.VERBOSE)
+
+BLOCK_COMMENT_DELIMITER = re.compile(r'/\*|\*/')
+ESCAPE_PATTERN = re.compile(r'\\(.)')
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0'}
+
+BINARY_OPERATORS = {'+', '-', '*', '/', '==', '!=', '&&', '||', '<', '>', '??'}
+RANGE_OPERATORS = {'..<', '...'}
+
+
+class Token:
+    __slots__ = ('kind', 'value')
+
+    def __init__(self, kind: str, value: str):
+        self.kind = kind
+        self.value = value
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.value!r})"
+
+
+EOF_TOKEN = Token('eof', '')
+
+
+def tokenize(source: str) -> List[Token]:
+    """Convierte el manifiesto en una lista de tokens (sin espacios ni comentarios)"""
+    tokens = []
+    position = 0
+    length = len(source)
+    match_token = TOKEN_PATTERN.match
+
+    while position < length:
+        match = match_token(source, position)
+        if match is None:
+            # Carácter fuera del subconjunto soportado (p.ej. '$' o '\'): se ignora
+            position = TRIVIA_PATTERN.match(source, position).end() + 1
+            continue
+
+        kind = match.lastgroup
+        position = match.end()
+
+        if kind == 'block_comment':
+            position = _skip_block_comment(source, position)
+            continue
+        if kind == 'string':
+            tokens.append(Token('string', _unescape(match.group(kind)[1:-1])))
+        elif kind == 'mstring':
+            tokens.append(Token('string', _unescape(match.group(kind)[3:-3])))
+        elif kind == 'ident':
+            tokens.append(Token('ident', match.group(kind).strip('`')))
+        else:
+            tokens.append(Token(kind, match.group(kind)))
+
+    return tokens
+
+
+def _skip_block_comment(source: str, position: int) -> int:
+    """Salta un comentario /* ... */ (Swift admite comentarios anidados)"""
+    depth = 1
+    for delimiter in BLOCK_COMMENT_DELIMITER.finditer(source, position):
+        depth += 1 if delimiter.group() == '/*' else -1
+        if depth == 0:
+            return delimiter.end()
+    return len(source)
+
+
+def _unescape(text: str) -> str:
+    if '\\' not in text:
+        return text
+    return ESCAPE_PATTERN.sub(lambda m: ESCAPES.get(m.group(1), m.group(1)), text)
+
+
+# Nodos del AST
+
+class Node:
+    __slots__ = ()
+
+
+class Str(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Num(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Ident(Node):
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class ImplicitMember(Node):
+    """Miembro implícito, p.ej. '.target' o '.iOS'"""
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class Member(Node):
+    __slots__ = ('base', 'name')
+
+    def __init__(self, base, name):
+        self.base = base
+        self.name = name
+
+
+class Call(Node):
+    """Llamada con argumentos etiquetados: args es una lista de (etiqueta o None, valor)"""
+    __slots__ = ('callee', 'args')
+
+    def __init__(self, callee, args):
+        self.callee = callee
+        self.args = args
+
+    @property
+    def name(self) -> Optional[str]:
+        return callee_name(self.callee)
+
+    def arg(self, label: Optional[str]) -> Optional[Node]:
+        """Primer argumento con la etiqueta indicada (None para el primero sin etiqueta)"""
+        for arg_label, value in self.args:
+            if arg_label == label:
+                return value
+        return None
+
+
+class Array(Node):
+    __slots__ = ('items',)
+
+    def __init__(self, items):
+        self.items = items
+
+
+class Range(Node):
+    __slots__ = ('lower', 'operator', 'upper')
+
+    def __init__(self, lower, operator, upper):
+        self.lower = lower
+        self.operator = operator
+        self.upper = upper
+
+
+class Binary(Node):
+    __slots__ = ('left', 'operator', 'right')
+
+    def __init__(self, left, operator, right):
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+
+class Unknown(Node):
+    """Construcción no soportada (closures, diccionarios, ...)"""
+    __slots__ = ()
+
+
+def callee_name(node: Node) -> Optional[str]:
+    if isinstance(node, (Ident, ImplicitMember, Member)):
+        return node.name
+    return None
+
+
+class ManifestAST:
+    """
+    Resultado del parseo: la llamada Package(...) y las modificaciones posteriores
+    de sus propiedades (package.dependencies += [...], .append(...), ...).
+    """
+
+    def __init__(self, package: Optional[Call], bindings: Dict[str, Node], assignments: List[Tuple[Node, str, Node]]):
+        self.package = package
+        self.bindings = bindings
+        self.assignments = assignments
+
+    def resolve(self, node: Optional[Node], _depth: int = 0) -> Optional[Node]:
+        """Sustituye referencias a constantes (let deps = [...]) por su valor"""
+        while isinstance(node, Ident) and node.name in self.bindings and _depth < 32:
+            node = self.bindings[node.name]
+            _depth += 1
+        return node
+
+    def items(self, node: Optional[Node], _depth: int = 0) -> List[Node]:
+        """Elementos de un array, resolviendo constantes y concatenaciones (a + b)"""
+        node = self.resolve(node)
+        if _depth > 32:
+            return []
+        if isinstance(node, Array):
+            return [self.resolve(item) for item in node.items]
+        if isinstance(node, Binary) and node.operator == '+':
+            return self.items(node.left, _depth + 1) + self.items(node.right, _depth + 1)
+        return []
+
+    def package_items(self, label: str) -> List[Node]:
+        """
+        Elementos de una propiedad de Package (dependencies, targets, products),
+        incluyendo los añadidos después de su declaración.
+        """
+        if self.package is None:
+            return []
+        items = self.items(self.package.arg(label))
+
+        for target, operator, value in self.assignments:
+            if not (isinstance(target, Member) and target.name == label and self._is_package(target.base)):
+                continue
+            if operator == '=':
+                items = self.items(value)
+            elif operator == '+=':
+                items = items + self.items(value)
+            elif operator == 'append':
+                items = items + [self.resolve(value)]
+            elif operator == 'append(contentsOf:)':
+                items = items + self.items(value)
+        return items
+
+    def _is_package(self, node: Node) -> bool:
+        return self.resolve(node) is self.package
+
+
+class ManifestParser:
+    """Parser descendente recursivo sobre los tokens del manifiesto"""
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self, offset: int = 0) -> Token:
+        try:
+            return self.tokens[self.position + offset]
+        except IndexError:
+            return EOF_TOKEN
+
+    def advance(self) -> Token:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def at(self, kind: str, value: Optional[str] = None, offset: int = 0) -> bool:
+        try:
+            token = self.tokens[self.position + offset]
+        except IndexError:
+            return kind == 'eof'
+        return token.kind == kind and (value is None or token.value == value)
+
+    def accept(self, kind: str, value: Optional[str] = None) -> bool:
+        try:
+            token = self.tokens[self.position]
+        except IndexError:
+            return False
+        if token.kind == kind and (value is None or token.value == value):
+            self.position += 1
+            return True
+        return False
+
+    def parse(self) -> ManifestAST:
+        """Recorre las sentencias de nivel superior"""
+        package = None
+        bindings = {}
+        assignments = []
+
+        while not self.at('eof'):
+            start = self.position
+            token = self.peek()
+
+            if token.kind == 'ident' and token.value == 'import':
+                self.advance()
+                self.advance()
+            elif token.kind == 'ident' and token.value in ('let', 'var'):
+                self.advance()
+                if self.at('ident'):
+                    name = self.advance().value
+                    self._skip_type_annotation()
+                    if self.accept('op', '='):
+                        value = self.parse_expression()
+                        bindings[name] = value
+                        if package is None and isinstance(value, Call) and value.name == 'Package':
+                            package = value
+            else:
+                expression = self.parse_expression()
+                if self.at('op', '+=') or self.at('op', '='):
+                    operator = self.advance().value
+                    assignments.append((expression, operator, self.parse_expression()))
+                elif isinstance(expression, Call):
+                    if package is None and expression.name == 'Package':
+                        package = expression
+                    self._record_append(expression, assignments)
+
+            if self.position == start:
+                self.advance()
+
+        return ManifestAST(package, bindings, assignments)
+
+    def _record_append(self, call: Call, assignments: list):
+        """Registra package.<propiedad>.append(...) como una modificación de la propiedad"""
+        if call.name != 'append' or not isinstance(call.callee, Member) or not call.args:
+            return
+        label, value = call.args[0]
+        operator = 'append(contentsOf:)' if label == 'contentsOf' else 'append'
+        assignments.append((call.callee.base, operator, value))
+
+    def _skip_type_annotation(self):
+        """Salta ': Tipo' en una declaración (los tipos pueden contener corchetes y genéricos)"""
+        if not self.accept('op', ':'):
+            return
+        depth = 0
+        while not self.at('eof'):
+            token = self.peek()
+            if token.kind == 'op' and token.value in ('[', '(', '<'):
+                depth += 1
+            elif token.kind == 'op' and token.value in (']', ')', '>'):
+                depth -= 1
+            elif depth <= 0 and token.kind == 'op' and token.value == '=':
+                return
+            elif depth <= 0 and token.kind == 'ident' and token.value in ('let', 'var', 'import', 'func'):
+                return
+            self.advance()
+
+    def parse_expression(self) -> Node:
+        left = self.parse_postfix()
+        while True:
+            token = self.peek()
+            if token.kind != 'op':
+                break
+            operator = token.value
+            if operator in RANGE_OPERATORS:
+                self.advance()
+                # Rangos abiertos ("1.0.0"...) no tienen límite superior
+                upper = None if self._at_expression_end() else self.parse_postfix()
+                left = Range(left, operator, upper)
+            elif operator in BINARY_OPERATORS:
+                self.advance()
+                left = Binary(left, operator, self.parse_postfix())
+            else:
+                break
+        return left
+
+    def _at_expression_end(self) -> bool:
+        token = self.peek()
+        return token.kind == 'eof' or (token.kind == 'op' and token.value in (',', ')', ']', '}'))
+
+    def parse_postfix(self) -> Node:
+        node = self.parse_primary()
+        while True:
+            token = self.peek()
+            if token.kind != 'op':
+                break
+            if token.value == '(':
+                self.advance()
+                node = Call(node, self.parse_arguments(')'))
+                # Closure final: foo(...) { ... }
+                if self.at('op', '{'):
+                    self._skip_balanced('{', '}')
+            elif token.value == '.' and self.at('ident', offset=1):
+                self.advance()
+                node = Member(node, self.advance().value)
+            elif token.value in ('?', '!') and self.at('op', '.', offset=1):
+                # Encadenamiento opcional / desempaquetado forzado
+                self.advance()
+            else:
+                break
+        return node
+
+    def parse_primary(self) -> Node:
+        token = self.peek()
+
+        if token.kind == 'string':
+            self.advance()
+            return Str(token.value)
+        if token.kind == 'number':
+            self.advance()
+            return Num(token.value)
+        if token.kind == 'ident':
+            self.advance()
+            return Ident(token.value)
+        if token.kind == 'op':
+            if token.value == '.' and self.at('ident', offset=1):
+                self.advance()
+                return ImplicitMember(self.advance().value)
+            if token.value == '[':
+                self.advance()
+                return self._parse_array()
+            if token.value == '(':
+                self.advance()
+                args = self.parse_arguments(')')
+                return args[0][1] if len(args) == 1 and args[0][0] is None else Unknown()
+            if token.value == '{':
+                self._skip_balanced('{', '}')
+                return Unknown()
+            if token.value == '#':
+                # Directivas (#if, #else, #endif): se analizan ambas ramas
+                self.advance()
+                if self.at('ident'):
+                    self.advance()
+                return Unknown()
+        return Unknown()
+
+    def _parse_array(self) -> Node:
+        """Array literal; los diccionarios ([clave: valor]) no se modelan"""
+        items = []
+        is_dictionary = False
+        while not self.at('eof') and not self.accept('op', ']'):
+            start = self.position
+            item = self.parse_expression()
+            if self.accept('op', ':'):
+                is_dictionary = True
+                self.parse_expression()
+            else:
+                items.append(item)
+            self.accept('op', ',')
+            if self.position == start:
+                self.advance()
+        return Unknown() if is_dictionary else Array(items)
+
+    def parse_arguments(self, closing: str) -> List[Tuple[Optional[str], Node]]:
+        """Argumentos de una llamada: [etiqueta:] expresión, separados por comas"""
+        args = []
+        while not self.at('eof') and not self.accept('op', closing):
+            start = self.position
+            label = None
+            if self.at('ident') and self.at('op', ':', offset=1):
+                label = self.advance().value
+                self.advance()
+            args.append((label, self.parse_expression()))
+            self.accept('op', ',')
+            if self.position == start:
+                self.advance()
+        return args
+
+    def _skip_balanced(self, opening: str, closing: str):
+        """Salta un bloque delimitado (p.ej. el cuerpo de una closure)"""
+        depth = 0
+        while not self.at('eof'):
+            token = self.advance()
+            if token.kind == 'op' and token.value == opening:
+                depth += 1
+            elif token.kind == 'op' and token.value == closing:
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def parse_manifest(source: str) -> ManifestAST:
+    """Tokeniza y parsea un Package.swift en tiempo lineal"""
+    return ManifestParser(tokenize(source)).parse()
@@ -146,22 +146,31 @@ def _add_separator(root, stats_id, y_offset, width, is_section=False):
     
     return y_offset + y_offset_increment
 
-def add_spm_dependencies_section(root, stats_id, y_offset, unique_dependencies, version_checker):
-    """Añade la sección de dependencias SPM"""
+def add_spm_dependencies_section(root, stats_id, y_offset, unique_dependencies, version_checker, latest_versions=None):
+    """
+    Añade la sección de dependencias SPM.
+    Si no se reciben las últimas versiones ya resueltas (URL -> versión), se
+    resuelven todas juntas en un único lote antes de generar las celdas.
+    """
     width = 380
     
+    if latest_versions is None:
+        latest_versions = version_checker.get_latest_versions(dep['url'] for dep in unique_dependencies.values())
+    
     # Listar dependencias SPM
     for i, dep in enumerate(sorted(unique_dependencies.values(), key=lambda x: x['name'].lower())):
         if i > 0:
             y_offset = _add_separator(root, stats_id, y_offset, width)
         
-        y_offset = add_spm_dependency_info(root, stats_id, dep, version_checker, y_offset, width)
+        y_offset = add_spm_dependency_info(root, stats_id, dep, version_checker, y_offset, width,
+                                           latest_version=latest_versions.get(dep['url']))
     
     return y_offset
 
-def add_spm_dependency_info(root, stats_id, dep, version_checker, y_offset, width):
+def add_spm_dependency_info(root, stats_id, dep, version_checker, y_offset, width, latest_version=None):
     """Añade la información de una dependencia SPM específica"""
-    latest_version = version_checker.get_latest_version(dep['url'])
+    if latest_version is None:
+        latest_version = version_checker.get_latest_version(dep['url'])
     status = version_checker._get_version_status(dep['version'], latest_version, dep['url'])
     
     dep_cell = ET.SubElement(root, 'mxCell')
@@ -305,4 +314,108 @@ def add_conflicts_section(root, y_position, x_position, conflicts, parent):
         item_geo.set('height', '40')
         item_geo.set('as', 'geometry')
         
-        y_offset += 40
\ No newline at end of file
+        y_offset += 40
+def write_module_pages(writer, packages_data):
+    """
+    Escribe una página por paquete SPM con sus targets y dependencias.
+    Args:
+        writer (MXFileWriter): Escritor del mxfile, con el archivo ya abierto
+        packages_data (dict): ruta del Package.swift -> (nombre del paquete, {target: dependencias})
+    """
+    ITEMS_PER_ROW = 4
+    ITEM_WIDTH = 280
+    CONTAINER_PADDING = 40
+    BASE_HEIGHT = 60
+    DEP_HEIGHT = 20
+    PADDING = 40
+    
+    def calculate_target_height(dependencies):
+        if not dependencies:
+            return BASE_HEIGHT
+        return BASE_HEIGHT + (len(dependencies) * DEP_HEIGHT) + 20
+    
+    for idx, (package_name, targets) in enumerate(packages_data.values()):
+        if not targets:
+            total_width = ITEM_WIDTH + PADDING
+            total_height = 200  # Altura mínima para contenedor vacío
+        else:
+            max_target_height = max(calculate_target_height(deps) for deps in targets.values())
+            row_height = max_target_height + PADDING
+            num_targets = len(targets)
+            num_rows = (num_targets + ITEMS_PER_ROW - 1) // ITEMS_PER_ROW
+            total_width = min(num_targets, ITEMS_PER_ROW) * (ITEM_WIDTH + PADDING)
+            total_height = 100 + (num_rows * row_height)
+        
+        # Ajustar dimensiones para el contenedor principal
+        container_width = total_width + (2 * CONTAINER_PADDING) + 40  # Margen derecho adicional
+        container_height = total_height + (2 * CONTAINER_PADDING)
+        
+        writer.start_diagram(
+            f'module-{idx}', package_name,
+            pageWidth=max(850, container_width + 200),
+            pageHeight=max(1100, container_height + 200)
+        )
+        writer.cell({'id': '0'})
+        writer.cell({'id': '1', 'parent': '0'})
+        
+        writer.cell({
+            'id': f'title_{idx}',
+            'value': package_name,
+            'style': 'text;html=1;strokeColor=none;fillColor=none;align=center;verticalAlign=middle;whiteSpace=wrap;rounded=0;fontSize=24;fontStyle=1',
+            'vertex': '1',
+            'parent': '1'
+        }, geometry={'x': (container_width - 200) / 2 + CONTAINER_PADDING, 'y': 20, 'width': 200, 'height': 40})
+        
+        container_id = f'module_container_{idx}'
+        writer.cell({
+            'id': container_id,
+            'value': f'Módulo: {package_name}',
+            'style': 'swimlane;fontStyle=1;childLayout=stackLayout;horizontal=1;startSize=30;horizontalStack=0;resizeParent=1;resizeParentMax=0;resizeLast=0;collapsible=1;marginBottom=0;fillColor=#f5f5f5;strokeColor=#666666;',
+            'vertex': '1',
+            'parent': '1'
+        }, geometry={'x': CONTAINER_PADDING, 'y': 80,
+                     'width': container_width - 2 * CONTAINER_PADDING + 40, 'height': container_height - 80})
+        
+        if targets:
+            for i, (target_name, dependencies) in enumerate(targets.items()):
+                row = i // ITEMS_PER_ROW
+                col = i % ITEMS_PER_ROW
+                target_id = f'target_{idx}_{i}'
+                
+                # Contenedor del target
+                writer.cell({
+                    'id': target_id,
+                    'value': '',
+                    'style': 'swimlane;fontStyle=1;childLayout=stackLayout;horizontal=1;startSize=30;horizontalStack=0;resizeParent=1;resizeParentMax=0;resizeLast=0;collapsible=1;marginBottom=0;fillColor=#dae8fc;strokeColor=#6c8ebf;',
+                    'vertex': '1',
+                    'parent': container_id
+                }, geometry={'x': 40 + (col * (ITEM_WIDTH + PADDING)), 'y': 40 + (row * row_height),
+                             'width': ITEM_WIDTH, 'height': calculate_target_height(dependencies)})
+                
+                writer.cell({
+                    'id': f'{target_id}_name',
+                    'value': target_name,
+                    'style': 'text;strokeColor=none;fillColor=none;align=center;verticalAlign=middle;spacingLeft=4;spacingRight=4;overflow=hidden;points=[[0,0.5],[1,0.5]];portConstraint=eastwest;rotatable=0;fontStyle=1',
+                    'vertex': '1',
+                    'parent': target_id
+                }, geometry={'y': 0, 'width': ITEM_WIDTH, 'height': 30})
+                
+                for j, dep in enumerate(dependencies or []):
+                    writer.cell({
+                        'id': f'{target_id}_dep_{j}',
+                        'value': f'• {dep}',
+                        'style': 'text;strokeColor=none;fillColor=none;align=left;verticalAlign=middle;spacingLeft=12;spacingRight=4;overflow=hidden;points=[[0,0.5],[1,0.5]];portConstraint=eastwest;rotatable=0;',
+                        'vertex': '1',
+                        'parent': target_id
+                    }, geometry={'y': 30 + j * DEP_HEIGHT, 'width': ITEM_WIDTH, 'height': DEP_HEIGHT})
+        else:
+            # Mensaje cuando no hay targets
+            writer.cell({
+                'id': f'no_targets_{idx}',
+                'value': 'No hay targets definidos',
+                'style': 'text;html=1;strokeColor=none;fillColor=none;align=center;verticalAlign=middle;whiteSpace=wrap;rounded=0;fontSize=12;fontStyle=2;textColor=#666666;',
+                'vertex': '1',
+                'parent': container_id
+            }, geometry={'x': (container_width - 200) / 2, 'y': 60, 'width': 200, 'height': 30})
+        
+        writer.end_diagram()
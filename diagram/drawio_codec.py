@@ -0,0 +1,115 @@
+# Compresión de páginas de draw.io.
+#
+# draw.io guarda cada <diagram> comprimido como base64(deflate(encodeURIComponent(xml)))
+# con deflate "raw" (sin cabecera zlib). Este módulo comprime y descomprime ese
+# formato y permite volcar un archivo comprimido a XML legible para compararlo:
+#
+#   python3 -m diagram.drawio_codec results/diagrama.xml -o diagrama_legible.xml
+
+import sys
+import zlib
+import base64
+import argparse
+import xml.etree.ElementTree as ET
+from urllib.parse import quote, unquote
+
+# Caracteres que encodeURIComponent deja sin codificar (además de letras, dígitos y _.-~)
+URI_SAFE = "!*'()"
+
+# Ventana de deflate sin cabecera ni checksum, como la de pako.deflateRaw en draw.io
+RAW_DEFLATE_WBITS = -15
+
+
+class DeflateStream:
+    """
+    Flujo de texto que codifica y comprime lo que se escribe en él.
+    Solo se mantiene en memoria la salida comprimida, no el XML de la página.
+    """
+
+    def __init__(self, level=9):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, RAW_DEFLATE_WBITS)
+        self._chunks = []
+
+    def write(self, text):
+        data = self._compressor.compress(quote(text, safe=URI_SAFE).encode('ascii'))
+        if data:
+            self._chunks.append(data)
+
+    def finish(self):
+        """Cierra el flujo y retorna la página comprimida en base64"""
+        self._chunks.append(self._compressor.flush())
+        return base64.b64encode(b''.join(self._chunks)).decode('ascii')
+
+
+def compress_diagram(xml):
+    """Comprime el XML de un mxGraphModel al formato de <diagram> de draw.io"""
+    stream = DeflateStream()
+    stream.write(xml)
+    return stream.finish()
+
+
+def decompress_diagram(payload):
+    """Retorna el XML del mxGraphModel de una página comprimida"""
+    data = base64.b64decode(payload.strip())
+    xml = zlib.decompressobj(RAW_DEFLATE_WBITS).decompress(data)
+    return unquote(xml.decode('ascii'))
+
+
+def is_compressed(diagram):
+    """True si el elemento <diagram> guarda su contenido comprimido en el texto"""
+    return len(diagram) == 0 and bool(diagram.text and diagram.text.strip())
+
+
+def read_mxfile(path):
+    """
+    Lee un archivo de draw.io y retorna su raíz con todas las páginas
+    descomprimidas (cada <diagram> contiene su mxGraphModel como hijo).
+    """
+    mxfile = ET.parse(path).getroot()
+    for diagram in mxfile.iter('diagram'):
+        if is_compressed(diagram):
+            diagram.append(ET.fromstring(decompress_diagram(diagram.text)))
+            diagram.text = None
+    return mxfile
+
+
+def decompress_file(source, stream, indent='  '):
+    """
+    Escribe una copia sin comprimir de un archivo de draw.io.
+    Args:
+        source (str): Archivo con páginas comprimidas
+        stream: Archivo de texto de salida
+        indent (str): Indentación por nivel; None o '' para una salida compacta
+    Returns:
+        int: Celdas escritas
+    """
+    # Importación local: mxfile_writer usa DeflateStream de este módulo
+    from .mxfile_writer import MXFileWriter
+
+    mxfile = read_mxfile(source)
+    writer = MXFileWriter(stream, indent=indent)
+    writer.start_file(**mxfile.attrib)
+    for diagram in mxfile:
+        writer.element(diagram)
+    writer.end_file()
+    return writer.cells_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Descomprime las páginas de un archivo de draw.io')
+    parser.add_argument('source', help='Archivo .drawio/.xml con páginas comprimidas')
+    parser.add_argument('--output', '-o', help='Archivo de salida (por defecto, la salida estándar)')
+    parser.add_argument('--indent', type=int, default=2, help='Espacios de indentación (0 para compacto)')
+    args = parser.parse_args()
+
+    indent = ' ' * args.indent
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            cells = decompress_file(args.source, f, indent)
+        print(f"✅ {cells} celdas escritas en {args.output}")
+    else:
+        decompress_file(args.source, sys.stdout, indent)
+
+
+if __name__ == '__main__':
+    main()
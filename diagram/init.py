@@ -2,5 +2,8 @@ from .components import (
     add_version_legend,
     add_statistics,
     add_conflicts_section,
-    add_dependency_connections
-)
\ No newline at end of file
+    add_dependency_connections,
+    write_module_pages
+)
+from .mxfile_writer import MXFileWriter
+from .drawio_codec import compress_diagram, decompress_diagram, read_mxfile
\ No newline at end of file
@@ -0,0 +1,343 @@
+# Layout por capas (estilo Sugiyama) para grafos de dependencias entre módulos.
+#
+# Fases:
+#   1. Ruptura de ciclos: las aristas de retorno de un DFS se invierten.
+#   2. Capas por camino más largo desde las raíces (dependientes arriba,
+#      dependencias abajo); las aristas que saltan varias capas se parten con
+#      nodos ficticios, uno por capa intermedia.
+#   3. Orden dentro de cada capa por baricentros, con barridos alternos hacia
+#      abajo y hacia arriba; se conserva el orden con menos cruces.
+#   4. Coordenadas: cada nodo se acerca al baricentro de sus vecinos respetando
+#      el orden y la separación mínima.
+# Los nodos ficticios dan los puntos de paso de cada arista, de modo que draw.io
+# dibuja las conexiones sin tener que enrutarlas al abrir el archivo.
+#
+# Todas las fases son lineales en nodos + aristas (más los nodos ficticios),
+# salvo la ordenación de cada capa y el conteo de cruces, que son O(E log V).
+
+
+class LayeredLayout:
+    """
+    Calcula posiciones de nodos y puntos de paso de aristas para un grafo
+    dirigido (origen -> destino, p.ej. módulo -> dependencia).
+    """
+
+    def __init__(self, node_width=240, node_height=180, layer_spacing=120, node_spacing=80, sweeps=12):
+        """
+        Args:
+            node_width (int): Ancho por defecto de los nodos
+            node_height (int): Alto por defecto de los nodos
+            layer_spacing (int): Separación vertical entre capas
+            node_spacing (int): Separación horizontal mínima entre nodos de una capa
+            sweeps (int): Máximo de pares de barridos de reducción de cruces
+        """
+        self.node_width = node_width
+        self.node_height = node_height
+        self.layer_spacing = layer_spacing
+        self.node_spacing = node_spacing
+        self.sweeps = sweeps
+
+    def layout(self, nodes, edges, sizes=None):
+        """
+        Args:
+            nodes (list): Identificadores de los nodos (el orden se usa como orden inicial)
+            edges (list): Pares (origen, destino); se ignoran bucles y duplicados
+            sizes (dict): Tamaños (ancho, alto) de nodos concretos
+        Returns:
+            dict: {
+                'positions': {nodo: (x, y)} esquina superior izquierda,
+                'edges': {(origen, destino): [(x, y), ...]} puntos de paso,
+                'reversed': aristas dibujadas contra el sentido de las capas (ciclos),
+                'layers': número de capas,
+                'crossings': cruces de aristas tras la ordenación,
+                'width', 'height': tamaño total
+            }
+        """
+        sizes = sizes or {}
+        index = {node: i for i, node in enumerate(nodes)}
+        count = len(nodes)
+        widths = [sizes.get(node, (self.node_width, self.node_height))[0] for node in nodes]
+        heights = [sizes.get(node, (self.node_width, self.node_height))[1] for node in nodes]
+
+        # Aristas únicas entre nodos conocidos
+        edge_list = []
+        seen = set()
+        for source, target in edges:
+            if source == target or source not in index or target not in index:
+                continue
+            key = (index[source], index[target])
+            if key not in seen:
+                seen.add(key)
+                edge_list.append(key)
+
+        reversed_edges = self._break_cycles(count, edge_list)
+        acyclic = [(v, u) if (u, v) in reversed_edges else (u, v) for u, v in edge_list]
+        layer = self._assign_layers(count, acyclic)
+
+        # Nodos ficticios: cada arista larga se convierte en una cadena de aristas de una capa
+        successors = [[] for _ in range(count)]
+        predecessors = [[] for _ in range(count)]
+        chains = {}
+        for u, v in acyclic:
+            chain = [u]
+            for level in range(layer[u] + 1, layer[v]):
+                dummy = len(layer)
+                layer.append(level)
+                widths.append(0)
+                heights.append(0)
+                successors.append([])
+                predecessors.append([])
+                chain.append(dummy)
+            chain.append(v)
+            for a, b in zip(chain, chain[1:]):
+                successors[a].append(b)
+                predecessors[b].append(a)
+            chains[(u, v)] = chain
+
+        layers = [[] for _ in range(max(layer) + 1 if layer else 0)]
+        for node in self._initial_order(count, successors, layer):
+            layers[layer[node]].append(node)
+
+        crossings = self._order_layers(layers, successors, predecessors)
+        centers, layer_tops, layer_heights = self._assign_coordinates(layers, successors, predecessors, widths, heights)
+
+        positions = {
+            node: (centers[i] - widths[i] / 2, layer_tops[layer[i]])
+            for i, node in enumerate(nodes)
+        }
+
+        # Puntos de paso: al cruzar una capa la arista baja en vertical por el hueco
+        # de su nodo ficticio, sin atravesar los nodos vecinos
+        edge_points = {}
+        for u, v in edge_list:
+            is_reversed = (u, v) in reversed_edges
+            chain = chains[(v, u) if is_reversed else (u, v)]
+            points = []
+            for dummy in chain[1:-1]:
+                top = layer_tops[layer[dummy]]
+                points.append((centers[dummy], top))
+                points.append((centers[dummy], top + layer_heights[layer[dummy]]))
+            if is_reversed:
+                points.reverse()
+            edge_points[(nodes[u], nodes[v])] = points
+
+        width = max((centers[i] + widths[i] / 2 for i in range(len(centers))), default=0)
+        height = layer_tops[-1] + layer_heights[-1] if layers else 0
+        return {
+            'positions': positions,
+            'edges': edge_points,
+            'reversed': {(nodes[u], nodes[v]) for u, v in reversed_edges},
+            'layers': len(layers),
+            'crossings': crossings,
+            'width': width,
+            'height': height
+        }
+
+    # Fase 1
+
+    def _break_cycles(self, count, edges):
+        """Aristas de retorno de un DFS iterativo: invertirlas deja el grafo acíclico"""
+        adjacency = [[] for _ in range(count)]
+        for u, v in edges:
+            adjacency[u].append(v)
+
+        WHITE, GRAY, BLACK = 0, 1, 2
+        state = [WHITE] * count
+        reversed_edges = set()
+        for root in range(count):
+            if state[root] != WHITE:
+                continue
+            state[root] = GRAY
+            stack = [(root, iter(adjacency[root]))]
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    if state[child] == WHITE:
+                        state[child] = GRAY
+                        stack.append((child, iter(adjacency[child])))
+                        break
+                    if state[child] == GRAY:
+                        reversed_edges.add((node, child))
+                else:
+                    state[node] = BLACK
+                    stack.pop()
+        return reversed_edges
+
+    # Fase 2
+
+    def _assign_layers(self, count, edges):
+        """Capa de cada nodo = camino más largo desde una raíz (orden topológico de Kahn)"""
+        adjacency = [[] for _ in range(count)]
+        in_degree = [0] * count
+        for u, v in edges:
+            adjacency[u].append(v)
+            in_degree[v] += 1
+
+        layer = [0] * count
+        queue = [node for node in range(count) if in_degree[node] == 0]
+        for node in queue:
+            for child in adjacency[node]:
+                if layer[node] + 1 > layer[child]:
+                    layer[child] = layer[node] + 1
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    queue.append(child)
+        return layer
+
+    def _initial_order(self, count, successors, layer):
+        """Orden de un DFS desde las raíces: los nodos emparentados empiezan juntos"""
+        visited = [False] * len(layer)
+        has_predecessor = [False] * len(layer)
+        for children in successors:
+            for child in children:
+                has_predecessor[child] = True
+
+        order = []
+        roots = [node for node in range(count) if not has_predecessor[node]]
+        for root in roots + list(range(count)):
+            if visited[root]:
+                continue
+            visited[root] = True
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                order.append(node)
+                for child in reversed(successors[node]):
+                    if not visited[child]:
+                        visited[child] = True
+                        stack.append(child)
+        return order
+
+    # Fase 3
+
+    def _order_layers(self, layers, successors, predecessors):
+        """Barridos de baricentros; retorna los cruces del mejor orden encontrado"""
+        best = [list(nodes) for nodes in layers]
+        best_crossings = self._count_all_crossings(layers, successors)
+        stale = 0
+        for _ in range(self.sweeps):
+            if best_crossings == 0:
+                break
+            for i in range(1, len(layers)):
+                self._sort_by_barycenter(layers[i], layers[i - 1], predecessors)
+            for i in range(len(layers) - 2, -1, -1):
+                self._sort_by_barycenter(layers[i], layers[i + 1], successors)
+
+            crossings = self._count_all_crossings(layers, successors)
+            if crossings < best_crossings:
+                best = [list(nodes) for nodes in layers]
+                best_crossings = crossings
+                stale = 0
+            else:
+                stale += 1
+                if stale >= 2:
+                    break
+
+        layers[:] = best
+        return best_crossings
+
+    def _sort_by_barycenter(self, nodes, fixed, neighbors):
+        """Ordena una capa por la posición media de sus vecinos en la capa fija"""
+        position = {node: i for i, node in enumerate(fixed)}
+        keys = {}
+        for i, node in enumerate(nodes):
+            adjacent = neighbors[node]
+            # Sin vecinos se conserva la posición actual
+            keys[node] = sum(position[n] for n in adjacent) / len(adjacent) if adjacent else i * len(fixed) / max(len(nodes), 1)
+        nodes.sort(key=keys.__getitem__)
+
+    def _count_all_crossings(self, layers, successors):
+        return sum(self._count_crossings(layers[i], layers[i + 1], successors) for i in range(len(layers) - 1))
+
+    def _count_crossings(self, upper, lower, successors):
+        """
+        Cruces entre dos capas: inversiones de las posiciones de destino al recorrer
+        las aristas ordenadas por origen, contadas con un árbol de Fenwick.
+        """
+        position = {node: i for i, node in enumerate(lower)}
+        targets = []
+        for node in upper:
+            targets.extend(sorted(position[child] for child in successors[node]))
+
+        size = len(lower)
+        tree = [0] * (size + 1)
+        crossings = 0
+        for seen, target in enumerate(targets):
+            # Aristas anteriores con destino a la derecha de este
+            i = target + 1
+            not_greater = 0
+            while i > 0:
+                not_greater += tree[i]
+                i -= i & -i
+            crossings += seen - not_greater
+            i = target + 1
+            while i <= size:
+                tree[i] += 1
+                i += i & -i
+        return crossings
+
+    # Fase 4
+
+    def _assign_coordinates(self, layers, successors, predecessors, widths, heights):
+        """
+        Centros horizontales de los nodos y posición vertical de cada capa.
+        Los nodos ficticios ocupan la mitad de la separación para que las aristas
+        paralelas no se solapen.
+        """
+        gaps = []
+        for nodes in layers:
+            gaps.append([
+                (widths[a] + widths[b]) / 2 + (self.node_spacing if widths[a] and widths[b] else self.node_spacing / 2)
+                for a, b in zip(nodes, nodes[1:])
+            ])
+
+        centers = [0.0] * len(widths)
+        for nodes, layer_gaps in zip(layers, gaps):
+            x = widths[nodes[0]] / 2 if nodes else 0
+            for i, node in enumerate(nodes):
+                if i:
+                    x += layer_gaps[i - 1]
+                centers[node] = x
+
+        # Alternar hacia abajo (vecinos de arriba) y hacia arriba (vecinos de abajo)
+        for _ in range(4):
+            for i in range(1, len(layers)):
+                self._align_layer(layers[i], gaps[i], predecessors, centers)
+            for i in range(len(layers) - 2, -1, -1):
+                self._align_layer(layers[i], gaps[i], successors, centers)
+
+        left = min((centers[i] - widths[i] / 2 for nodes in layers for i in nodes), default=0)
+        centers = [center - left for center in centers]
+
+        layer_tops = []
+        layer_heights = []
+        y = 0
+        for nodes in layers:
+            height = max((heights[node] for node in nodes), default=0)
+            layer_tops.append(y)
+            layer_heights.append(height)
+            y += height + self.layer_spacing
+        return centers, layer_tops, layer_heights
+
+    def _align_layer(self, nodes, gaps, neighbors, centers):
+        """
+        Lleva cada nodo al baricentro de sus vecinos sin alterar el orden.
+        Se resuelven los solapes empujando hacia la derecha y hacia la izquierda y
+        se promedian ambas soluciones (el promedio respeta igualmente las separaciones).
+        """
+        if not nodes:
+            return
+        desired = []
+        for node in nodes:
+            adjacent = neighbors[node]
+            desired.append(sum(centers[n] for n in adjacent) / len(adjacent) if adjacent else centers[node])
+
+        rightward = list(desired)
+        for i in range(1, len(nodes)):
+            rightward[i] = max(rightward[i], rightward[i - 1] + gaps[i - 1])
+        leftward = list(desired)
+        for i in range(len(nodes) - 2, -1, -1):
+            leftward[i] = min(leftward[i], leftward[i + 1] - gaps[i])
+
+        for i, node in enumerate(nodes):
+            centers[node] = (rightward[i] + leftward[i]) / 2
@@ -0,0 +1,172 @@
+from xml.sax.saxutils import escape
+from .drawio_codec import DeflateStream
+
+# Caracteres que deben escaparse dentro de un atributo entre comillas dobles.
+# Los saltos de línea se codifican para que sobrevivan a la normalización de
+# atributos del parser XML (draw.io los usa en las etiquetas).
+ATTRIBUTE_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'}
+
+# Atributos del mxGraphModel de cada página, en el orden en que los escribe draw.io
+GRAPH_MODEL_DEFAULTS = (
+    ('dx', '1422'),
+    ('dy', '794'),
+    ('grid', '1'),
+    ('gridSize', '10'),
+    ('guides', '1'),
+    ('tooltips', '1'),
+    ('connect', '1'),
+    ('arrows', '1'),
+    ('fold', '1'),
+    ('page', '1'),
+    ('pageScale', '1'),
+)
+
+
+def _attributes(attrs):
+    """Serializa los atributos conservando su orden; se omiten los valores None"""
+    return ''.join(
+        f' {name}="{escape(str(value), ATTRIBUTE_ENTITIES)}"'
+        for name, value in attrs.items() if value is not None
+    )
+
+
+class MXFileWriter:
+    """
+    Escritor incremental de archivos mxfile de draw.io.
+    Cada elemento se escribe en el archivo en cuanto se emite, de modo que la
+    memoria no depende del tamaño del diagrama: no se construye el árbol
+    completo ni se serializa y vuelve a parsear para indentarlo.
+
+    Uso:
+        with open(ruta, 'w', encoding='utf-8') as f:
+            writer = MXFileWriter(f, indent='  ')
+            writer.start_file(host='app.diagrams.net')
+            writer.start_diagram('id', 'Página', pageWidth=850, pageHeight=1100)
+            writer.cell({'id': '0'})
+            writer.cell({'id': 'a', 'value': 'A', 'vertex': '1', 'parent': '1'},
+                        geometry={'x': 0, 'y': 0, 'width': 80, 'height': 40})
+            writer.end_diagram()
+            writer.end_file()
+    """
+
+    def __init__(self, stream, indent='  ', compress=False):
+        """
+        Args:
+            stream: Archivo de texto abierto para escritura
+            indent (str): Indentación por nivel; None o '' para una salida compacta
+            compress (bool): Escribir cada página comprimida (deflate + base64), como draw.io
+        """
+        self.stream = stream
+        self.indent = indent or ''
+        self.newline = '\n' if indent else ''
+        self.compress = compress
+        self._open = []
+        self._page = None
+        self.cells_written = 0
+
+    def _line(self, text):
+        self.stream.write(f"{self.indent * len(self._open)}{text}{self.newline}")
+
+    def start(self, tag, attrs=None):
+        """Abre un elemento; se cierra con end()"""
+        self._line(f"<{tag}{_attributes(attrs or {})}>")
+        self._open.append(tag)
+
+    def end(self):
+        """Cierra el último elemento abierto"""
+        tag = self._open.pop()
+        self._line(f"</{tag}>")
+
+    def empty(self, tag, attrs=None):
+        """Escribe un elemento sin hijos"""
+        self._line(f"<{tag}{_attributes(attrs or {})}/>")
+
+    # mxfile
+
+    def start_file(self, **attrs):
+        self.stream.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.start('mxfile', attrs)
+
+    def end_file(self):
+        while self._open:
+            self.end()
+
+    def _start_page(self, attrs):
+        """
+        Abre un <diagram>. En modo comprimido el contenido de la página se desvía a
+        un DeflateStream, sin indentar, hasta _end_page().
+        """
+        if not self.compress:
+            self.start('diagram', attrs)
+            return
+        self._page = (attrs, self.stream, self.indent, self.newline, self._open)
+        self.stream = DeflateStream()
+        self.indent = self.newline = ''
+        self._open = []
+
+    def _end_page(self):
+        if not self.compress:
+            self.end()
+            return
+        payload = self.stream.finish()
+        attrs, self.stream, self.indent, self.newline, self._open = self._page
+        self._page = None
+        self._line(f"<diagram{_attributes(attrs)}>{payload}</diagram>")
+
+    def start_diagram(self, diagram_id, name, **model_attrs):
+        """Abre <diagram><mxGraphModel><root> de una página"""
+        self._start_page({'id': diagram_id, 'name': name})
+        attrs = dict(GRAPH_MODEL_DEFAULTS)
+        attrs.update(model_attrs)
+        self.start('mxGraphModel', attrs)
+        self.start('root')
+
+    def end_diagram(self):
+        """Cierra root, mxGraphModel y diagram"""
+        self.end()
+        self.end()
+        self._end_page()
+
+    def cell(self, attrs, geometry=None):
+        """
+        Escribe un mxCell con su mxGeometry opcional.
+        Args:
+            attrs (dict): Atributos de la celda (id, value, style, vertex/edge, parent...)
+            geometry (dict): Atributos de la geometría (x, y, width, height...)
+        """
+        self.cells_written += 1
+        if geometry is None:
+            self.empty('mxCell', attrs)
+            return
+        self.start('mxCell', attrs)
+        geometry = dict(geometry)
+        geometry['as'] = 'geometry'
+        self.empty('mxGeometry', geometry)
+        self.end()
+
+    def element(self, element):
+        """
+        Escribe un elemento de ElementTree ya construido (y sus hijos) sin
+        serializarlo entero a una cadena. Los <diagram> se comprimen si el
+        escritor está en modo comprimido.
+        """
+        if element.tag == 'diagram' and len(element):
+            self._start_page(element.attrib)
+            for child in element:
+                self.element(child)
+            self._end_page()
+            return
+        if element.tag == 'mxCell':
+            self.cells_written += 1
+        children = list(element)
+        text = element.text.strip() if element.text else ''
+        if not children and not text:
+            self.empty(element.tag, element.attrib)
+            return
+        if not children:
+            self._line(f"<{element.tag}{_attributes(element.attrib)}>{escape(text)}</{element.tag}>")
+            return
+        self.start(element.tag, element.attrib)
+        for child in children:
+            self.element(child)
+        self.end()
@@ -23,6 +23,10 @@ while [[ $# -gt 0 ]]; do
       PYTHON_ARGS="$PYTHON_ARGS --use-cache"
       shift
       ;;
+    --refresh)
+      PYTHON_ARGS="$PYTHON_ARGS --refresh"
+      shift
+      ;;
     --dependencies-only|-d)
       DEPENDENCIES_ONLY=true
       PYTHON_ARGS="$PYTHON_ARGS --dependencies-only"
@@ -33,6 +33,7 @@ def main():
 
    # Ahora podemos importar el generador
    from core.generator import SPMDiagramGenerator
+   from utils.version_checker import CachePolicy
    
    parser = argparse.ArgumentParser(
        description='Generador de diagramas SPM para proyectos iOS',
@@ -50,17 +51,194 @@ def main():
        help='Mostrar información detallada'
    )
    
-   parser.add_argument(
+   cache_group = parser.add_mutually_exclusive_group()
+   cache_group.add_argument(
        '--use-cache', '-c',
        action='store_true',
        help='Usar solo versiones en caché (sin consultas remotas)'
    )
 
+   cache_group.add_argument(
+       '--refresh',
+       action='store_true',
+       help='Ignorar la caché y consultar siempre las versiones remotas'
+   )
+
    parser.add_argument(
        '--dependencies-only', '-d',
        action='store_true',
        help='Solo analizar dependencias y generar JSON'
    )
+
+   parser.add_argument(
+       '--http-pool-size',
+       type=int,
+       default=10,
+       help='Conexiones HTTP keep-alive máximas por host (por defecto: 10)'
+   )
+
+   parser.add_argument(
+       '--cache-backend',
+       choices=['json', 'sqlite'],
+       default='json',
+       help='Backend de la caché de versiones (por defecto: json). '
+            'sqlite migra automáticamente el version_cache.json existente'
+   )
+   
+   parser.add_argument(
+       '--pod-specs',
+       metavar='PATH',
+       help='Checkout local de CocoaPods/Specs o directorio con los shards all_pods_versions_*.txt\n'
+            'del CDN. Las últimas versiones de los pods se resuelven con un índice local sin red'
+   )
+   
+   parser.add_argument(
+       '--indent',
+       type=int,
+       default=2,
+       metavar='N',
+       help='Espacios de indentación del XML generado (0 para una salida compacta; por defecto: 2)'
+   )
+   
+   parser.add_argument(
+       '--layout',
+       choices=['packages', 'layered'],
+       default='packages',
+       help='Disposición de los módulos SPM en el diagrama principal (por defecto: packages).\n'
+            'layered los ordena en capas según sus dependencias y enruta las conexiones'
+   )
+   
+   parser.add_argument(
+       '--compress',
+       action='store_true',
+       help='Comprimir cada página del diagrama (deflate + base64), como guarda draw.io.\n'
+            'Para compararlo: python3 -m diagram.drawio_codec <archivo> -o <salida>'
+   )
+   
+   parser.add_argument(
+       '--jobs', '-j',
+       type=int,
+       default=os.cpu_count() or 1,
+       metavar='N',
+       help='Procesos para parsear en paralelo los Package.swift que no están en la caché\n'
+            '(por defecto: número de CPUs; 1 para parsear en serie)'
+   )
+   
+   parser.add_argument(
+       '--highlight-critical-path',
+       action='store_true',
+       help='Resaltar en el diagrama la ruta crítica de compilación entre módulos locales\n'
+            '(módulos pesados por líneas de Swift; ver el subcomando build-cost)'
+   )
+   
+   subparsers = parser.add_subparsers(dest='command', metavar='COMANDO')
+   graph_parser = subparsers.add_parser(
+       'graph',
+       help='Consultas sobre el grafo de dependencias entre módulos locales',
+       formatter_class=argparse.RawTextHelpFormatter
+   )
+   graph_parser.add_argument(
+       '--affected',
+       nargs='+',
+       metavar='MÓDULO',
+       help='Módulos afectados (a recompilar o probar) si cambian los indicados'
+   )
+   graph_parser.add_argument(
+       '--dependencies',
+       metavar='MÓDULO',
+       help='Dependencias transitivas de un módulo'
+   )
+   graph_parser.add_argument(
+       '--dependents',
+       metavar='MÓDULO',
+       help='Módulos que dependen transitivamente de uno dado'
+   )
+   graph_parser.add_argument(
+       '--json',
+       nargs='?',
+       const=os.path.join('results', 'dependency_graph.json'),
+       metavar='ARCHIVO',
+       help='Guardar el grafo y el resultado de las consultas en JSON\n'
+            '(por defecto: results/dependency_graph.json)'
+   )
+   graph_parser.add_argument(
+       '--fail-on-cycles',
+       action='store_true',
+       help='Terminar con código de salida 1 si hay dependencias circulares'
+   )
+   
+   audit_parser = subparsers.add_parser(
+       'audit',
+       help='Dependencias de targets sin usar y módulos importados sin declarar',
+       formatter_class=argparse.RawTextHelpFormatter
+   )
+   audit_parser.add_argument(
+       '--ignore',
+       nargs='+',
+       default=[],
+       metavar='MÓDULO',
+       help='Módulos o dependencias que no se revisan (p.ej. re-exportados con @_exported)'
+   )
+   audit_parser.add_argument(
+       '--json',
+       nargs='?',
+       const=os.path.join('results', 'dependency_audit.json'),
+       metavar='ARCHIVO',
+       help='Guardar el informe en JSON\n'
+            '(por defecto: results/dependency_audit.json)'
+   )
+   audit_parser.add_argument(
+       '--fail-on-issues',
+       action='store_true',
+       help='Terminar con código de salida 1 si hay dependencias sin usar o sin declarar'
+   )
+   
+   layers_parser = subparsers.add_parser(
+       'layers',
+       help='Capas de arquitectura de los archivos Swift y dependencias no permitidas entre ellas',
+       formatter_class=argparse.RawTextHelpFormatter
+   )
+   layers_parser.add_argument(
+       '--json',
+       nargs='?',
+       const=os.path.join('results', 'architecture_layers.json'),
+       metavar='ARCHIVO',
+       help='Guardar las capas y las violaciones en JSON\n'
+            '(por defecto: results/architecture_layers.json)'
+   )
+   layers_parser.add_argument(
+       '--max-violations',
+       type=int,
+       metavar='N',
+       help='Terminar con código de salida 1 si hay más de N violaciones (0 para no permitir ninguna)'
+   )
+   
+   build_cost_parser = subparsers.add_parser(
+       'build-cost',
+       help='Ruta crítica de compilación, paralelismo máximo y módulos que convendría dividir',
+       formatter_class=argparse.RawTextHelpFormatter
+   )
+   build_cost_parser.add_argument(
+       '--metric',
+       choices=['lines', 'bytes'],
+       default='lines',
+       help='Peso de cada módulo: líneas o bytes de sus fuentes Swift (por defecto: lines)'
+   )
+   build_cost_parser.add_argument(
+       '--splits',
+       type=int,
+       default=5,
+       metavar='N',
+       help='Módulos candidatos a dividir que se muestran (por defecto: 5)'
+   )
+   build_cost_parser.add_argument(
+       '--json',
+       nargs='?',
+       const=os.path.join('results', 'build_cost.json'),
+       metavar='ARCHIVO',
+       help='Guardar el análisis en JSON\n'
+            '(por defecto: results/build_cost.json)'
+   )
    
    args = parser.parse_args()
    
@@ -81,19 +259,52 @@ def main():
    # Validar que la ruta existe
    if not os.path.exists(project_path):
        logging.error(f"❌ Error: La ruta {project_path} no existe")
-       return
+       sys.exit(1)
+   
+   # Política de caché de versiones
+   if args.use_cache:
+       cache_policy = CachePolicy.OFFLINE
+   elif args.refresh:
+       cache_policy = CachePolicy.FORCE_REFRESH
+   else:
+       cache_policy = CachePolicy.READ_THROUGH
+   
+   # Las consultas del grafo y la auditoría solo muestran su resultado, salvo en modo verbose
+   if args.command in ('graph', 'audit', 'layers', 'build-cost') and not args.verbose:
+       logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
    
+   exit_code = 0
    try:
         # Crear instancia del generador
-        diagram_generator = SPMDiagramGenerator(project_path, use_cache=args.use_cache)
+        diagram_generator = SPMDiagramGenerator(
+            project_path,
+            cache_policy=cache_policy,
+            http_pool_size=args.http_pool_size,
+            cache_backend=args.cache_backend,
+            pod_specs=args.pod_specs,
+            layout=args.layout,
+            jobs=args.jobs,
+            highlight_critical_path=args.highlight_critical_path
+        )
         
-        if args.dependencies_only:
+        if args.command == 'graph':
+            exit_code = run_graph_command(diagram_generator, args)
+        elif args.command == 'audit':
+            exit_code = run_audit_command(diagram_generator, args)
+        elif args.command == 'layers':
+            exit_code = run_layers_command(diagram_generator, args)
+        elif args.command == 'build-cost':
+            exit_code = run_build_cost_command(diagram_generator, args)
+        elif args.dependencies_only:
             # Solo generar JSON de dependencias
             output_file = diagram_generator.generate_dependencies_json()
             logging.info(f"\n✅ Archivo JSON generado: {output_file}")
         else:
             # Generar diagrama unificado
-            unified_diagram = diagram_generator.generate_unified_diagram()
+            unified_diagram = diagram_generator.generate_unified_diagram(
+                indent=' ' * args.indent,
+                compress=args.compress
+            )
             logging.info(f"\n✅ Diagrama unificado generado en: {unified_diagram}")
             logging.info("\nPuedes abrir este archivo en draw.io o en la aplicación de escritorio Diagrams")
            
@@ -101,8 +312,163 @@ def main():
        logging.error(f"\n❌ Error durante la generación del diagrama: {str(e)}")
        if args.verbose:
            logging.exception("Detalles del error:")
+       # Un fallo no puede terminar con código 0: los subcomandos se usan como control en CI
+       exit_code = 1
    finally:
        print("\n✅ Proceso completado")
+   
+   if exit_code:
+       sys.exit(exit_code)
+
+def run_graph_command(diagram_generator, args):
+   """
+   Ejecuta las consultas del subcomando 'graph'.
+   Returns:
+       int: Código de salida (1 si hay ciclos y se pidió --fail-on-cycles, 2 si un módulo no existe)
+   """
+   import json
+   import time
+   from core.dependency_graph import UnknownModuleError
+   
+   graph = diagram_generator.build_dependency_graph()
+   start = time.perf_counter()
+   try:
+       result = graph.to_dict(affected=args.affected)
+       if args.dependencies:
+           result['dependencies_of'] = {args.dependencies: graph.dependencies_of(args.dependencies)}
+       if args.dependents:
+           result['dependents_of'] = {args.dependents: graph.dependents_of(args.dependents)}
+   except UnknownModuleError as e:
+       logging.error(f"❌ {e.args[0]}")
+       return 2
+   elapsed = (time.perf_counter() - start) * 1000
+   
+   print(f"\n🕸️  Grafo de dependencias: {result['modules']} módulos, {result['edges']} dependencias locales, "
+         f"{len(result['levels'])} niveles (consultas en {elapsed:.1f} ms)")
+   if result['cycles']:
+       print(f"🔁 {len(result['cycles'])} dependencias circulares:")
+       for cycle in result['cycles']:
+           print(f"   • {', '.join(cycle)}")
+   else:
+       print("✅ Sin dependencias circulares")
+   if args.affected:
+       print(f"🎯 Afectados por cambios en {', '.join(args.affected)} ({len(result['affected'])}):")
+       for name in result['affected']:
+           print(f"   • {name}")
+   for key, title in (('dependencies_of', 'Dependencias de'), ('dependents_of', 'Dependientes de')):
+       for name, modules in result.get(key, {}).items():
+           print(f"📦 {title} {name} ({len(modules)}): {', '.join(modules) or '-'}")
+   
+   if args.json:
+       os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+       with open(args.json, 'w', encoding='utf-8') as f:
+           json.dump(result, f, indent=2, ensure_ascii=False)
+       print(f"📝 Grafo guardado en: {args.json}")
+   
+   return 1 if args.fail_on_cycles and result['cycles'] else 0
+
+def run_audit_command(diagram_generator, args):
+   """
+   Ejecuta el subcomando 'audit'.
+   Returns:
+       int: Código de salida (1 si hay problemas y se pidió --fail-on-issues)
+   """
+   import json
+   import time
+   
+   start = time.perf_counter()
+   result = diagram_generator.audit_dependencies(ignore=args.ignore)
+   elapsed = time.perf_counter() - start
+   
+   print(f"\n🔍 Auditoría de dependencias: {result['packages']} paquetes, {result['targets']} targets, "
+         f"{result['files']} archivos Swift ({elapsed:.2f} s)")
+   if not result['issues']:
+       print("✅ Sin dependencias sin usar ni sin declarar")
+   for issue in result['issues']:
+       print(f"📦 {issue['package']}/{issue['target']} ({issue['path']})")
+       for dependency in issue['unused']:
+           print(f"   ➖ Sin usar: {dependency}")
+       for module, files in issue['missing'].items():
+           print(f"   ➕ Sin declarar: {module} (importado en {files[0]}"
+                 f"{f' y {len(files) - 1} más' if len(files) > 1 else ''})")
+   if result['skipped']:
+       print(f"ℹ️ {len(result['skipped'])} targets sin fuentes Swift encontradas: {', '.join(result['skipped'])}")
+   if result['issues']:
+       print(f"⚠️ {result['unused']} dependencias sin usar, {result['missing']} sin declarar")
+   
+   if args.json:
+       os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+       with open(args.json, 'w', encoding='utf-8') as f:
+           json.dump(result, f, indent=2, ensure_ascii=False)
+       print(f"📝 Informe guardado en: {args.json}")
+   
+   return 1 if args.fail_on_issues and result['issues'] else 0
+
+def run_layers_command(diagram_generator, args):
+   """
+   Ejecuta el subcomando 'layers'.
+   Returns:
+       int: Código de salida (1 si se supera --max-violations)
+   """
+   import json
+   import time
+   
+   start = time.perf_counter()
+   report = diagram_generator.analyze_architecture()
+   elapsed = time.perf_counter() - start
+   
+   print(f"\n🏛️  Capas de arquitectura: {report['files']} archivos Swift ({elapsed:.2f} s)")
+   for layer, data in report['layers'].items():
+       if data['count']:
+           print(f"   • {layer}: {data['count']}")
+   if report['violations']:
+       print(f"⚠️ {report['violation_count']} archivos con dependencias entre capas no permitidas:")
+       for violation in report['violations']:
+           print(f"   • {violation['from']} → {violation['to']}: {violation['count']}")
+   else:
+       print("✅ Sin dependencias entre capas no permitidas")
+   
+   if args.json:
+       os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+       with open(args.json, 'w', encoding='utf-8') as f:
+           json.dump(report, f, indent=2, ensure_ascii=False)
+       print(f"📝 Capas guardadas en: {args.json}")
+   
+   if args.max_violations is not None and report['violation_count'] > args.max_violations:
+       print(f"❌ {report['violation_count']} archivos con violaciones, el máximo es {args.max_violations}")
+       return 1
+   return 0
+
+def run_build_cost_command(diagram_generator, args):
+   """
+   Ejecuta el subcomando 'build-cost'.
+   Returns:
+       int: Código de salida
+   """
+   import json
+   
+   result = diagram_generator.analyze_build_cost(metric=args.metric, splits=args.splits)
+   critical_path = result['critical_path']
+   unit = 'líneas' if result['metric'] == 'lines' else 'bytes'
+   
+   print(f"\n⏱️  Coste de compilación: {result['modules']} módulos, {result['total_weight']} {unit} de Swift")
+   print(f"🔗 Ruta crítica: {critical_path['length']} {unit} ({critical_path['percent_of_total']}% del total)")
+   for step in critical_path['modules']:
+       print(f"   • {', '.join(step['modules'])}: {step['weight']} {unit}")
+   print(f"⚙️  Paralelismo teórico máximo: {result['parallelism']}x "
+         f"(hasta {result['max_concurrency']} módulos a la vez)")
+   if result['split_candidates']:
+       print("✂️  Módulos que más acortarían la ruta crítica al dividirlos en dos:")
+       for candidate in result['split_candidates']:
+           print(f"   • {candidate['module']}: -{candidate['reduction']:g} {unit} ({candidate['reduction_percent']}%)")
+   
+   if args.json:
+       os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+       with open(args.json, 'w', encoding='utf-8') as f:
+           json.dump(result, f, indent=2, ensure_ascii=False)
+       print(f"📝 Análisis guardado en: {args.json}")
+   
+   return 0
 
 if __name__ == "__main__":
    main()
\ No newline at end of file
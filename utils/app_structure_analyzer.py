@@ -1,6 +1,10 @@
 import os
 import logging
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
+from .project_index import ProjectIndex
+from .parse_cache import ParseCache
+from .import_scanner import ImportScanner
+from .layer_classifier import LayerClassifier
 
 class AppStructureAnalyzer:
     """
@@ -9,12 +13,17 @@ class AppStructureAnalyzer:
     su estructura de archivos.
     """
     
-    def __init__(self, project_root: str, application_path: str = None):
+    def __init__(self, project_root: str, application_path: str = None, project_index: Optional[ProjectIndex] = None,
+                 parse_cache: Optional[ParseCache] = None, jobs: int = 1):
         self.project_root = os.path.abspath(project_root)
         self.application_path = application_path
         self.logger = self._setup_logging()
+        self.project_index = project_index or ProjectIndex(self.project_root)
         self.app_structure = {}
         self.imports_map = {}  # Mapeo de archivos a sus imports
+        self.import_scanner = ImportScanner(parse_cache=parse_cache, jobs=jobs)
+        self.layer_classifier = LayerClassifier()
+        self._layers = None
 
     def _setup_logging(self):
         """Configura el sistema de logging"""
@@ -58,14 +67,11 @@ class AppStructureAnalyzer:
             
             directory_structure = {}
             
-            # Recorrer directorios y archivos
-            for root, dirs, files in os.walk(app_dir):
-                # Filtrar archivos Swift
-                swift_files = [f for f in files if f.endswith('.swift')]
-                
-                if not swift_files:
-                    continue
-                    
+            # Una ruta de aplicación fuera del proyecto necesita su propio índice
+            index = self.project_index if self.project_index.covers(app_dir) else ProjectIndex(app_dir)
+            
+            # Directorios con archivos Swift según el índice
+            for root, swift_files in index.swift_files_under(app_dir).items():
                 # Calcular la ruta relativa
                 rel_path = os.path.relpath(root, app_dir)
                 rel_path = rel_path if rel_path != '.' else 'root'
@@ -90,24 +96,51 @@ class AppStructureAnalyzer:
     
     def get_module_usage(self) -> Dict[str, Set[str]]:
         """
-        Retorna un mapa de módulos a los archivos que los importan.
+        Retorna un mapa de módulos a los archivos que los importan (rutas relativas
+        al proyecto). También rellena imports_map con los import de cada archivo.
         """
-        # Implementación básica
-        return {}
+        if not self.imports_map:
+            swift_paths = {}
+            for app_dir in self.find_app_directories():
+                index = self.project_index if self.project_index.covers(app_dir) else ProjectIndex(app_dir)
+                for root, swift_files in index.swift_files_under(app_dir).items():
+                    for file_name in swift_files:
+                        # Los manifiestos solo importan PackageDescription
+                        if file_name != 'Package.swift':
+                            swift_paths[os.path.join(root, file_name)] = None
+            self.imports_map = self.import_scanner.scan(list(swift_paths), base_path=self.project_root)
+        
+        return {module: set(files) for module, files in self.import_scanner.module_files.items()}
     
+    def _classify_layers(self) -> Dict:
+        """Clasifica (una sola vez) los archivos del índice de import en capas"""
+        if self._layers is None:
+            self.get_module_usage()
+            self._layers = self.layer_classifier.classify_files(self.imports_map)
+        return self._layers
+
     def get_architecture_layers(self) -> Dict[str, List[str]]:
         """
-        Intenta detectar capas de arquitectura basadas en nombres de directorio.
+        Detecta capas de arquitectura a partir de los nombres de directorio, los
+        sufijos de los archivos (*ViewModel.swift, *Service.swift...) y sus import.
+        Retorna cada capa con sus archivos (rutas relativas al proyecto).
         """
-        # Implementación básica
+        return {layer: list(files) for layer, files in self._classify_layers()['layers'].items()}
+
+    def get_layer_violations(self) -> List[Dict]:
+        """
+        Dependencias entre capas no permitidas (p.ej. una vista que importa
+        Networking), agrupadas por capa de origen y destino.
+        """
+        return self._classify_layers()['violations']
+
+    def get_architecture_report(self) -> Dict:
+        """Resumen serializable a JSON de las capas y sus violaciones"""
+        layers = self._classify_layers()
         return {
-            "Views": [],
-            "ViewControllers": [],
-            "Models": [],
-            "ViewModels": [],
-            "Services": [],
-            "Networking": [],
-            "Utilities": [],
-            "Resources": [],
-            "Other": []
-        }
\ No newline at end of file
+            'files': len(self.imports_map),
+            'layers': {layer: {'count': len(files), 'files': files} for layer, files in layers['layers'].items()},
+            # Archivos con alguna violación: un archivo que incumple dos reglas cuenta una vez
+            'violation_count': len({path for violation in layers['violations'] for path in violation['files']}),
+            'violations': layers['violations']
+        }
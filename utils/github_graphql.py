@@ -0,0 +1,109 @@
+# spm_generator/utils/github_graphql.py
+
+import json
+
+class GitHubGraphQLClient:
+    """
+    Cliente de la API GraphQL de GitHub para consultar en lote los tags de muchos
+    repositorios. Cada consulta agrupa varios repositorios mediante alias
+    (r0, r1, ...) pidiendo su último release y sus tags más recientes, de modo
+    que decenas de dependencias se resuelven con dos o tres peticiones.
+    """
+
+    REPOSITORY_FIELDS = (
+        'latestRelease { tagName } '
+        'refs(refPrefix: "refs/tags/", first: 100, orderBy: {field: TAG_COMMIT_DATE, direction: DESC}) '
+        '{ nodes { name } }'
+    )
+
+    def __init__(self, session_pool, token, endpoint=None, chunk_size=50, timeout=10):
+        """
+        Args:
+            session_pool (HTTPSessionPool): Sesiones HTTP compartidas
+            token (str): Token de GitHub (la API GraphQL no admite peticiones anónimas)
+            endpoint (str): URL del endpoint GraphQL
+            chunk_size (int): Repositorios por consulta, para no superar el límite de coste
+            timeout (float): Timeout de cada petición en segundos
+        """
+        self.session_pool = session_pool
+        self.token = token
+        self.endpoint = endpoint or 'https://api.github.com/graphql'
+        self.chunk_size = max(1, chunk_size)
+        self.timeout = timeout
+
+    def _build_query(self, repos):
+        """Construye una consulta con un alias por repositorio"""
+        fields = []
+        for idx, (owner, name) in enumerate(repos):
+            fields.append(
+                f'r{idx}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) '
+                f'{{ {self.REPOSITORY_FIELDS} }}'
+            )
+        return 'query { ' + ' '.join(fields) + ' rateLimit { cost remaining } }'
+
+    def fetch_repositories(self, repos):
+        """
+        Obtiene el último release y los 100 tags más recientes de cada repositorio.
+        Args:
+            repos (list): Pares (owner, name)
+        Returns:
+            dict: (owner, name) -> {'latest_release': str o None, 'tags': [str]},
+                  o None si el repositorio no existe.
+                  Los repositorios con errores transitorios (p.ej. permisos o cuota)
+                  no se incluyen, para que se resuelvan por otra vía.
+        Raises:
+            requests.exceptions.RequestException: Si falla alguna de las peticiones
+        """
+        repos = list(dict.fromkeys(repos))
+        results = {}
+        headers = {'Authorization': f"bearer {self.token}"}
+
+        for start in range(0, len(repos), self.chunk_size):
+            chunk = repos[start:start + self.chunk_size]
+            print(f"\n🌐 Consultando GraphQL: {len(chunk)} repositorios ({self.endpoint})")
+
+            response = self.session_pool.post(
+                self.endpoint,
+                json={'query': self._build_query(chunk)},
+                headers=headers,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            payload = response.json()
+            data = payload.get('data') or {}
+
+            if payload.get('errors') and not data:
+                raise ValueError(f"Error en la consulta GraphQL: {payload['errors'][0].get('message')}")
+
+            rate_limit = data.get('rateLimit')
+            if rate_limit:
+                print(f"📊 Coste GraphQL: {rate_limit.get('cost')} (restante: {rate_limit.get('remaining')})")
+
+            failed_aliases = self._failed_aliases(payload.get('errors') or [])
+            for idx, repo in enumerate(chunk):
+                alias = f'r{idx}'
+                if alias not in failed_aliases:
+                    results[repo] = self._extract_repository(data.get(alias))
+
+        return results
+
+    def _failed_aliases(self, errors):
+        """Alias con errores distintos de NOT_FOUND (un repositorio inexistente es un resultado válido)"""
+        failed = set()
+        for error in errors:
+            path = error.get('path') or []
+            if path and error.get('type') != 'NOT_FOUND':
+                failed.add(path[0])
+        return failed
+
+    def _extract_repository(self, repository):
+        """Extrae el último release y los nombres de los tags de un repositorio"""
+        if not repository:
+            return None
+
+        latest_release = repository.get('latestRelease') or {}
+        nodes = (repository.get('refs') or {}).get('nodes') or []
+        return {
+            'latest_release': latest_release.get('tagName'),
+            'tags': [node['name'] for node in nodes]
+        }
@@ -0,0 +1,194 @@
+# spm_generator/utils/http_session.py
+
+import time
+import threading
+import requests
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """El circuito del host está abierto: no se realizan peticiones hasta que termine la espera"""
+
+
+class HostCircuitBreaker:
+    """
+    Circuit breaker por host.
+    Tras varios fallos consecutivos (403, 429, 5xx, timeouts o errores de conexión)
+    el circuito se abre y las peticiones a ese host fallan de inmediato durante un
+    tiempo de espera. Si el servidor indica cuándo volver a intentarlo
+    (Retry-After o X-RateLimit-Reset), el circuito se abre hasta ese instante.
+    """
+
+    def __init__(self, failure_threshold=3, cooldown=60, max_wait=3600):
+        """
+        Args:
+            failure_threshold (int): Fallos consecutivos que abren el circuito
+            cooldown (float): Segundos de espera cuando el servidor no indica ninguno
+            max_wait (float): Espera máxima aceptada desde las cabeceras del servidor
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.max_wait = max_wait
+        self._failures = {}
+        self._open_until = {}
+        self._lock = threading.Lock()
+
+    def check(self, host):
+        """Lanza CircuitOpenError si el circuito del host está abierto"""
+        with self._lock:
+            open_until = self._open_until.get(host)
+            if open_until is None:
+                return
+            remaining = open_until - time.time()
+            if remaining > 0:
+                raise CircuitOpenError(f"Circuito abierto para {host} (quedan {int(remaining)}s)")
+            # Fin de la espera: se permite un nuevo intento (semiabierto)
+            del self._open_until[host]
+            self._failures[host] = self.failure_threshold - 1
+
+    def record_success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._open_until.pop(host, None)
+
+    def record_failure(self, host, retry_after=None):
+        """
+        Registra un fallo del host.
+        Args:
+            retry_after (float): Segundos indicados por el servidor antes de reintentar
+        """
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+
+            if retry_after is not None:
+                wait = min(max(retry_after, 0), self.max_wait)
+            elif failures >= self.failure_threshold:
+                wait = self.cooldown
+            else:
+                return
+
+            self._open_until[host] = time.time() + wait
+            print(f"⛔ Circuito abierto para {host} durante {int(wait)}s tras {failures} fallo(s)")
+
+    def is_open(self, host):
+        with self._lock:
+            return self._open_until.get(host, 0) > time.time()
+
+
+class HTTPSessionPool:
+    """
+    Capa de sesiones HTTP compartida por todos los analizadores.
+    Mantiene una requests.Session por host con conexiones keep-alive, de modo que
+    las consultas sucesivas a GitHub, GitLab o CocoaPods reutilizan la conexión
+    TCP+TLS en lugar de abrir una nueva en cada petición.
+    """
+
+    RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+    def __init__(self, pool_size=10, max_retries=3, backoff_factor=0.5, circuit_breaker=None):
+        """
+        Args:
+            pool_size (int): Conexiones keep-alive máximas por host
+            max_retries (int): Reintentos ante errores de conexión o respuestas 5xx (los timeouts de lectura no se reintentan)
+            backoff_factor (float): Factor del backoff exponencial entre reintentos
+            circuit_breaker (HostCircuitBreaker): Breaker compartido por todos los hosts
+        """
+        self.pool_size = max(1, pool_size)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.circuit_breaker = circuit_breaker or HostCircuitBreaker()
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self):
+        """Crea una sesión con la política de reintentos y el tamaño de pool configurados"""
+        # Los timeouts de lectura no se reintentan y Retry-After no se respeta aquí:
+        # un host lento o que limita la cuota debe llegar cuanto antes al circuit
+        # breaker, que aplica la espera del servidor acotada por su max_wait, en
+        # lugar de bloquear al hilo dentro de urllib3
+        retry = Retry(
+            total=self.max_retries,
+            read=0,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'HEAD', 'POST']),
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def get_session(self, url):
+        """Retorna la sesión asociada al host de la URL, creándola si no existe"""
+        host = self._host_key(url)
+        with self._lock:
+            if host not in self._sessions:
+                self._sessions[host] = self._create_session()
+            return self._sessions[host]
+
+    def _host_key(self, url):
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+    def get(self, url, **kwargs):
+        """Realiza una petición GET reutilizando la sesión del host"""
+        return self._request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Realiza una petición POST reutilizando la sesión del host"""
+        return self._request('POST', url, **kwargs)
+
+    def _request(self, method, url, **kwargs):
+        """Realiza la petición pasando por el circuit breaker del host"""
+        host = self._host_key(url)
+        self.circuit_breaker.check(host)
+
+        try:
+            response = self.get_session(url).request(method, url, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            self.circuit_breaker.record_failure(host)
+            raise
+
+        if response.status_code in (403, 429) or response.status_code >= 500:
+            self.circuit_breaker.record_failure(host, self._retry_after(response))
+        else:
+            self.circuit_breaker.record_success(host)
+        return response
+
+    def _retry_after(self, response):
+        """
+        Segundos de espera indicados por el servidor, o None si no indica ninguno.
+        Se usan Retry-After (segundos o fecha HTTP) y, cuando la cuota está agotada,
+        X-RateLimit-Reset (epoch) de GitHub/GitLab.
+        """
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                try:
+                    return parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    pass
+
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            try:
+                return float(response.headers['X-RateLimit-Reset']) - time.time()
+            except (KeyError, ValueError):
+                pass
+
+        return None
+
+    def close(self):
+        """Cierra todas las sesiones y sus conexiones abiertas"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
@@ -0,0 +1,131 @@
+import os
+import re
+import logging
+from typing import Dict, List, Optional, Set
+from .parse_cache import ParseCache
+
+# Bytes leídos del principio de cada archivo: los import de Swift van antes de
+# cualquier declaración, así que casi nunca hace falta leer más
+HEADER_BYTES = 16384
+
+# Si el último import termina a menos de esta distancia del final de lo leído,
+# puede haber más a continuación y se lee otro bloque
+HEADER_TAIL_BYTES = 1024
+
+# Prefiltro a nivel de bytes: los archivos sin esta palabra no pasan por la regex
+IMPORT_KEYWORD = b'import'
+
+# import Foo, import struct Foo.Bar. La regex empieza por un literal para que el
+# motor salte directamente a cada aparición de 'import' en lugar de probar en cada
+# posición, como haría con ^ en modo MULTILINE
+IMPORT_PATTERN = re.compile(rb'import[ \t]+(?:(?:typealias|struct|class|enum|protocol|let|var|func)[ \t]+)?(\w+)')
+
+# Lo que puede preceder a import en su línea: indentación y atributos (@testable, @_exported...)
+LINE_PREFIX_PATTERN = re.compile(rb'[ \t]*(?:@\w+[ \t]+)*')
+
+
+def _import_matches(region: bytes) -> list:
+    """Coincidencias de IMPORT_PATTERN que están al principio de su línea"""
+    matches = []
+    for match in IMPORT_PATTERN.finditer(region):
+        line_start = region.rfind(b'\n', 0, match.start()) + 1
+        if LINE_PREFIX_PATTERN.match(region, line_start).end() == match.start():
+            matches.append(match)
+    return matches
+
+
+def scan_imports(path: str) -> List[str]:
+    """
+    Retorna los módulos importados por un archivo Swift, en orden de aparición y
+    sin repetir. Solo se lee la cabecera del archivo. Es una función de nivel de
+    módulo para poder enviarla a los procesos del pool de parseo.
+    """
+    with open(path, 'rb') as file:
+        header = file.read(HEADER_BYTES)
+        if IMPORT_KEYWORD not in header:
+            return []
+        eof = len(header) < HEADER_BYTES
+        while True:
+            # Sin llegar al final del archivo, la última línea leída puede estar cortada
+            region = header if eof else header[:header.rfind(b'\n') + 1]
+            matches = _import_matches(region)
+            if eof or not matches or matches[-1].end() < len(region) - HEADER_TAIL_BYTES:
+                break
+            chunk = file.read(HEADER_BYTES)
+            eof = len(chunk) < HEADER_BYTES
+            header += chunk
+
+    imports = []
+    for match in matches:
+        module = match.group(1).decode('ascii')
+        if module not in imports:
+            imports.append(module)
+    return imports
+
+
+class ImportScanner:
+    """
+    Escáner de los import de archivos Swift.
+    Construye dos índices: archivo -> módulos que importa y módulo -> archivos que
+    lo importan. Los archivos se escanean en un pool de procesos y el resultado de
+    cada uno se guarda en la caché de parseo por tamaño y mtime, de modo que en la
+    siguiente ejecución solo se vuelven a leer los archivos modificados.
+    """
+
+    PARSER_KEY = 'swift_imports'
+
+    def __init__(self, parse_cache: Optional[ParseCache] = None, jobs: int = 1):
+        self.parse_cache = parse_cache or ParseCache()
+        self.jobs = max(1, jobs or 1)
+        self.logger = self._setup_logging()
+        self.file_imports = {}  # archivo -> módulos importados
+        self.module_files = {}  # módulo -> archivos que lo importan
+
+    def _setup_logging(self):
+        """Configura el sistema de logging"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+        return logging.getLogger(__name__)
+
+    def scan(self, file_paths: List[str], base_path: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Escanea los archivos y añade sus import a los índices.
+        Args:
+            file_paths (list): Rutas de los archivos .swift
+            base_path (str): Si se indica, los índices usan rutas relativas a este directorio
+        Returns:
+            dict: Archivo -> módulos importados de los archivos escaneados
+        """
+        # Sin hash del contenido: calcularlo obligaría a leer cada archivo entero
+        results, errors = self.parse_cache.get_or_parse_many(file_paths, self.PARSER_KEY, scan_imports,
+                                                             jobs=self.jobs, verify_content=False)
+
+        # Las rutas dentro de base_path se recortan por prefijo: os.path.relpath es
+        # mucho más lento y se llamaría una vez por archivo
+        prefix = os.path.join(os.path.abspath(base_path), '') if base_path else None
+
+        scanned = {}
+        for path, imports in zip(file_paths, results):
+            if imports is None:
+                error = errors.get(os.path.abspath(path), 'resultado vacío')
+                self.logger.warning(f"⚠️ No se pudieron leer los import de {path}: {error}")
+                continue
+            if prefix is None:
+                key = path
+            elif path.startswith(prefix):
+                key = path[len(prefix):]
+            else:
+                key = os.path.relpath(path, base_path)
+            scanned[key] = imports
+            for module in imports:
+                self.module_files.setdefault(module, set()).add(key)
+
+        self.file_imports.update(scanned)
+        self.logger.info(f"🔎 {len(scanned)} archivos Swift escaneados, {len(self.module_files)} módulos importados")
+        return scanned
+
+    def files_importing(self, module: str) -> Set[str]:
+        """Archivos que importan el módulo indicado"""
+        return set(self.module_files.get(module, ()))
@@ -1,2 +1,8 @@
 from .version_checker import VersionChecker
-from .app_structure_analyzer import AppStructureAnalyzer
\ No newline at end of file
+from .app_structure_analyzer import AppStructureAnalyzer
+from .http_session import HTTPSessionPool, HostCircuitBreaker, CircuitOpenError
+from .version_cache import JSONVersionCache, SQLiteVersionCache
+from .project_index import ProjectIndex
+from .pod_specs_index import PodSpecsIndex
+from .import_scanner import ImportScanner, scan_imports
+from .layer_classifier import LayerClassifier
\ No newline at end of file
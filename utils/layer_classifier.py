@@ -0,0 +1,189 @@
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Capas de arquitectura, en el orden en que se informan
+LAYERS = (
+    "Views",
+    "ViewControllers",
+    "Models",
+    "ViewModels",
+    "Services",
+    "Networking",
+    "Utilities",
+    "Resources",
+    "Other"
+)
+
+# Sufijos del nombre del archivo (sin .swift). Gana el más largo: UserViewModel es
+# un ViewModel aunque también termine en Model
+FILE_SUFFIXES = {
+    'View': 'Views', 'Cell': 'Views', 'Screen': 'Views', 'Button': 'Views', 'Style': 'Views',
+    'ViewController': 'ViewControllers', 'Controller': 'ViewControllers', 'VC': 'ViewControllers',
+    'Coordinator': 'ViewControllers',
+    'Model': 'Models', 'Entity': 'Models', 'DTO': 'Models',
+    'ViewModel': 'ViewModels', 'Presenter': 'ViewModels', 'ViewState': 'ViewModels',
+    'Service': 'Services', 'Manager': 'Services', 'Repository': 'Services', 'UseCase': 'Services',
+    'Interactor': 'Services', 'Store': 'Services',
+    'Client': 'Networking', 'API': 'Networking', 'Endpoint': 'Networking', 'Request': 'Networking',
+    'Response': 'Networking', 'Network': 'Networking', 'Networking': 'Networking',
+    'APIService': 'Networking', 'NetworkService': 'Networking', 'NetworkManager': 'Networking',
+    'Helper': 'Utilities', 'Helpers': 'Utilities', 'Utils': 'Utilities', 'Extension': 'Utilities',
+    'Extensions': 'Utilities', 'Formatter': 'Utilities', 'Constants': 'Utilities',
+    # Puntos de entrada: importan UIKit, pero no son vistas
+    'AppDelegate': 'Other', 'SceneDelegate': 'Other',
+}
+
+# Prefijos de nombres de directorio (en minúsculas): 'view' cubre View, Views y ViewComponents
+DIRECTORY_PREFIXES = {
+    'view': 'Views', 'screen': 'Views', 'cell': 'Views',
+    'viewcontroller': 'ViewControllers', 'controller': 'ViewControllers', 'coordinator': 'ViewControllers',
+    'model': 'Models', 'entit': 'Models', 'dto': 'Models',
+    'viewmodel': 'ViewModels', 'presenter': 'ViewModels',
+    'service': 'Services', 'manager': 'Services', 'repositor': 'Services', 'usecase': 'Services',
+    'interactor': 'Services',
+    'network': 'Networking', 'api': 'Networking', 'endpoint': 'Networking',
+    'util': 'Utilities', 'helper': 'Utilities', 'extension': 'Utilities', 'common': 'Utilities',
+    'resource': 'Resources', 'asset': 'Resources', 'localization': 'Resources',
+}
+
+# Módulos externos cuya capa no se deduce del nombre
+MODULE_LAYERS = {
+    'Alamofire': 'Networking', 'Moya': 'Networking', 'Apollo': 'Networking',
+}
+
+# Frameworks de UI: indican una vista al clasificar un archivo sin sufijo ni directorio
+# conocido, pero no son una violación (los ViewModels, Models y Services usan UIImage o UIColor)
+UI_FRAMEWORKS = frozenset(('SwiftUI', 'UIKit', 'AppKit'))
+
+# Dependencias entre capas que se consideran una violación (capa del archivo -> capas que no debe importar)
+FORBIDDEN_DEPENDENCIES = {
+    'Views': ('Networking', 'Services'),
+    'ViewControllers': ('Networking',),
+    'ViewModels': ('Views', 'ViewControllers'),
+    'Models': ('Views', 'ViewControllers', 'ViewModels', 'Services', 'Networking'),
+    'Services': ('Views', 'ViewControllers', 'ViewModels'),
+    'Networking': ('Views', 'ViewControllers', 'ViewModels'),
+}
+
+# Clave de los nodos del trie que guarda la capa (los caracteres nunca son la cadena vacía)
+_LAYER = ''
+
+
+def _build_trie(patterns: Dict[str, str], reverse: bool = False) -> dict:
+    """Trie de diccionarios anidados; con reverse=True se insertan los patrones al revés (sufijos)"""
+    root = {}
+    for pattern, layer in patterns.items():
+        node = root
+        for char in (reversed(pattern) if reverse else pattern):
+            node = node.setdefault(char, {})
+        node[_LAYER] = layer
+    return root
+
+
+def _longest_match(trie: dict, chars: Iterable[str]) -> Optional[str]:
+    """Capa del patrón más largo del trie que es prefijo de chars"""
+    node = trie
+    layer = None
+    for char in chars:
+        node = node.get(char)
+        if node is None:
+            break
+        layer = node.get(_LAYER, layer)
+    return layer
+
+
+class LayerClassifier:
+    """
+    Clasificación heurística de archivos Swift en capas de arquitectura.
+    Para cada archivo se prueba, por orden:
+    1. El sufijo del nombre (trie de sufijos, el más largo gana).
+    2. El directorio más profundo cuyo nombre empieza por un prefijo conocido
+       (trie de prefijos; cada directorio se clasifica una sola vez).
+    3. Los módulos que importa (p.ej. un archivo que solo importa SwiftUI es una vista).
+       Los frameworks de UI solo cuentan aquí, nunca en las violaciones.
+    Los tries se construyen una vez, así que clasificar cada archivo cuesta lo que
+    mide su nombre y no el número de reglas.
+    """
+
+    def __init__(self):
+        self.suffix_trie = _build_trie(FILE_SUFFIXES, reverse=True)
+        self.prefix_trie = _build_trie(DIRECTORY_PREFIXES)
+        self._directory_layers = {}
+        self._module_layers = dict(MODULE_LAYERS)
+
+    def file_name_layer(self, file_name: str) -> Optional[str]:
+        stem = file_name[:-len('.swift')] if file_name.endswith('.swift') else file_name
+        # Las extensiones (Tipo+Extra.swift) son utilidades salvo que el sufijo diga otra cosa
+        layer = _longest_match(self.suffix_trie, reversed(stem))
+        if layer is None and '+' in stem:
+            return 'Utilities'
+        return layer
+
+    def directory_layer(self, directory: str) -> Optional[str]:
+        """Capa del componente más profundo del directorio con un prefijo conocido"""
+        layer = self._directory_layers.get(directory)
+        if layer is None and directory not in self._directory_layers:
+            parent, name = os.path.split(directory)
+            layer = _longest_match(self.prefix_trie, name.lower()) if name else None
+            if layer is None and parent and parent != directory:
+                layer = self.directory_layer(parent)
+            self._directory_layers[directory] = layer
+        return layer
+
+    def module_layer(self, module: str) -> Optional[str]:
+        """Capa de un módulo importado, deducida de su nombre como si fuera un archivo o un directorio"""
+        if module not in self._module_layers:
+            self._module_layers[module] = (
+                _longest_match(self.suffix_trie, reversed(module))
+                or _longest_match(self.prefix_trie, module.lower())
+            )
+        return self._module_layers[module]
+
+    def classify(self, path: str, imports: Iterable[str] = ()) -> str:
+        """Capa de un archivo a partir de su ruta y los módulos que importa"""
+        directory, file_name = os.path.split(path)
+        layer = self.file_name_layer(file_name) or self.directory_layer(directory)
+        if layer is None:
+            import_layers = {
+                'Views' if module in UI_FRAMEWORKS else self.module_layer(module) for module in imports
+            } - {None}
+            if len(import_layers) == 1:
+                layer = import_layers.pop()
+        return layer or 'Other'
+
+    def violations(self, layer: str, imports: Iterable[str]) -> List[Tuple[str, str]]:
+        """(módulo, capa) de los import que la capa del archivo no debería tener"""
+        forbidden = FORBIDDEN_DEPENDENCIES.get(layer, ())
+        result = []
+        for module in imports:
+            module_layer = self.module_layer(module)
+            if module_layer in forbidden:
+                result.append((module, module_layer))
+        return result
+
+    def classify_files(self, imports_map: Dict[str, List[str]]) -> Dict:
+        """
+        Clasifica todos los archivos en una pasada.
+        Args:
+            imports_map (dict): Archivo -> módulos que importa
+        Returns:
+            dict: {'layers': {capa: [archivos]}, 'violations': [{'from', 'to', 'count', 'files': {archivo: [módulos]}}]}
+        """
+        layers = {layer: [] for layer in LAYERS}
+        violations = {}
+        for path in sorted(imports_map):
+            imports = imports_map[path]
+            layer = self.classify(path, imports)
+            layers[layer].append(path)
+            for module, module_layer in self.violations(layer, imports):
+                violation = violations.setdefault((layer, module_layer), {
+                    'from': layer, 'to': module_layer, 'count': 0, 'files': {}
+                })
+                if path not in violation['files']:
+                    violation['count'] += 1
+                    violation['files'][path] = []
+                violation['files'][path].append(module)
+        return {
+            'layers': layers,
+            'violations': sorted(violations.values(), key=lambda violation: (-violation['count'], violation['from'], violation['to']))
+        }
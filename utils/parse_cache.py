@@ -0,0 +1,233 @@
+import os
+import copy
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+def _parse_safely(parse: Callable[[str], Any], file_path: str) -> Tuple[Any, Optional[str]]:
+    """Ejecuta parse en un proceso del pool; los errores vuelven como texto para no abortar el lote"""
+    try:
+        return parse(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+class ParseCache:
+    """
+    Caché persistente de resultados de parseo por archivo.
+    Cada entrada se identifica por la ruta del archivo y el parser que la generó,
+    y guarda la firma del archivo (tamaño y mtime) junto con un hash SHA-1 del
+    contenido. Si la firma no cambia, el resultado se reutiliza sin leer el
+    archivo; si solo cambia el mtime (p.ej. tras un checkout), se compara el hash.
+    """
+
+    # Incrementar cuando cambie la salida de algún parser para invalidar la caché
+    PARSER_VERSION = 6
+
+    # Margen en el que un archivo modificado justo al guardarse la entrada se verifica por hash
+    RACY_WINDOW_NS = 2 * 10**9
+
+    # Por debajo de este número de archivos a parsear no compensa arrancar procesos
+    MIN_PARALLEL_FILES = 8
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str): Archivo JSON de la caché. Sin ruta, la caché solo vive en memoria.
+        """
+        self.path = path
+        self.logger = self._setup_logging()
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def _setup_logging(self):
+        """Configura el sistema de logging"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+        return logging.getLogger(__name__)
+
+    def _load(self) -> dict:
+        """Carga las entradas del disco, descartándolas si son de otra versión de los parsers"""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Caché de parseo ilegible, se descarta: {str(e)}")
+            return {}
+
+        if data.get('parser_version') != self.PARSER_VERSION:
+            self.logger.info("🔁 Caché de parseo de otra versión de los parsers, se descarta")
+            return {}
+        return data.get('entries', {})
+
+    def _hash_file(self, file_path: str) -> str:
+        sha1 = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+    def _lookup(self, file_path: str, parser_key: str, verify_content: bool = True):
+        """
+        Busca el resultado en la caché. Con verify_content=False solo cuenta la firma:
+        un archivo con otro mtime se vuelve a parsear sin comparar su hash.
+        Returns:
+            tuple: (encontrado, resultado, clave, firma, hash). La firma es None si no
+            se puede leer el archivo; el hash solo se calcula si hizo falta compararlo.
+        """
+        key = f"{parser_key}:{file_path}"
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False, None, key, None, None
+        signature = [stat.st_size, stat.st_mtime_ns]
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+        digest = None
+        if entry is not None:
+            racy = stat.st_mtime_ns >= entry['checked_at_ns'] - self.RACY_WINDOW_NS
+            if entry['signature'] == signature and not racy:
+                self.hits += 1
+                return True, copy.deepcopy(entry['result']), key, signature, None
+            if verify_content and entry['signature'][0] == stat.st_size:
+                digest = self._hash_file(file_path)
+                if digest == entry['sha1']:
+                    self.hits += 1
+                    with self._lock:
+                        entry['signature'] = signature
+                        entry['checked_at_ns'] = time.time_ns()
+                        self._dirty = True
+                    return True, copy.deepcopy(entry['result']), key, signature, digest
+        return False, None, key, signature, digest
+
+    def _store(self, key: str, signature: list, digest: str, result: Any) -> Any:
+        """Guarda un resultado recién parseado y retorna una copia para el llamador"""
+        # Se guarda una copia normalizada a JSON (las tuplas pasan a listas, igual que al recargarla)
+        result = json.loads(json.dumps(result))
+        with self._lock:
+            self._entries[key] = {
+                'signature': signature,
+                'sha1': digest,
+                'checked_at_ns': time.time_ns(),
+                'result': result
+            }
+            self._dirty = True
+        return copy.deepcopy(result)
+
+    def get_or_parse(self, file_path: str, parser_key: str, parse: Callable[[str], Any]) -> Any:
+        """
+        Retorna el resultado de parse(file_path), reutilizando el de la caché si el
+        archivo no ha cambiado desde la última ejecución.
+        Args:
+            file_path (str): Archivo a parsear
+            parser_key (str): Identificador del parser (un mismo archivo puede tener varios)
+            parse (callable): Función que parsea el archivo; su resultado debe ser serializable en JSON
+        """
+        file_path = os.path.abspath(file_path)
+        found, result, key, signature, digest = self._lookup(file_path, parser_key)
+        if found:
+            return result
+        if signature is None:
+            return parse(file_path)
+
+        self.misses += 1
+        # El hash se calcula antes de parsear: si el archivo cambia entre medias, la
+        # siguiente ejecución verá otra firma y volverá a parsearlo
+        digest = digest or self._hash_file(file_path)
+        return self._store(key, signature, digest, parse(file_path))
+
+    def get_or_parse_many(self, file_paths: Sequence[str], parser_key: str, parse: Callable[[str], Any],
+                          jobs: int = 1, verify_content: bool = True) -> Tuple[List[Any], Dict[str, str]]:
+        """
+        Versión por lotes de get_or_parse: los archivos que no están en la caché se
+        parsean en un pool de procesos. Los resultados se retornan en el mismo orden
+        que file_paths, independientemente del número de procesos.
+        Args:
+            file_paths (list): Archivos a parsear
+            parser_key (str): Identificador del parser
+            parse (callable): Función de nivel de módulo (se envía a otros procesos)
+            jobs (int): Procesos para parsear en paralelo (1 = en este proceso)
+            verify_content (bool): Guardar y comparar el hash del contenido. Sin él, la
+                caché depende solo del tamaño y el mtime y no lee los archivos enteros
+                (útil cuando el parser solo lee una parte de cada archivo)
+        Returns:
+            tuple: (resultados, {archivo: error}); los archivos con error tienen None como resultado
+        """
+        results = [None] * len(file_paths)
+        errors = {}
+        pending = []
+        for index, file_path in enumerate(file_paths):
+            file_path = os.path.abspath(file_path)
+            found, result, key, signature, digest = self._lookup(file_path, parser_key, verify_content)
+            if found:
+                results[index] = result
+                continue
+            if signature is not None:
+                self.misses += 1
+                if verify_content:
+                    digest = digest or self._hash_file(file_path)
+            pending.append((index, file_path, key, signature, digest))
+
+        if not pending:
+            return results, errors
+
+        paths = [file_path for _, file_path, _, _, _ in pending]
+        outcomes = None
+        if jobs > 1 and len(paths) >= self.MIN_PARALLEL_FILES:
+            workers = min(jobs, len(paths))
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    outcomes = list(executor.map(_parse_safely, repeat(parse), paths,
+                                                 chunksize=max(1, len(paths) // (workers * 4))))
+                self.logger.info(f"⚙️ {len(paths)} archivos parseados en {workers} procesos")
+            except (BrokenProcessPool, OSError) as e:
+                self.logger.warning(f"⚠️ No se pudo usar el pool de procesos, se parsea en serie: {str(e)}")
+        if outcomes is None:
+            outcomes = [_parse_safely(parse, file_path) for file_path in paths]
+
+        for (index, file_path, key, signature, digest), (result, error) in zip(pending, outcomes):
+            if error is not None:
+                errors[file_path] = error
+            elif signature is None:
+                results[index] = result
+            else:
+                results[index] = self._store(key, signature, digest, result)
+        return results, errors
+
+    def save(self):
+        """Escribe la caché en disco (de forma atómica) si ha cambiado"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                self.logger.info(f"📦 Caché de parseo sin cambios: {self.hits} archivos reutilizados")
+                return
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'parser_version': self.PARSER_VERSION, 'entries': self._entries}, f)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except Exception as e:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                self.logger.error(f"❌ Error guardando caché de parseo: {str(e)}")
+                return
+        self.logger.info(f"💾 Caché de parseo guardada: {self.hits} reutilizados, {self.misses} parseados")
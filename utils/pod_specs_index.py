@@ -0,0 +1,253 @@
+# spm_generator/utils/pod_specs_index.py
+
+import os
+import re
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .semver import latest_stable, latest_version
+
+# Shards del CDN de CocoaPods: cada línea es 'Pod/1.0.0/1.1.0/...'
+CDN_SHARD_PATTERN = re.compile(r'^all_pods_versions(?:_[0-9a-f])*\.txt$')
+
+# Directorios de reparto del repositorio Specs (Specs/0/3/5/Pod/1.0.0/)
+SHARD_DIR_PATTERN = re.compile(r'^[0-9a-f]$')
+
+# Máximo de parámetros por consulta (límite por defecto de SQLite antiguo: 999)
+QUERY_CHUNK_SIZE = 500
+
+
+class PodSpecsIndex:
+    """
+    Índice local de versiones de pods compilado en SQLite a partir de un checkout
+    del repositorio CocoaPods/Specs o de un directorio de shards del CDN
+    (all_pods_versions_*.txt). Responde "última versión de X" sin red con una
+    consulta por clave primaria.
+    El índice se recompila solo cuando cambia la firma del origen (commit de git o
+    tamaño/fecha de los shards).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pods (
+            name TEXT PRIMARY KEY COLLATE NOCASE,
+            latest TEXT,
+            latest_stable TEXT,
+            versions TEXT NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, source: str, index_path: Optional[str] = None):
+        """
+        Args:
+            source (str): Checkout de CocoaPods/Specs (o su carpeta Specs) o directorio de shards del CDN
+            index_path (str): Archivo SQLite del índice compilado
+        """
+        self.source = os.path.abspath(source)
+        self.index_path = index_path or os.path.join('results', 'pod_specs_index.sqlite')
+        self.logger = self._setup_logging()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _setup_logging(self):
+        """Configura el sistema de logging"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+        return logging.getLogger(__name__)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False)
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    # Origen
+
+    def layout(self) -> str:
+        """'cdn' si el origen contiene shards all_pods_versions_*.txt, 'specs' en otro caso"""
+        if self._cdn_shards():
+            return 'cdn'
+        return 'specs'
+
+    def _cdn_shards(self) -> List[str]:
+        try:
+            return sorted(entry.path for entry in os.scandir(self.source)
+                          if entry.is_file() and CDN_SHARD_PATTERN.match(entry.name))
+        except OSError:
+            return []
+
+    def _specs_root(self) -> str:
+        """Carpeta Specs del checkout (se admite tanto la raíz del repositorio como la propia carpeta)"""
+        specs = os.path.join(self.source, 'Specs')
+        return specs if os.path.isdir(specs) else self.source
+
+    def _git_head(self) -> Optional[str]:
+        """Commit actual del checkout de Specs, leído de .git sin lanzar git"""
+        git_dir = os.path.join(self.source, '.git')
+        try:
+            with open(os.path.join(git_dir, 'HEAD'), 'r') as f:
+                head = f.read().strip()
+            if not head.startswith('ref: '):
+                return head
+            ref = head[5:]
+            ref_path = os.path.join(git_dir, ref)
+            if os.path.exists(ref_path):
+                with open(ref_path, 'r') as f:
+                    return f.read().strip()
+            with open(os.path.join(git_dir, 'packed-refs'), 'r') as f:
+                for line in f:
+                    if line.rstrip().endswith(f' {ref}'):
+                        return line.split(' ', 1)[0]
+        except OSError:
+            pass
+        return None
+
+    def source_signature(self) -> str:
+        """Firma del origen: cambia cuando hay que recompilar el índice"""
+        sha1 = hashlib.sha1()
+        shards = self._cdn_shards()
+        if shards:
+            for path in shards:
+                stat = os.stat(path)
+                sha1.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+            return f"cdn:{sha1.hexdigest()}"
+
+        head = self._git_head()
+        if head:
+            return f"git:{head}"
+
+        # Sin git: fecha de modificación de los directorios de primer y segundo nivel
+        root = self._specs_root()
+        with os.scandir(root) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_dir():
+                    sha1.update(f"{entry.name}:{entry.stat().st_mtime_ns}\n".encode())
+                    with os.scandir(entry.path) as children:
+                        for child in sorted(children, key=lambda e: e.name):
+                            sha1.update(f"{child.name}:{child.stat().st_mtime_ns}\n".encode())
+        return f"dir:{sha1.hexdigest()}"
+
+    def _read_cdn(self) -> Iterator[Tuple[str, List[str]]]:
+        for path in self._cdn_shards():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    fields = line.strip().split('/')
+                    if len(fields) > 1 and fields[0]:
+                        yield fields[0], fields[1:]
+
+    def _read_specs(self) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Recorre Specs/<shards>/<Pod>/<versión>/. Los directorios de un solo carácter
+        hexadecimal son niveles de reparto; el resto son pods cuyos subdirectorios
+        son versiones (se admite también el formato antiguo sin reparto).
+        """
+        stack = [self._specs_root()]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    subdirectories = [entry for entry in entries if entry.is_dir() and not entry.name.startswith('.')]
+            except OSError:
+                continue
+            for entry in subdirectories:
+                if SHARD_DIR_PATTERN.match(entry.name):
+                    stack.append(entry.path)
+                    continue
+                try:
+                    with os.scandir(entry.path) as versions:
+                        names = [version.name for version in versions if version.is_dir()]
+                except OSError:
+                    continue
+                if names:
+                    yield entry.name, names
+
+    # Compilación
+
+    def build(self, force: bool = False) -> bool:
+        """
+        Compila el índice si el origen ha cambiado desde la última compilación.
+        Returns:
+            bool: True si se ha recompilado
+        """
+        if not os.path.isdir(self.source):
+            raise FileNotFoundError(f"No existe el directorio de specs: {self.source}")
+
+        signature = self.source_signature()
+        with self._lock:
+            conn = self._connect()
+            meta = dict(conn.execute('SELECT key, value FROM meta'))
+            if not force and meta.get('source') == self.source and meta.get('signature') == signature:
+                self.logger.info(f"📚 Índice de specs al día: {meta.get('pods')} pods ({self.index_path})")
+                return False
+
+            start = time.perf_counter()
+            layout = self.layout()
+            pods = self._read_cdn() if layout == 'cdn' else self._read_specs()
+            rows = (
+                (name, latest_version(versions), latest_stable(versions), ' '.join(versions))
+                for name, versions in pods
+            )
+
+            with conn:
+                conn.execute('DELETE FROM pods')
+                conn.executemany('INSERT OR REPLACE INTO pods VALUES (?, ?, ?, ?)', rows)
+                count = conn.execute('SELECT COUNT(*) FROM pods').fetchone()[0]
+                conn.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)', [
+                    ('source', self.source),
+                    ('signature', signature),
+                    ('layout', layout),
+                    ('pods', str(count))
+                ])
+
+        self.logger.info(f"📚 Índice de specs compilado ({layout}): {count} pods en "
+                         f"{time.perf_counter() - start:.1f}s -> {self.index_path}")
+        return True
+
+    # Consultas
+
+    def latest_version(self, pod_name: str, include_prereleases: bool = True) -> Optional[str]:
+        """Última versión de un pod (o de su spec base si es un subspec)"""
+        return self.latest_versions([pod_name], include_prereleases).get(pod_name)
+
+    def latest_versions(self, pod_names: Iterable[str], include_prereleases: bool = True) -> Dict[str, str]:
+        """Últimas versiones de varios pods con una consulta por bloque de nombres"""
+        column = 'latest' if include_prereleases else 'latest_stable'
+        requested = {}
+        for pod_name in pod_names:
+            requested.setdefault(pod_name.split('/')[0].lower(), []).append(pod_name)
+
+        results = {}
+        names = list(requested)
+        with self._lock:
+            conn = self._connect()
+            for i in range(0, len(names), QUERY_CHUNK_SIZE):
+                chunk = names[i:i + QUERY_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                query = f'SELECT name, {column} FROM pods WHERE name IN ({placeholders})'
+                for name, version in conn.execute(query, chunk):
+                    if version:
+                        for pod_name in requested.get(name.lower(), []):
+                            results[pod_name] = version
+        return results
+
+    def versions(self, pod_name: str) -> List[str]:
+        """Todas las versiones publicadas de un pod"""
+        with self._lock:
+            row = self._connect().execute('SELECT versions FROM pods WHERE name = ?',
+                                          (pod_name.split('/')[0],)).fetchone()
+        return row[0].split(' ') if row else []
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
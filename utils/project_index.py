@@ -0,0 +1,187 @@
+import os
+import logging
+from typing import Dict, List, Optional
+
+class ProjectIndex:
+    """
+    Índice de los archivos relevantes del proyecto.
+    Recorre el árbol una sola vez con os.scandir (aplicando las mismas reglas de
+    exclusión para todos) y guarda las rutas de Package.swift, .xcodeproj,
+    Package.resolved, Podfile / Podfile.lock y archivos .swift. Todos los
+    analizadores consultan este índice en lugar de recorrer el proyecto.
+    """
+
+    IGNORE_DIRS = {'.git', 'build', 'DerivedData', 'Pods', '.build', '.swiftpm'}
+
+    def __init__(self, project_root: str, ignore_dirs: Optional[set] = None):
+        self.project_root = os.path.abspath(project_root)
+        self.ignore_dirs = set(ignore_dirs) if ignore_dirs is not None else set(self.IGNORE_DIRS)
+        self.logger = self._setup_logging()
+        self._built = False
+        self._podfile_lock = None
+        self._podfile_lock_searched = False
+
+        self.package_manifests = []      # Rutas de Package.swift
+        self.xcodeprojs = []             # Directorios .xcodeproj
+        self.pbxproj_files = []          # project.pbxproj dentro de cada .xcodeproj
+        self.package_resolved_files = [] # Package.resolved (raíz, .swiftpm y .xcodeproj)
+        self.podfiles = []
+        self.podfile_locks = []
+        self.swift_files = {}            # Directorio -> nombres de archivos .swift
+
+    def _setup_logging(self):
+        """Configura el sistema de logging"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+        return logging.getLogger(__name__)
+
+    def build(self) -> 'ProjectIndex':
+        """Recorre el proyecto (solo la primera vez) y construye el índice"""
+        if self._built:
+            return self
+
+        self.logger.info(f"🗂️ Indexando proyecto: {self.project_root}")
+        file_count = 0
+        pending = [self.project_root]
+
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            except OSError as e:
+                self.logger.warning(f"⚠️ No se pudo leer {directory}: {str(e)}")
+                continue
+
+            subdirectories = []
+            swift_files = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name.endswith('.xcodeproj'):
+                        self._index_xcodeproj(entry.path)
+                    elif entry.name not in self.ignore_dirs:
+                        subdirectories.append(entry.path)
+                    continue
+
+                file_count += 1
+                name = entry.name
+                if name.endswith('.swift'):
+                    if name == 'Package.swift':
+                        self.package_manifests.append(entry.path)
+                    swift_files.append(name)
+                elif name == 'Package.resolved' and directory == self.project_root:
+                    self.package_resolved_files.append(entry.path)
+                elif name == 'Podfile':
+                    self.podfiles.append(entry.path)
+                elif name == 'Podfile.lock':
+                    self.podfile_locks.append(entry.path)
+
+            if swift_files:
+                self.swift_files[directory] = swift_files
+
+            # Orden inverso para que la pila visite los subdirectorios en orden alfabético
+            pending.extend(reversed(subdirectories))
+
+        # El Package.resolved de .swiftpm en la raíz se usa aunque .swiftpm esté excluido
+        swiftpm_resolved = os.path.join(self.project_root, '.swiftpm', 'Package.resolved')
+        if os.path.isfile(swiftpm_resolved):
+            self.package_resolved_files.append(swiftpm_resolved)
+
+        self._built = True
+        self.logger.info(
+            f"✅ Índice construido: {file_count} archivos, {len(self.package_manifests)} Package.swift, "
+            f"{len(self.xcodeprojs)} .xcodeproj, {sum(len(f) for f in self.swift_files.values())} archivos Swift"
+        )
+        return self
+
+    def _index_xcodeproj(self, path: str):
+        """Registra un .xcodeproj sin recorrerlo: solo interesan su pbxproj y su Package.resolved"""
+        self.xcodeprojs.append(path)
+        pbxproj_path = os.path.join(path, 'project.pbxproj')
+        if os.path.isfile(pbxproj_path):
+            self.pbxproj_files.append(pbxproj_path)
+        resolved_path = self.xcodeproj_package_resolved(path)
+        if os.path.isfile(resolved_path):
+            self.package_resolved_files.append(resolved_path)
+
+    @staticmethod
+    def xcodeproj_package_resolved(xcodeproj_path: str) -> str:
+        """Ruta del Package.resolved de un .xcodeproj"""
+        return os.path.join(xcodeproj_path, 'project.xcworkspace', 'xcshareddata', 'swiftpm', 'Package.resolved')
+
+    def find_package_manifests(self) -> List[str]:
+        return list(self.build().package_manifests)
+
+    def find_xcodeprojs(self) -> List[str]:
+        return list(self.build().xcodeprojs)
+
+    def find_pbxproj_files(self) -> List[str]:
+        return list(self.build().pbxproj_files)
+
+    def find_package_resolved_files(self) -> List[str]:
+        return list(self.build().package_resolved_files)
+
+    def find_podfile_lock(self) -> Optional[str]:
+        """
+        Busca el Podfile.lock del proyecto: primero en la raíz y después en los
+        directorios padre (el resultado se memoriza).
+        """
+        if not self._podfile_lock_searched:
+            self._podfile_lock_searched = True
+            root_lock = os.path.join(self.project_root, 'Podfile.lock')
+            if root_lock in self.build().podfile_locks:
+                self._podfile_lock = root_lock
+            else:
+                current_dir = os.path.dirname(self.project_root)
+                while True:
+                    lock_path = os.path.join(current_dir, 'Podfile.lock')
+                    if os.path.isfile(lock_path):
+                        self._podfile_lock = lock_path
+                        break
+                    parent_dir = os.path.dirname(current_dir)
+                    if parent_dir == current_dir:
+                        break
+                    current_dir = parent_dir
+        return self._podfile_lock
+
+    def swift_files_under(self, directory: str) -> Dict[str, List[str]]:
+        """Retorna los directorios (dentro de 'directory') que contienen archivos .swift"""
+        directory = os.path.abspath(directory)
+        prefix = directory.rstrip(os.sep) + os.sep
+        return {
+            path: list(files) for path, files in self.build().swift_files.items()
+            if path == directory or path.startswith(prefix)
+        }
+
+    def assign_swift_files(self, directories: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Reparte los directorios con archivos .swift entre los directorios indicados:
+        cada uno se asigna al más cercano de sus ancestros (incluido él mismo). Sube
+        por los padres de cada directorio en lugar de filtrar el índice por cada uno.
+        Returns:
+            dict: Directorio indicado -> {directorio: archivos .swift}
+        """
+        owners = {os.path.abspath(directory): {} for directory in directories}
+        root_length = len(self.project_root)
+        for path, files in self.build().swift_files.items():
+            current = path
+            while current not in owners:
+                parent = os.path.dirname(current)
+                if parent == current or len(parent) < root_length:
+                    current = None
+                    break
+                current = parent
+            if current is not None:
+                owners[current][path] = list(files)
+        return owners
+
+    def contains_swift_file(self, directory: str, file_name: str) -> bool:
+        """Indica si algún directorio dentro de 'directory' contiene el archivo .swift indicado"""
+        return any(file_name in files for files in self.swift_files_under(directory).values())
+
+    def covers(self, path: str) -> bool:
+        """Indica si la ruta está dentro del proyecto indexado"""
+        path = os.path.abspath(path)
+        return path == self.project_root or path.startswith(self.project_root.rstrip(os.sep) + os.sep)
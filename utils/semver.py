@@ -0,0 +1,127 @@
+# spm_generator/utils/semver.py
+
+import re
+from functools import lru_cache
+
+# Versión semántica con prefijo 'v' opcional, minor/patch opcionales, componentes
+# numéricos adicionales (p.ej. 8.15.0.1), pre-release (-beta.1) y build (+build.5)
+VERSION_PATTERN = re.compile(
+    r'^[vV]?(?P<major>\d+)(?:\.(?P<minor>\d+))?(?:\.(?P<patch>\d+))?(?P<extra>(?:\.\d+)*)'
+    r'(?:-(?P<prerelease>[0-9A-Za-z.-]+))?(?:\+(?P<build>[0-9A-Za-z.-]+))?$'
+)
+
+
+class Version:
+    """
+    Versión parseada de un tag.
+    Se ordena según la precedencia de SemVer: una pre-release es menor que la
+    versión estable correspondiente y los metadatos de build no se comparan.
+    """
+
+    __slots__ = ('original', 'major', 'minor', 'patch', 'extra', 'prerelease', 'build', 'key')
+
+    def __init__(self, original, major, minor, patch, extra=(), prerelease=(), build=None):
+        self.original = original
+        self.major = major
+        self.minor = minor
+        self.patch = patch
+        self.extra = extra
+        self.prerelease = prerelease
+        self.build = build
+        # Las estables (1,) quedan por encima de cualquier pre-release (0, ...)
+        release_key = (0,) + tuple(
+            (0, int(part), '') if part.isdigit() else (1, 0, part) for part in prerelease
+        ) if prerelease else (1,)
+        self.key = (major, minor, patch, extra, release_key)
+
+    @property
+    def is_prerelease(self):
+        return bool(self.prerelease)
+
+    def __eq__(self, other):
+        return isinstance(other, Version) and self.key == other.key
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+    def __le__(self, other):
+        return self.key <= other.key
+
+    def __gt__(self, other):
+        return self.key > other.key
+
+    def __ge__(self, other):
+        return self.key >= other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __str__(self):
+        return self.original
+
+    def __repr__(self):
+        return f"Version({self.original!r})"
+
+
+@lru_cache(maxsize=4096)
+def parse_version(text):
+    """
+    Parsea un tag de versión.
+    Args:
+        text (str): Tag (ej: "v1.2.3", "5.7.0-beta.1", "1.0.0+build.5")
+    Returns:
+        Version: Versión parseada, o None si el tag no es una versión
+    """
+    if not text:
+        return None
+    match = VERSION_PATTERN.match(text.strip())
+    if not match:
+        return None
+
+    extra = tuple(int(part) for part in match.group('extra').split('.') if part)
+    prerelease = tuple(match.group('prerelease').split('.')) if match.group('prerelease') else ()
+    return Version(
+        text,
+        int(match.group('major')),
+        int(match.group('minor') or 0),
+        int(match.group('patch') or 0),
+        extra,
+        prerelease,
+        match.group('build')
+    )
+
+
+def sort_versions(tags):
+    """
+    Ordena los tags de mayor a menor versión, descartando los que no son versiones.
+    Returns:
+        list: Tags originales ordenados (sin duplicados)
+    """
+    versions = {}
+    for tag in tags:
+        version = parse_version(tag)
+        if version is not None and version not in versions:
+            versions[version] = tag
+    return [versions[version] for version in sorted(versions, reverse=True)]
+
+
+def latest_stable(tags):
+    """Retorna el tag estable más alto, o None si no hay ninguno"""
+    versions = [version for version in map(parse_version, tags) if version and not version.is_prerelease]
+    return max(versions).original if versions else None
+
+
+def latest_version(tags):
+    """Retorna el tag estable más alto o, si solo hay pre-releases, la pre-release más alta"""
+    stable = latest_stable(tags)
+    if stable:
+        return stable
+    versions = [version for version in map(parse_version, tags) if version]
+    return max(versions).original if versions else None
+
+
+def latest_in_major(tags, major, include_prereleases=False):
+    """Retorna el tag más alto dentro de una versión major (ej: la última 5.x)"""
+    versions = [version for version in map(parse_version, tags)
+                if version and version.major == major and (include_prereleases or not version.is_prerelease)]
+    return max(versions).original if versions else None
@@ -0,0 +1,294 @@
+# spm_generator/utils/version_cache.py
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+# Campos de una entrada de caché que tienen columna propia en SQLite.
+# El resto de campos se guardan serializados en la columna 'extra'.
+ENTRY_COLUMNS = ('version', 'timestamp', 'source', 'etag', 'last_modified')
+
+
+class JSONVersionCache:
+    """
+    Backend de caché de versiones basado en un único archivo JSON (formato histórico).
+    Las escrituras se acumulan en memoria y el archivo completo se reescribe de
+    forma atómica una sola vez por lote, en flush() o close().
+    """
+
+    def __init__(self, path, cache_duration, negative_cache_duration=None):
+        """
+        Args:
+            path (str): Ruta del archivo JSON
+            cache_duration (timedelta): TTL de las entradas
+            negative_cache_duration (timedelta): TTL de las entradas negativas ("N/A")
+        """
+        self.path = path
+        self.cache_duration = cache_duration
+        self.negative_cache_duration = negative_cache_duration or cache_duration
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._dirty = False
+
+    def _load(self):
+        """Carga el archivo JSON completo en memoria"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"\n❌ Error cargando caché: {str(e)}")
+            return {}
+
+    def _write(self):
+        """Reescribe el archivo en un temporal y lo renombra, para no dejarlo a medias"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, url):
+        """Retorna una copia de la entrada de la URL, o None si no existe"""
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+
+    def set(self, url, entry):
+        """Guarda (o reemplaza) la entrada de la URL; se escribe en disco en el siguiente flush()"""
+        with self._lock:
+            self._entries[url] = dict(entry)
+            self._dirty = True
+
+    def flush(self):
+        """Escribe en disco las entradas pendientes, si las hay"""
+        with self._lock:
+            if self._dirty:
+                self._write()
+                self._dirty = False
+
+    def items(self):
+        """Retorna una lista de pares (url, entrada)"""
+        with self._lock:
+            return [(url, dict(entry)) for url, entry in self._entries.items()]
+
+    def purge_expired(self, grace=timedelta(days=30)):
+        """
+        Elimina de memoria las entradas expiradas hace más de 'grace', con el TTL de
+        cada una (más corto para las negativas). Se escriben en el siguiente flush().
+        Retorna cuántas se eliminaron.
+        """
+        limit = datetime.now() - grace
+        with self._lock:
+            expired = []
+            for url, entry in self._entries.items():
+                # Las entradas sin un timestamp válido (antiguas o editadas a mano) se descartan
+                try:
+                    ttl = self.negative_cache_duration if entry.get('negative') else self.cache_duration
+                    if datetime.fromisoformat(entry['timestamp']) + ttl < limit:
+                        expired.append(url)
+                except (AttributeError, KeyError, TypeError, ValueError):
+                    print(f"  ❌ Entrada de caché inválida descartada: {url}")
+                    expired.append(url)
+            for url in expired:
+                del self._entries[url]
+            if expired:
+                self._dirty = True
+        return len(expired)
+
+    def close(self):
+        self.flush()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteVersionCache:
+    """
+    Backend de caché de versiones sobre SQLite en modo WAL.
+    Cada entrada se escribe con un upsert por URL, de modo que varios procesos
+    pueden compartir la misma base de datos sin reescribirla entera.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS versions (
+            url TEXT PRIMARY KEY,
+            version TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            source TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            extra TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_versions_expires_at ON versions (expires_at);
+    """
+
+    def __init__(self, path, cache_duration, negative_cache_duration=None, migrate_from=None):
+        """
+        Args:
+            path (str): Ruta del archivo SQLite
+            cache_duration (timedelta): TTL de las entradas
+            negative_cache_duration (timedelta): TTL de las entradas negativas ("N/A")
+            migrate_from (str): Archivo version_cache.json a importar si la base está vacía
+        """
+        self.path = path
+        self.cache_duration = cache_duration
+        self.negative_cache_duration = negative_cache_duration or cache_duration
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+
+        if migrate_from:
+            self.migrate_from_json(migrate_from)
+
+    def _expires_at(self, entry):
+        """Calcula el instante de expiración (epoch) a partir del timestamp ISO de la entrada"""
+        ttl = self.negative_cache_duration if entry.get('negative') else self.cache_duration
+        return (datetime.fromisoformat(entry['timestamp']) + ttl).timestamp()
+
+    def _row_params(self, url, entry):
+        extra = {k: v for k, v in entry.items() if k not in ENTRY_COLUMNS}
+        return (
+            url,
+            entry['version'],
+            entry['timestamp'],
+            self._expires_at(entry),
+            entry.get('source'),
+            entry.get('etag'),
+            entry.get('last_modified'),
+            json.dumps(extra) if extra else None
+        )
+
+    def _row_to_entry(self, row):
+        version, timestamp, source, etag, last_modified, extra = row
+        entry = {'version': version, 'timestamp': timestamp}
+        if source:
+            entry['source'] = source
+        if etag:
+            entry['etag'] = etag
+        if last_modified:
+            entry['last_modified'] = last_modified
+        if extra:
+            entry.update(json.loads(extra))
+        return entry
+
+    def get(self, url):
+        """Retorna la entrada de la URL, o None si no existe"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT version, timestamp, source, etag, last_modified, extra FROM versions WHERE url = ?',
+                (url,)
+            ).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def set(self, url, entry):
+        """Inserta o actualiza la entrada de la URL"""
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO versions (url, version, timestamp, expires_at, source, etag, last_modified, extra)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    version = excluded.version,
+                    timestamp = excluded.timestamp,
+                    expires_at = excluded.expires_at,
+                    source = excluded.source,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    extra = excluded.extra
+                """,
+                self._row_params(url, entry)
+            )
+            self._conn.commit()
+
+    def items(self):
+        """Retorna una lista de pares (url, entrada)"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url, version, timestamp, source, etag, last_modified, extra FROM versions ORDER BY url'
+            ).fetchall()
+        return [(row[0], self._row_to_entry(row[1:])) for row in rows]
+
+    def flush(self):
+        """Cada set() ya se confirma en la base de datos"""
+
+    def purge_expired(self, grace=timedelta(days=30)):
+        """Elimina las entradas expiradas hace más de 'grace' usando el índice de expiración"""
+        limit = (datetime.now() - grace).timestamp()
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM versions WHERE expires_at < ?', (limit,))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def migrate_from_json(self, json_path):
+        """
+        Importa las entradas de un version_cache.json existente.
+        Solo se ejecuta si la base de datos está vacía; retorna el número de entradas importadas.
+        """
+        if not os.path.exists(json_path) or len(self) > 0:
+            return 0
+
+        try:
+            with open(json_path, 'r') as f:
+                cache_data = json.load(f)
+        except Exception as e:
+            print(f"  ❌ Error leyendo {json_path} para migrar: {str(e)}")
+            return 0
+
+        rows = []
+        for url, entry in cache_data.items():
+            try:
+                rows.append(self._row_params(url, entry))
+            except Exception as e:
+                print(f"  ❌ Entrada no migrada {url}: {str(e)}")
+
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO versions (url, version, timestamp, expires_at, source, etag, last_modified, extra)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            self._conn.commit()
+
+        print(f"  🔁 Migradas {len(rows)} entradas desde {json_path}")
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM versions').fetchone()[0]
+
+
+def create_version_cache(backend, results_dir, cache_duration, negative_cache_duration=None):
+    """
+    Crea el backend de caché de versiones indicado.
+    Args:
+        backend (str): 'json' o 'sqlite'
+        results_dir (str): Directorio donde se guardan los archivos de caché
+        cache_duration (timedelta): TTL de las entradas
+        negative_cache_duration (timedelta): TTL de las entradas negativas
+    """
+    json_path = os.path.join(results_dir, 'version_cache.json')
+    if backend == 'sqlite':
+        return SQLiteVersionCache(os.path.join(results_dir, 'version_cache.sqlite'), cache_duration,
+                                  negative_cache_duration, migrate_from=json_path)
+    if backend == 'json':
+        return JSONVersionCache(json_path, cache_duration, negative_cache_duration)
+    raise ValueError(f"Backend de caché no soportado: {backend}")
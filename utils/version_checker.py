@@ -1,18 +1,67 @@
 # spm_generator/utils/version_checker.py
 
 import os
-import json
-import re
-import requests
+import atexit
+import time
+import queue
+import threading
 from datetime import datetime, timedelta
+from urllib.parse import urlparse, quote
+from .http_session import HTTPSessionPool, CircuitOpenError
+from .version_cache import create_version_cache
+from .github_graphql import GitHubGraphQLClient
+from .semver import parse_version, sort_versions, latest_version, latest_stable, latest_in_major
+
+class CachePolicy:
+    """Políticas de uso de la caché de versiones"""
+    # Solo se usa la caché, nunca se consulta la red
+    OFFLINE = 'offline'
+    # Las entradas vigentes (dentro del TTL) evitan la consulta; las expiradas se revalidan
+    READ_THROUGH = 'read-through'
+    # Se ignora la caché y se consulta siempre la fuente (la caché se actualiza igualmente)
+    FORCE_REFRESH = 'refresh'
+
+    ALL = (OFFLINE, READ_THROUGH, FORCE_REFRESH)
 
 class VersionChecker:
-    def __init__(self, use_cache_only=False):
+    # Respuestas que confirman que un repositorio no tiene releases ni tags
+    NEGATIVE_STATUS_CODES = (200, 404, 410)
+    # Tamaño de página al listar tags (máximo admitido por GitHub y GitLab)
+    TAGS_PER_PAGE = 100
+    
+    def __init__(self, cache_policy=CachePolicy.READ_THROUGH, max_workers=8, max_per_host=4, session_pool=None, cache_backend='json', max_tag_pages=5):
+        if cache_policy not in CachePolicy.ALL:
+            raise ValueError(f"Política de caché no soportada: {cache_policy}")
+        
         print("\n🔧 Inicializando VersionChecker")
-        print(f"  Mode: {'Solo Caché' if use_cache_only else 'Tiempo Real'}")
+        print(f"  Política de caché: {cache_policy}")
         
         # Guardar la configuración de caché
-        self.use_cache_only = use_cache_only
+        self.cache_policy = cache_policy
+        
+        # Endpoints de las APIs (configurables para apuntar a un servidor local)
+        self.github_api_url = os.environ.get('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+        self.gitlab_api_url = os.environ.get('GITLAB_API_URL', 'https://gitlab.com/api/v4').rstrip('/')
+        self.trunk_api_url = os.environ.get('COCOAPODS_TRUNK_URL', 'https://trunk.cocoapods.org/api/v1').rstrip('/')
+        
+        # Sesiones HTTP compartidas (keep-alive por host)
+        self.session_pool = session_pool or HTTPSessionPool(pool_size=max_per_host)
+        
+        # Con token de GitHub, las consultas en lote se resuelven por GraphQL
+        self.github_graphql = None
+        if os.environ.get('GITHUB_TOKEN'):
+            graphql_url = os.environ.get('GITHUB_GRAPHQL_URL', f'{self.github_api_url}/graphql')
+            self.github_graphql = GitHubGraphQLClient(self.session_pool, os.environ['GITHUB_TOKEN'], graphql_url)
+            print(f"  🔑 GraphQL de GitHub habilitado: {graphql_url}")
+        
+        # Configuración de la resolución concurrente
+        self.max_workers = max(1, max_workers)
+        self.max_per_host = max(1, max_per_host)
+        self._host_semaphores = {}
+        self._host_semaphores_lock = threading.Lock()
+        
+        # Páginas de tags que se descargan como máximo por repositorio
+        self.max_tag_pages = max(1, max_tag_pages)
         
         # Crear directorio results si no existe
         self.results_dir = "results"
@@ -20,138 +69,251 @@ class VersionChecker:
             os.makedirs(self.results_dir)
             print(f"  📁 Directorio '{self.results_dir}' creado")
         
-        self.cache_file = os.path.join(self.results_dir, 'version_cache.json')
-        print(f"  📝 Archivo de caché: {self.cache_file}")
-        
         self.cache_duration = timedelta(hours=24)
-        print(f"  ⏰ Duración de caché: {self.cache_duration}")
-        
-        self.version_cache = self._load_cache()
+        self.negative_cache_duration = timedelta(hours=1)
+        print(f"  ⏰ Duración de caché: {self.cache_duration} (negativa: {self.negative_cache_duration})")
         
-        print(f"  📦 Entradas en caché: {len(self.version_cache)}")
-        if len(self.version_cache) > 0:
-            print("  Dependencias en caché:")
-            for url, data in self.version_cache.items():
-                print(f"    - {url}: {data['version']} ({data['timestamp']})")
+        # Backend persistente de la caché ('json' o 'sqlite'), se abre en la primera consulta
+        self.cache_backend = cache_backend
+        self._cache = None
+        self._cache_init_lock = threading.Lock()
+
+    @property
+    def cache(self):
+        """Backend de caché, cargado de forma perezosa en el primer acceso"""
+        if self._cache is None:
+            with self._cache_init_lock:
+                if self._cache is None:
+                    self._cache = self._load_cache()
+        return self._cache
 
     def _load_cache(self):
-        """Cargar cache desde archivo"""
-        if self.use_cache_only:
-            try:
-                if os.path.exists(self.cache_file):
-                    print(f"\n📂 Cargando caché desde: {self.cache_file}")
-                    with open(self.cache_file, 'r') as f:
-                        cache_data = json.load(f)
-                        current_time = datetime.now()
-                        valid_cache = {}
-                        expired_entries = 0
-                        
-                        for key, value in cache_data.items():
-                            try:
-                                cached_time = datetime.fromisoformat(value['timestamp'])
-                                time_diff = current_time - cached_time
-                                
-                                if time_diff < self.cache_duration:
-                                    valid_cache[key] = value
-                                    print(f"  ✅ Entrada válida: {key}")
-                                    print(f"     Versión: {value['version']}")
-                                    print(f"     Edad: {time_diff}")
-                                else:
-                                    expired_entries += 1
-                                    print(f"  ⏰ Entrada expirada: {key}")
-                                    print(f"     Edad: {time_diff}")
-                            except Exception as e:
-                                print(f"  ❌ Error procesando entrada {key}: {str(e)}")
-                        
-                        print(f"\n📊 Resumen de caché:")
-                        print(f"  Total entradas: {len(cache_data)}")
-                        print(f"  Entradas válidas: {len(valid_cache)}")
-                        print(f"  Entradas expiradas: {expired_entries}")
-                        
-                        return valid_cache
-                else:
-                    print(f"\n📝 No existe archivo de caché en: {self.cache_file}")
-                    print("  Se creará uno nuevo cuando se obtengan versiones")
-            except Exception as e:
-                print(f"\n❌ Error cargando caché: {str(e)}")
-        else:
-            print("\n🔄 Modo sin caché activado - Consultando versiones en tiempo real")
-        
-        return {}
+        """
+        Abre el backend de caché persistente y elimina las entradas caducadas hace tiempo.
+        Las entradas expiradas recientes se conservan junto con sus validadores HTTP
+        (ETag / Last-Modified) para poder revalidarlas con peticiones condicionales.
+        """
+        cache = create_version_cache(self.cache_backend, self.results_dir, self.cache_duration,
+                                     self.negative_cache_duration)
+        print(f"\n📂 Caché cargada ({self.cache_backend}): {getattr(cache, 'path', '')}")
+        
+        # Barrido de entradas expiradas hace tiempo (ya no merece la pena revalidarlas).
+        # En modo offline no se barre: las entradas expiradas son las únicas disponibles
+        if self.cache_policy != CachePolicy.OFFLINE:
+            purged = cache.purge_expired()
+            if purged:
+                print(f"  🧹 Eliminadas {purged} entradas caducadas")
+        
+        print(f"  📦 Entradas en caché: {len(cache)}")
+        
+        # Las consultas que terminan después del plazo de un lote se guardan al salir
+        atexit.register(self.flush_cache)
+        return cache
 
-    def _save_cache(self):
-        """Guardar cache en archivo"""
-        try:
-            print(f"\n💾 Guardando caché en: {self.cache_file}")
-            print(f"  Entradas a guardar: {len(self.version_cache)}")
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.version_cache, f, indent=2)
-            print("  ✅ Caché guardado exitosamente")
-        except Exception as e:
-            print(f"  ❌ Error guardando caché: {str(e)}")
+    def _is_fresh(self, cache_entry):
+        """Indica si una entrada de caché sigue dentro de su TTL (más corto para las negativas)"""
+        cache_time = datetime.fromisoformat(cache_entry['timestamp'])
+        ttl = self.negative_cache_duration if cache_entry.get('negative') else self.cache_duration
+        return datetime.now() - cache_time < ttl
 
-    def _cache_version(self, url, version):
-        """Guardar versión en cache"""
+    def _cache_version(self, url, version, source=None, response=None, tags=None):
+        """
+        Guardar versión en cache.
+        Si se indica la respuesta HTTP de la que se obtuvo, se guardan también el
+        endpoint consultado y sus validadores (ETag / Last-Modified).
+        La lista ordenada de tags permite responder consultas posteriores
+        (última estable, última de una major) sin nuevas peticiones.
+        """
         print(f"\n📝 Guardando versión en caché:")
         print(f"  URL: {url}")
         print(f"  Versión: {version}")
-        self.version_cache[url] = {
+        entry = {
             'version': version,
             'timestamp': datetime.now().isoformat()
         }
-        self._save_cache()
+        if source:
+            entry['source'] = source
+        if response is not None:
+            if response.headers.get('ETag'):
+                entry['etag'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                entry['last_modified'] = response.headers['Last-Modified']
+        if tags is not None:
+            entry['tags'] = tags
+        
+        try:
+            self.cache.set(url, entry)
+        except Exception as e:
+            print(f"  ❌ Error guardando caché: {str(e)}")
+
+    def _cache_negative(self, url, responses):
+        """
+        Guarda una entrada negativa ("N/A") cuando la fuente confirma que no hay
+        releases ni tags (p.ej. repositorio privado o eliminado).
+        Los fallos transitorios (403, 429, 5xx, timeouts) no se cachean.
+        """
+        if not all(response.status_code in self.NEGATIVE_STATUS_CODES for response in responses):
+            return
+        
+        print(f"🚫 Guardando resultado negativo en caché para {url} ({self.negative_cache_duration})")
+        try:
+            self.cache.set(url, {
+                'version': "N/A",
+                'timestamp': datetime.now().isoformat(),
+                'negative': True
+            })
+        except Exception as e:
+            print(f"  ❌ Error guardando caché: {str(e)}")
+
+    def _get_cache_entry(self, url):
+        """Retorna la entrada de caché de la URL (aunque esté expirada)"""
+        return self.cache.get(url)
+
+    def _refresh_cache_entry(self, url):
+        """Renueva el timestamp de una entrada revalidada con un 304 Not Modified"""
+        entry = self.cache.get(url)
+        if not entry:
+            return
+        entry['timestamp'] = datetime.now().isoformat()
+        try:
+            self.cache.set(url, entry)
+        except Exception as e:
+            print(f"  ❌ Error guardando caché: {str(e)}")
+
+    def _conditional_get(self, api_url, headers, cache_entry):
+        """
+        Realiza un GET condicional sobre api_url.
+        Solo se envían If-None-Match / If-Modified-Since cuando la entrada de caché
+        se obtuvo de ese mismo endpoint y no se está forzando el refresco.
+        Un 304 no consume cuota de rate limit en GitHub.
+        """
+        request_headers = dict(headers)
+        if (self.cache_policy != CachePolicy.FORCE_REFRESH and cache_entry
+                and cache_entry.get('source') == api_url):
+            if cache_entry.get('etag'):
+                request_headers['If-None-Match'] = cache_entry['etag']
+            if cache_entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = cache_entry['last_modified']
+        
+        return self.session_pool.get(api_url, headers=request_headers, timeout=5)
+
+    def _is_not_modified(self, response, api_url, cache_entry):
+        """Indica si la respuesta confirma que la versión en caché sigue vigente"""
+        return (response.status_code == 304 and cache_entry is not None
+                and cache_entry.get('source') == api_url)
+
+    def _fetch_tags(self, tags_url, headers, cache_entry):
+        """
+        Descarga la lista de tags paginada (como máximo max_tag_pages páginas).
+        La primera página se pide de forma condicional para poder revalidar la caché.
+        Returns:
+            tuple: (URL de la primera página, respuesta de la primera página, nombres de los tags)
+        """
+        first_page_url = f'{tags_url}?per_page={self.TAGS_PER_PAGE}'
+        response = self._conditional_get(first_page_url, headers, cache_entry)
+        print(f"📡 Estado de respuesta: {response.status_code}")
+        if response.status_code != 200:
+            return first_page_url, response, []
+        
+        page_items = response.json()
+        names = [tag['name'] for tag in page_items]
+        page = 1
+        while len(page_items) == self.TAGS_PER_PAGE and page < self.max_tag_pages:
+            page += 1
+            page_response = self.session_pool.get(f'{first_page_url}&page={page}', headers=headers, timeout=5)
+            if page_response.status_code != 200:
+                break
+            page_items = page_response.json()
+            names.extend(tag['name'] for tag in page_items)
+        
+        print(f"🏷️ {len(names)} tags en {page} página(s)")
+        return first_page_url, response, names
+
+    def _select_from_tags(self, url, names, source, response):
+        """
+        Elige la versión más alta de una lista de tags y la guarda en caché junto
+        con la lista ordenada. Si ningún tag es una versión, se usa el primero.
+        Returns:
+            str: Versión elegida, o None si la lista está vacía
+        """
+        tags = sort_versions(names)
+        version = latest_version(tags) or (names[0] if names else None)
+        if version:
+            print(f"✅ Encontrada última versión por tags: {version}")
+            self._cache_version(url, version, source, response, tags=tags)
+        return version
 
     def get_latest_github_version(self, url):
-        """Obtener última versión de GitHub"""
+        """Obtener última versión de GitHub (tag más alto; si no hay tags, último release)"""
         try:
             print(f"\n🔍 Analizando URL de GitHub: {url}")
-            parts = url.replace("https://github.com/", "").replace(".git", "").split("/")
-            if len(parts) < 2:
+            repository = self._parse_github_repo(url)
+            if not repository:
                 print("❌ Formato de URL inválido")
                 return "N/A"
                 
-            owner, repo = parts[0], parts[1]
+            owner, repo = repository
             print(f"📂 Propietario: {owner}, Repositorio: {repo}")
-            
-            # Intentar obtener el último release
-            release_url = f'https://api.github.com/repos/{owner}/{repo}/releases/latest'
-            print(f"🌐 Consultando releases: {release_url}")
+            cache_entry = self._get_cache_entry(url)
             
             headers = {}
             if 'GITHUB_TOKEN' in os.environ:
                 headers['Authorization'] = f"token {os.environ['GITHUB_TOKEN']}"
                 print("🔑 Usando token de GitHub")
             
-            response = requests.get(release_url, headers=headers, timeout=5)
-            print(f"📡 Estado de respuesta: {response.status_code}")
-            print(f"   Contenido: {response.text[:200]}...")  # Mostrar los primeros 200 caracteres
+            # SPM resuelve contra los tags, así que la versión más alta sale de ellos
+            tags_url = f'{self.github_api_url}/repos/{owner}/{repo}/tags'
+            print(f"🌐 Consultando tags: {tags_url}")
             
-            if response.status_code == 200:
-                version = response.json()['tag_name']
-                print(f"✅ Encontrado último release: {version}")
+            tags_source, tags_response, names = self._fetch_tags(tags_url, headers, cache_entry)
+            
+            if self._is_not_modified(tags_response, tags_source, cache_entry):
+                print(f"♻️ Tags sin cambios (304), usando caché: {cache_entry['version']}")
+                self._refresh_cache_entry(url)
+                return cache_entry['version']
+            
+            version = self._select_from_tags(url, names, tags_source, tags_response)
+            if version:
                 return version
             
-            # Si no hay releases, intentar con tags
-            tags_url = f'https://api.github.com/repos/{owner}/{repo}/tags'
-            print(f"🌐 Consultando tags: {tags_url}")
+            # Sin tags, intentar con el último release
+            release_url = f'{self.github_api_url}/repos/{owner}/{repo}/releases/latest'
+            print(f"🌐 Consultando releases: {release_url}")
             
-            response = requests.get(tags_url, headers=headers, timeout=5)
+            response = self._conditional_get(release_url, headers, cache_entry)
             print(f"📡 Estado de respuesta: {response.status_code}")
-            print(f"   Contenido: {response.text[:200]}...")
             
-            if response.status_code == 200 and response.json():
-                version = response.json()[0]['name']
-                print(f"✅ Encontrado último tag: {version}")
+            if self._is_not_modified(response, release_url, cache_entry):
+                print(f"♻️ Release sin cambios (304), usando caché: {cache_entry['version']}")
+                self._refresh_cache_entry(url)
+                return cache_entry['version']
+            
+            print(f"   Contenido: {response.text[:200]}...")  # Mostrar los primeros 200 caracteres
+            
+            if response.status_code == 200:
+                version = response.json()['tag_name']
+                print(f"✅ Encontrado último release: {version}")
+                self._cache_version(url, version, release_url, response)
                 return version
             
             print("❌ No se encontraron releases ni tags")
+            self._cache_negative(url, (tags_response, response))
                 
+        except CircuitOpenError as e:
+            print(f"⛔ {str(e)}")
         except Exception as e:
             print(f"❌ Error obteniendo versión de GitHub: {str(e)}")
         return "N/A"
 
+    def _parse_github_repo(self, url):
+        """Retorna el par (owner, repo) de una URL de GitHub, o None si no es válida"""
+        parts = url.replace("https://github.com/", "").replace(".git", "").split("/")
+        if len(parts) < 2:
+            return None
+        return parts[0], parts[1]
+
     def get_latest_gitlab_version(self, url):
-        """Obtener última versión de GitLab"""
+        """Obtener última versión de GitLab (tag más alto; si no hay tags, release más alto)"""
         try:
             print(f"\n🔍 Analizando URL de GitLab: {url}")
             parts = url.replace("https://gitlab.com/", "").replace(".git", "").split("/")
@@ -163,61 +325,109 @@ class VersionChecker:
             encoded_project = f'{owner}%2F{repo}'
             print(f"📂 Propietario: {owner}, Repositorio: {repo}")
             print(f"🔧 ID de proyecto codificado: {encoded_project}")
+            cache_entry = self._get_cache_entry(url)
             
             headers = {}
             if 'GITLAB_TOKEN' in os.environ:
                 headers['PRIVATE-TOKEN'] = os.environ['GITLAB_TOKEN']
                 print("🔑 Usando token de GitLab")
             
-            # Intentar obtener el último release
-            release_url = f'https://gitlab.com/api/v4/projects/{encoded_project}/releases'
-            print(f"🌐 Consultando releases: {release_url}")
+            # Como en GitHub, la versión más alta sale de los tags
+            tags_url = f'{self.gitlab_api_url}/projects/{encoded_project}/repository/tags'
+            print(f"🌐 Consultando tags: {tags_url}")
             
-            response = requests.get(release_url, headers=headers, timeout=5)
-            print(f"📡 Estado de respuesta: {response.status_code}")
-            print(f"   Contenido: {response.text[:200]}...")
+            tags_source, tags_response, names = self._fetch_tags(tags_url, headers, cache_entry)
             
-            if response.status_code == 200 and response.json():
-                version = response.json()[0]['tag_name']
-                print(f"✅ Encontrado último release: {version}")
+            if self._is_not_modified(tags_response, tags_source, cache_entry):
+                print(f"♻️ Tags sin cambios (304), usando caché: {cache_entry['version']}")
+                self._refresh_cache_entry(url)
+                return cache_entry['version']
+            
+            version = self._select_from_tags(url, names, tags_source, tags_response)
+            if version:
                 return version
             
-            # Si no hay releases, intentar con tags
-            tags_url = f'https://gitlab.com/api/v4/projects/{encoded_project}/repository/tags'
-            print(f"🌐 Consultando tags: {tags_url}")
+            # Sin tags, intentar con el release más alto
+            release_url = f'{self.gitlab_api_url}/projects/{encoded_project}/releases'
+            print(f"🌐 Consultando releases: {release_url}")
             
-            response = requests.get(tags_url, headers=headers, timeout=5)
+            response = self._conditional_get(release_url, headers, cache_entry)
             print(f"📡 Estado de respuesta: {response.status_code}")
+            
+            if self._is_not_modified(response, release_url, cache_entry):
+                print(f"♻️ Releases sin cambios (304), usando caché: {cache_entry['version']}")
+                self._refresh_cache_entry(url)
+                return cache_entry['version']
+            
             print(f"   Contenido: {response.text[:200]}...")
             
             if response.status_code == 200 and response.json():
-                version = response.json()[0]['name']
-                print(f"✅ Encontrado último tag: {version}")
+                release_names = [release['tag_name'] for release in response.json()]
+                version = latest_version(release_names) or release_names[0]
+                print(f"✅ Encontrado último release: {version}")
+                self._cache_version(url, version, release_url, response)
                 return version
             
             print("❌ No se encontraron releases ni tags")
+            self._cache_negative(url, (tags_response, response))
                 
+        except CircuitOpenError as e:
+            print(f"⛔ {str(e)}")
         except Exception as e:
             print(f"❌ Error obteniendo versión de GitLab: {str(e)}")
         return "N/A"
 
+    def trunk_pod_url(self, pod_name):
+        """URL de la API de trunk de un pod; es también su clave en la caché de versiones"""
+        return f"{self.trunk_api_url}/pods/{quote(pod_name.split('/')[0], safe='')}"
+    
+    def get_latest_trunk_version(self, url):
+        """Obtener última versión publicada de un pod en CocoaPods trunk"""
+        try:
+            print(f"\n🔍 Consultando trunk: {url}")
+            cache_entry = self._get_cache_entry(url)
+            
+            response = self._conditional_get(url, {'Accept': 'application/json'}, cache_entry)
+            print(f"📡 Estado de respuesta: {response.status_code}")
+            
+            if self._is_not_modified(response, url, cache_entry):
+                print(f"♻️ Pod sin cambios (304), usando caché: {cache_entry['version']}")
+                self._refresh_cache_entry(url)
+                return cache_entry['version']
+            
+            if response.status_code == 200:
+                versions = response.json().get('versions', [])
+                names = [version['name'] for version in versions if version.get('name')]
+                tags = sort_versions(names)
+                # Si ningún nombre es una versión semántica, la publicada más recientemente
+                version = latest_version(tags) or max(
+                    versions, key=lambda v: v.get('created_at', ''), default={}).get('name')
+                if version:
+                    print(f"✅ Encontrada última versión del pod: {version}")
+                    self._cache_version(url, version, url, response, tags=tags)
+                    return version
+            
+            print("❌ No se encontraron versiones del pod")
+            self._cache_negative(url, (response,))
+        
+        except CircuitOpenError as e:
+            print(f"⛔ {str(e)}")
+        except Exception as e:
+            print(f"❌ Error obteniendo versión de trunk: {str(e)}")
+        return "N/A"
+
     def _parse_version(self, version):
         """
         Parsea una versión y retorna sus componentes major, minor y patch
         Args:
-            version (str): String de versión (ej: "v1.2.3" o "1.2.3")
+            version (str): String de versión (ej: "v1.2.3", "1.2.3" o "5.7.0-beta.1")
         Returns:
             tuple: (major, minor, patch) o None si no se puede parsear
         """
-        try:
-            version = version.lower().strip('v')
-            version_match = re.match(r'(\d+)\.(\d+)\.(\d+)', version)
-            if version_match:
-                major, minor, patch = map(int, version_match.groups())
-                return major, minor, patch
-            return None
-        except Exception:
+        parsed = parse_version(version.strip()) if isinstance(version, str) else None
+        if parsed is None:
             return None
+        return parsed.major, parsed.minor, parsed.patch
 
     def _get_version_status(self, current_version, latest_version, url):
         """
@@ -286,21 +496,215 @@ class VersionChecker:
     def get_latest_version(self, url):
         """Obtener última versión disponible"""
         print(f"\n🔍 Buscando última versión para: {url}")
-
-        # Si no estamos usando caché, no verificamos el caché
-        if not self.use_cache_only and url in self.version_cache:
-            cached_version = self.version_cache[url]['version']
-            print(f"📦 Obteniendo versión actualizada (ignorando caché)")
+        
+        cached_version = self._lookup_cache(url)
+        if cached_version is not None:
+            return cached_version
+        
+        try:
             return self._get_version_from_source(url)
-
-        if url in self.version_cache:
-            cache_entry = self.version_cache[url]
-            cache_time = datetime.fromisoformat(cache_entry['timestamp'])
-            if datetime.now() - cache_time < self.cache_duration:
-                print(f"📦 Usando versión en caché: {cache_entry['version']}")
+        finally:
+            self.flush_cache()
+    
+    def get_latest_stable(self, url):
+        """Última versión estable de la dependencia, usando la lista de tags en caché"""
+        return latest_stable(self._get_cached_tags(url)) or "N/A"
+    
+    def get_latest_in_major(self, url, major):
+        """Última versión estable dentro de una major (ej: la última 5.x), usando la lista de tags en caché"""
+        return latest_in_major(self._get_cached_tags(url), major) or "N/A"
+    
+    def _get_cached_tags(self, url):
+        """
+        Retorna la lista de tags ordenada guardada en caché para la URL.
+        No consulta la fuente: las URLs que el lote no resolvió (deadline, errores,
+        circuito abierto) no tienen entrada y se dan como "N/A".
+        """
+        return (self._get_cache_entry(url) or {}).get('tags', [])
+    
+    def _lookup_cache(self, url):
+        """
+        Resuelve la versión desde la caché según la política configurada.
+        Returns:
+            str: Versión en caché, "N/A" en modo offline sin entrada, o None si hay que
+                 consultar la fuente
+        """
+        if self.cache_policy == CachePolicy.FORCE_REFRESH:
+            return None
+        
+        cache_entry = self._get_cache_entry(url)
+        
+        if self.cache_policy == CachePolicy.OFFLINE:
+            if cache_entry:
+                print(f"📦 Usando versión en caché (offline): {cache_entry['version']}")
                 return cache_entry['version']
-
-        return self._get_version_from_source(url)
+            print(f"📴 Sin entrada en caché para {url} (modo offline)")
+            return "N/A"
+        
+        if cache_entry and self._is_fresh(cache_entry):
+            print(f"📦 Usando versión en caché: {cache_entry['version']}")
+            return cache_entry['version']
+        
+        return None
+    
+    def get_latest_versions(self, urls, deadline=None):
+        """
+        Obtiene la última versión de varias dependencias en paralelo.
+        Las consultas se reparten en un pool de hilos acotado por max_workers y
+        cada host admite como máximo max_per_host consultas simultáneas.
+        Args:
+            urls (iterable): URLs de los repositorios (se ignoran duplicados)
+            deadline (float): Segundos como máximo para el lote completo; las consultas
+                              que no terminen a tiempo se dan como "N/A" sin esperarlas
+        Returns:
+            dict: URL -> última versión ("N/A" si no se pudo determinar)
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url and url != 'N/A'))
+        results = {}
+        
+        # Las entradas resueltas por la caché no necesitan pasar por el pool
+        pending_urls = []
+        for url in unique_urls:
+            cached_version = self._lookup_cache(url)
+            if cached_version is not None:
+                results[url] = cached_version
+            else:
+                pending_urls.append(url)
+        
+        # Con GraphQL, los repositorios de GitHub se resuelven en unas pocas consultas
+        if self.github_graphql and pending_urls:
+            pending_urls = self._resolve_github_batch(pending_urls, results)
+        
+        if pending_urls:
+            workers = min(self.max_workers, len(pending_urls))
+            print(f"\n🚀 Resolviendo {len(pending_urls)} versiones en paralelo ({workers} hilos, {self.max_per_host} por host)")
+            results.update(self._run_workers(self._get_latest_version_limited, pending_urls, workers, deadline))
+        
+        # Una sola escritura de la caché por lote
+        self.flush_cache()
+        return results
+    
+    def flush_cache(self):
+        """Escribe en disco las entradas de caché pendientes"""
+        if self._cache is None:
+            return
+        try:
+            self._cache.flush()
+        except Exception as e:
+            print(f"  ❌ Error guardando caché: {str(e)}")
+    
+    def close(self):
+        """Guarda la caché pendiente y cierra el backend"""
+        if self._cache is not None:
+            self.flush_cache()
+            self._cache.close()
+            self._cache = None
+    
+    def _run_workers(self, function, urls, workers, deadline=None):
+        """
+        Ejecuta function(url) en un pool de hilos daemon.
+        Al vencer el plazo se devuelve lo resuelto hasta ese momento: las consultas en
+        curso terminan por su propio timeout en segundo plano (sin retrasar la salida
+        del programa) y las que no han empezado se descartan.
+        Returns:
+            dict: URL -> versión ("N/A" para las no resueltas a tiempo)
+        """
+        pending = queue.Queue()
+        for url in urls:
+            pending.put(url)
+        results = {}
+        finished = threading.Condition()
+        stop = threading.Event()
+        
+        def worker():
+            while not stop.is_set():
+                try:
+                    url = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    version = function(url)
+                except Exception as e:
+                    print(f"❌ Error obteniendo versión de {url}: {str(e)}")
+                    version = "N/A"
+                with finished:
+                    results[url] = version
+                    finished.notify_all()
+        
+        for _ in range(workers):
+            threading.Thread(target=worker, daemon=True).start()
+        
+        end = time.monotonic() + deadline if deadline is not None else None
+        with finished:
+            while len(results) < len(urls):
+                remaining = end - time.monotonic() if end is not None else None
+                if remaining is not None and remaining <= 0:
+                    break
+                finished.wait(remaining)
+            stop.set()
+            resolved = dict(results)
+        
+        unresolved = [url for url in urls if url not in resolved]
+        if unresolved:
+            print(f"⏱️ Límite de {deadline}s alcanzado, {len(unresolved)} versiones sin resolver")
+            resolved.update((url, "N/A") for url in unresolved)
+        return resolved
+    
+    def _resolve_github_batch(self, urls, results):
+        """
+        Resuelve por GraphQL las URLs de GitHub y guarda el resultado en caché.
+        Si la consulta falla, esas URLs se resuelven después por REST.
+        Returns:
+            list: URLs que quedan pendientes
+        """
+        repositories = {}
+        for url in urls:
+            if "github.com" in url:
+                repository = self._parse_github_repo(url)
+                if repository:
+                    repositories[url] = repository
+        
+        if not repositories:
+            return urls
+        
+        try:
+            repository_info = self.github_graphql.fetch_repositories(list(repositories.values()))
+        except CircuitOpenError as e:
+            print(f"⛔ {str(e)}")
+            return urls
+        except Exception as e:
+            print(f"❌ Error en la consulta GraphQL, se usará la API REST: {str(e)}")
+            return urls
+        
+        for url, repository in repositories.items():
+            if repository not in repository_info:
+                continue
+            info = repository_info[repository] or {'latest_release': None, 'tags': []}
+            tags = sort_versions(info['tags'])
+            version = latest_version(tags) or info['latest_release'] or (info['tags'][0] if info['tags'] else None)
+            if version:
+                print(f"✅ {url}: {version} (GraphQL)")
+                self._cache_version(url, version, self.github_graphql.endpoint, tags=tags)
+                results[url] = version
+            else:
+                print(f"❌ No se encontraron releases ni tags para {url} (GraphQL)")
+                self._cache_negative(url, ())
+                results[url] = "N/A"
+        
+        return [url for url in urls if url not in results]
+    
+    def _get_latest_version_limited(self, url):
+        """Obtiene la última versión respetando el límite de concurrencia del host"""
+        with self._get_host_semaphore(url):
+            return self._get_version_from_source(url)
+    
+    def _get_host_semaphore(self, url):
+        """Retorna el semáforo asociado al host de la URL"""
+        host = urlparse(url).netloc.lower() or url
+        with self._host_semaphores_lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_semaphores[host]
     
     def _get_version_from_source(self, url):
         """Obtener última versión desde la fuente (GitHub/GitLab)"""
@@ -309,8 +713,10 @@ class VersionChecker:
                 return self.get_latest_github_version(url)
             elif "gitlab.com" in url:
                 return self.get_latest_gitlab_version(url)
+            elif url.startswith(f"{self.trunk_api_url}/pods/"):
+                return self.get_latest_trunk_version(url)
             else:
-                print(f"❌ URL no soportada (no es GitHub ni GitLab): {url}")
+                print(f"❌ URL no soportada (no es GitHub, GitLab ni CocoaPods trunk): {url}")
                 return "N/A"
         except Exception as e:
             print(f"❌ Error obteniendo versión: {str(e)}")